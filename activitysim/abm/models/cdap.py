@@ -36,6 +36,18 @@ class CdapSettings(PydanticReadable, extra="forbid"):
     JOINT_TOUR_COEFFICIENTS: str = "cdap_joint_tour_coefficients.csv"
     JOINT_TOUR_USEFUL_COLUMNS: list[str] | None = None
     """Columns to include from the persons table that will be need to calculate household joint tour utility."""
+    COMPILED_INTERACTION_UTILITIES: bool = False
+    """Compute household activity pattern utilities in a compiled kernel.
+
+    The utilities of the 3^n activity patterns of households of size n are then
+    computed directly from the individual utilities and the interaction coefficients,
+    instead of building an interaction spec and a wide household choosers table for
+    each household size and evaluating one on the other. The utilities are the same
+    (up to floating point rounding). Households with joint tour utility, and traced
+    households, still use the specs.
+
+    .. versionadded:: 1.6
+    """
     COEFFICIENTS: Path
     CONSTANTS: dict[str, Any] = {}
     compute_settings: ComputeSettings | None = None
@@ -225,6 +237,7 @@ def cdap_simulate(
             trace_label=trace_label,
             add_joint_tour_utility=add_joint_tour_utility,
             compute_settings=model_settings.compute_settings,
+            compiled_interaction_utilities=model_settings.COMPILED_INTERACTION_UTILITIES,
         )
     else:
         choices = cdap.run_cdap(
@@ -239,6 +252,7 @@ def cdap_simulate(
             trace_hh_id=trace_hh_id,
             trace_label=trace_label,
             compute_settings=model_settings.compute_settings,
+            compiled_interaction_utilities=model_settings.COMPILED_INTERACTION_UTILITIES,
         )
 
     if estimator:
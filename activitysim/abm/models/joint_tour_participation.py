@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
+from typing import Literal
 
+import numba as nb
 import numpy as np
 import pandas as pd
 
@@ -125,6 +127,162 @@ def get_tour_satisfaction(candidates, participate):
     return satisfaction
 
 
+@nb.njit
+def _participation_state_after_joining(state, adult, mixed):
+    # mixed tours track (has adult, has child) as bits, other tours count
+    # participants up to 2
+    if mixed:
+        return state | (2 if adult else 1)
+    return min(state + 1, 2)
+
+
+@nb.njit
+def _participation_state_satisfied(state, mixed):
+    if mixed:
+        return state == 3
+    return state == 2
+
+
+@nb.njit
+def _sample_participation(offsets, probs, adult, mixed, rands):
+    """
+    Draw participation for each tour from the independent participation probabilities
+    of its candidates, conditional on the tour satisfying get_tour_satisfaction.
+
+    Candidates are visited in order, and each one participates with its probability
+    conditional on the draws so far and on the tour being satisfied by the end, which
+    is computed by a backward pass over the remaining candidates. This gives exactly
+    the distribution of redrawing all of a tour's candidates until it is satisfied.
+
+    Parameters
+    ----------
+    offsets : array of int
+        candidates of tour t are offsets[t]:offsets[t + 1]
+    probs : array of float
+        participation probability of each candidate
+    adult : array of bool
+    mixed : array of bool
+        whether each tour has mixed composition
+    rands : array of float
+        one uniform random number per candidate
+
+    Returns
+    -------
+    participate : array of bool
+    feasible : array of bool
+        False for tours that can not be satisfied (and have no participants)
+    """
+    n_tours = len(offsets) - 1
+    participate = np.zeros(len(probs), dtype=np.bool_)
+    feasible = np.ones(n_tours, dtype=np.bool_)
+
+    max_candidates = 0
+    for t in range(n_tours):
+        max_candidates = max(max_candidates, offsets[t + 1] - offsets[t])
+
+    # z[i, s] is the probability that the candidates from i on take a tour in state s
+    # to a satisfied one
+    z = np.empty((max_candidates + 1, 4))
+
+    for t in range(n_tours):
+        start = offsets[t]
+        n = offsets[t + 1] - start
+
+        for s in range(4):
+            z[n, s] = 1.0 if _participation_state_satisfied(s, mixed[t]) else 0.0
+        for i in range(n - 1, -1, -1):
+            p = probs[start + i]
+            for s in range(4):
+                joined = _participation_state_after_joining(
+                    s, adult[start + i], mixed[t]
+                )
+                z[i, s] = p * z[i + 1, joined] + (1.0 - p) * z[i + 1, s]
+
+        if z[0, 0] <= 0:
+            feasible[t] = False
+            continue
+
+        s = 0
+        for i in range(n):
+            joined = _participation_state_after_joining(s, adult[start + i], mixed[t])
+            if rands[start + i] * z[i, s] < probs[start + i] * z[i + 1, joined]:
+                participate[start + i] = True
+                s = joined
+
+    return participate, feasible
+
+
+def conditional_participants_chooser(
+    state: workflow.State,
+    probs: pd.DataFrame,
+    choosers: pd.DataFrame,
+    participate_choice: int,
+    trace_label: str,
+) -> tuple[pd.Series, pd.Series]:
+    """
+    Choose participants for all joint tours in a single pass, by sampling each tour's
+    participation pattern conditional on it satisfying the composition rules.
+
+    This draws from the same distribution as the rechoose-until-satisfied loop in
+    participants_chooser, using a single random number per candidate.
+
+    Returns
+    -------
+    choices, rands
+        choices, rands as returned by logit.make_choices (in same order as probs)
+    """
+    assert probs.shape[1] == 2
+    assert probs.index.equals(choosers.index)
+
+    tour_codes, tour_ids = pd.factorize(choosers.tour_id)
+    order = np.argsort(tour_codes, kind="stable")
+    offsets = np.zeros(len(tour_ids) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(tour_codes, minlength=len(tour_ids)))
+
+    mixed = (choosers.composition == "mixed").to_numpy()[order][offsets[:-1]]
+
+    rands = state.get_rn_generator().random_for_df(probs).reshape(-1)
+
+    participate_sorted, feasible = _sample_participation(
+        offsets,
+        probs.iloc[:, participate_choice].to_numpy(dtype=np.float64)[order],
+        choosers.adult.to_numpy(dtype=bool)[order],
+        mixed,
+        rands[order],
+    )
+
+    if not feasible.all():
+        diagnostic_cols = ["tour_id", "household_id", "composition", "adult"]
+        unsatisfied_candidates = choosers[choosers.tour_id.isin(tour_ids[~feasible])][
+            diagnostic_cols
+        ].join(probs)
+        state.tracing.write_csv(
+            unsatisfied_candidates,
+            file_name="%s.UNSATISFIED" % trace_label,
+            transpose=False,
+        )
+        raise InvalidTravelError(
+            f"{(~feasible).sum()} tours can not be satisfied by any choice of participants"
+        )
+
+    participate = np.empty_like(participate_sorted)
+    participate[order] = participate_sorted
+
+    choices = pd.Series(
+        np.where(participate, participate_choice, 1 - participate_choice),
+        index=probs.index,
+    )
+    rands = pd.Series(rands, index=probs.index)
+
+    logger.info(
+        "%s %s joint tours satisfied by conditional sampling.",
+        trace_label,
+        len(tour_ids),
+    )
+
+    return choices, rands
+
+
 def participants_chooser(
     state: workflow.State,
     probs_or_utils: pd.DataFrame,
@@ -184,6 +342,14 @@ def participants_chooser(
 
     trace_label = tracing.extend_trace_label(trace_label, "participants_chooser")
 
+    if (
+        model_settings.participation_sampling == "conditional"
+        and not state.settings.use_explicit_error_terms
+    ):
+        return conditional_participants_chooser(
+            state, probs_or_utils, choosers, PARTICIPATE_CHOICE, trace_label
+        )
+
     candidates = choosers.copy()
     choices_list = []
     rands_list = []
@@ -347,6 +513,21 @@ class JointTourParticipationSettings(LogitComponentSettings, extra="forbid"):
 
     max_participation_choice_iterations: int = 5000
 
+    participation_sampling: Literal["rechoose", "conditional"] = "rechoose"
+    """How participants are chosen so that every joint tour satisfies its composition.
+
+    With "rechoose", participation is chosen for every candidate and then rechosen
+    for the candidates of tours that fail the composition rules, until all tours
+    are satisfied. With "conditional", each tour's participants are drawn directly
+    from the same distribution conditional on satisfying the rules, in a single
+    pass. The distribution of participants is the same, but conditional sampling
+    uses the random numbers differently, so individual choices are not the same as
+    with "rechoose". It does not apply with explicit error terms, which always
+    rechoose.
+
+    .. versionadded:: 1.6
+    """
+
     FORCE_PARTICIPATION: bool = False
 
 
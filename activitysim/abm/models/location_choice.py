@@ -19,6 +19,7 @@ from activitysim.core.configuration.logit import (
 from activitysim.core.exceptions import DuplicateWorkflowTableError
 from activitysim.core.interaction_sample import (
     interaction_sample,
+    join_sample_choosers,
     resolve_sample_method,
 )
 from activitysim.core.interaction_sample_simulate import interaction_sample_simulate
@@ -123,6 +124,7 @@ def _location_sample(
     zone_layer=None,
     stable_alt_positions=None,
     n_total_alts=None,
+    chooser_key=None,
 ):
     """
     select a sample of alternative locations.
@@ -224,6 +226,7 @@ def _location_sample(
         compute_settings=model_settings.compute_settings.subcomponent_settings(
             "sample"
         ),
+        chooser_key=chooser_key,
     )
 
     return choices
@@ -446,6 +449,14 @@ def location_presample(
     skim_dict = network_los.get_skim_dict("taz")
     skims = skim_dict.wrap(HOME_TAZ, DEST_TAZ)
 
+    # choosers with the same home TAZ and key attributes share sample probabilities
+    if model_settings.PRESAMPLE_CHOOSER_KEY is not None:
+        chooser_key = [HOME_TAZ] + [
+            c for c in model_settings.PRESAMPLE_CHOOSER_KEY if c != HOME_TAZ
+        ]
+    else:
+        chooser_key = None
+
     taz_sample = _location_sample(
         state,
         segment_name,
@@ -461,6 +472,7 @@ def location_presample(
         zone_layer="taz",
         stable_alt_positions=stable_alt_positions,
         n_total_alts=n_total_alts,
+        chooser_key=chooser_key,
     )
 
     # print(f"taz_sample\n{taz_sample}")
@@ -616,7 +628,7 @@ def run_location_logsums(
 
     logger.info(f"Running {trace_label} with {len(location_sample_df.index)} rows")
 
-    choosers = location_sample_df.join(persons_merged_df, how="left")
+    choosers = join_sample_choosers(location_sample_df, persons_merged_df)
 
     tour_purpose = model_settings.LOGSUM_TOUR_PURPOSE
     if isinstance(tour_purpose, dict):
@@ -793,6 +805,7 @@ def run_location_choice(
     chunk_tag,
     trace_label,
     skip_choice=False,
+    sample_alternatives=None,
 ):
     """
     Run the three-part location choice algorithm to generate a location choice for each chooser
@@ -813,6 +826,9 @@ def run_location_choice(
     chunk_size : int
     trace_label : str
     skip_choice : bool
+    sample_alternatives : list or None
+        if not None, the sampled alternatives of each segment (ALT_DEST_COL_NAME column
+        indexed by chooser id) are appended to this list
 
     Returns
     -------
@@ -953,6 +969,11 @@ def run_location_choice(
 
         choices_list.append(choices_df)
 
+        if sample_alternatives is not None:
+            sample_alternatives.append(
+                location_sample_df[[model_settings.ALT_DEST_COL_NAME]]
+            )
+
         if want_sample_table:
             # FIXME - sample_table
             location_sample_df.set_index(
@@ -979,6 +1000,66 @@ def run_location_choice(
     return choices_df, save_sample_df
 
 
+def choosers_in_changed_zones(
+    choosers: pd.DataFrame,
+    chooser_segment_column: str,
+    segment_ids: dict[str, int],
+    changed_zones: pd.DataFrame,
+    choices: pd.Series,
+    sample_alternatives: pd.Series,
+    explicit_error_terms: bool,
+):
+    """
+    Flag choosers whose choice could change with the shadow price changes
+
+    Every chooser in a segment could sample a zone that became more attractive.
+    With explicit error terms, a zone that only became less attractive can only
+    change the sample, and choice, of choosers who had it in their sample (or
+    chose it). Without them, every sample of the segment can change.
+
+    Parameters
+    ----------
+    choosers : pandas.DataFrame
+    chooser_segment_column : str
+    segment_ids : dict
+        maps segment names to segment ids in chooser_segment_column
+    changed_zones : pandas.DataFrame
+        direction of the price changes, zones by segment name
+        (see ShadowPriceCalculator.changed_zones)
+    choices : pandas.Series
+        previous location choices indexed by chooser id
+    sample_alternatives : pandas.Series
+        previously sampled alternatives indexed by chooser id
+    explicit_error_terms : bool
+        whether the location sample is drawn with explicit error terms
+
+    Returns
+    -------
+    pandas.Series
+        boolean, indexed by choosers.index
+    """
+
+    previous_choices = choices.reindex(choosers.index)
+    resimulate = pd.Series(False, index=choosers.index)
+    for segment_name, segment_id in segment_ids.items():
+        segment_changes = changed_zones[segment_name]
+        in_segment = choosers[chooser_segment_column] == segment_id
+        if (segment_changes > 0).any() or (
+            (segment_changes != 0).any() and not explicit_error_terms
+        ):
+            resimulate |= in_segment
+            continue
+        zones = changed_zones.index[segment_changes < 0]
+        if len(zones) == 0:
+            continue
+        drawn = sample_alternatives.index[sample_alternatives.isin(zones)]
+        resimulate |= in_segment & (
+            previous_choices.isin(zones) | choosers.index.isin(drawn)
+        )
+
+    return resimulate
+
+
 def iterate_location_choice(
     state: workflow.State,
     model_settings: TourLocationComponentSettings,
@@ -1055,14 +1136,27 @@ def iterate_location_choice(
 
     logger.debug(f"{trace_label} max_iterations: {max_iterations}")
 
+    # only re-simulate choosers affected by shadow price changes on later iterations
+    resimulate_changed_zones = (
+        spc.use_shadow_pricing
+        and spc.shadow_settings.SHADOW_PRICE_METHOD != "simulation"
+        and spc.shadow_settings.RESIMULATE_CHANGED_ZONES_ONLY
+    )
+    partial_resimulation = spc.use_shadow_pricing and (
+        resimulate_changed_zones
+        or spc.shadow_settings.SHADOW_PRICE_METHOD == "simulation"
+    )
+
     save_sample_df = (
         choices_df
     ) = None  # initialize to None, will be populated in first iteration
+    sample_alternatives = None
 
     for iteration in range(1, max_iterations + 1):
         persons_merged_df_ = persons_merged_df.copy()
 
         if spc.use_shadow_pricing and iteration > 1:
+            previous_shadow_prices = spc.shadow_prices.copy()
             spc.update_shadow_prices(state)
 
             if spc.shadow_settings.SHADOW_PRICE_METHOD == "simulation":
@@ -1071,6 +1165,21 @@ def iterate_location_choice(
                     persons_merged_df_.index.isin(spc.sampled_persons.index)
                 ]
                 persons_merged_df_ = persons_merged_df_.sort_index()
+            elif resimulate_changed_zones:
+                resimulate = choosers_in_changed_zones(
+                    persons_merged_df_,
+                    chooser_segment_column,
+                    segment_ids,
+                    spc.changed_zones(previous_shadow_prices),
+                    choices_df["choice"],
+                    sample_alternatives,
+                    state.settings.use_explicit_error_terms,
+                )
+                logger.info(
+                    f"{trace_label} iteration {iteration} re-simulating "
+                    f"{resimulate.sum()} of {len(resimulate)} choosers"
+                )
+                persons_merged_df_ = persons_merged_df_[resimulate]
 
         # reset rng offsets to identical state on each iteration. This ensures that the same set of random numbers is
         # used on each iteration for the persons being re-simulated, so sampling and final choice draws are
@@ -1084,7 +1193,9 @@ def iterate_location_choice(
             )
             state.get_rn_generator().reset_offsets_for_df(persons_merged_df_)
 
-        choices_df_, save_sample_df = run_location_choice(
+        sample_alternatives_ = [] if resimulate_changed_zones else None
+
+        choices_df_, save_sample_df_ = run_location_choice(
             state,
             persons_merged_df_,
             network_los,
@@ -1096,18 +1207,45 @@ def iterate_location_choice(
             chunk_size=chunk_size,
             chunk_tag=chunk_tag,
             trace_label=tracing.extend_trace_label(trace_label, "i%s" % iteration),
+            sample_alternatives=sample_alternatives_,
         )
 
         # choices_df is a pandas DataFrame with columns "choice" and (optionally) "logsum"
         if choices_df_ is None:
             break
 
+        if resimulate_changed_zones:
+            # keep previous samples of choosers that were not re-simulated
+            sample_alternatives_ = pd.concat(
+                sample_alternatives_
+                or [pd.DataFrame(columns=[model_settings.ALT_DEST_COL_NAME])]
+            )[model_settings.ALT_DEST_COL_NAME]
+            if sample_alternatives is not None:
+                sample_alternatives_ = pd.concat(
+                    [
+                        sample_alternatives[
+                            ~sample_alternatives.index.isin(persons_merged_df_.index)
+                        ],
+                        sample_alternatives_,
+                    ]
+                )
+            sample_alternatives = sample_alternatives_
+
+        if resimulate_changed_zones and iteration > 1 and save_sample_df is not None:
+            # keep previous sample table rows of choosers that were not re-simulated
+            kept = ~save_sample_df.index.get_level_values(0).isin(
+                persons_merged_df_.index
+            )
+            save_sample_df = pd.concat(
+                [save_sample_df[kept]]
+                + ([save_sample_df_] if save_sample_df_ is not None else [])
+            )
+        else:
+            save_sample_df = save_sample_df_
+
         if spc.use_shadow_pricing:
-            # handle simulation method
-            if (
-                spc.shadow_settings.SHADOW_PRICE_METHOD == "simulation"
-                and iteration > 1
-            ):
+            # handle partial re-simulation
+            if partial_resimulation and iteration > 1:
                 # if a process ends up with no sampled workers in it, hence an empty choice_df_, then choice_df wil be what it was previously
                 if len(choices_df_) != 0:
                     choices_df = pd.concat([choices_df, choices_df_], axis=0)
@@ -2,9 +2,13 @@
 # See full license in LICENSE.txt.
 from __future__ import annotations
 
+import ast
 import logging
 import os
+import re
 from pathlib import Path
+from types import CodeType
+from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
@@ -96,17 +100,26 @@ def construct_bin_labels(bins: pd.Series, label_format: str) -> pd.Series:
         }
         return label_format.format(**bounds_dict)
 
-    labels = pd.Series(
+    # all rows in the same bin get the same label, so only construct one label per bin
+    _, first_rows, bin_rows = np.unique(
+        pd.factorize(bins)[0], return_index=True, return_inverse=True
+    )
+    bin_labels = pd.Series(
         [
             construct_label(
                 label_format, {"left": lt, "mid": md, "right": rt, "rank": rk}
             )
-            for lt, md, rt, rk in zip(left, mid, right, rank)
-        ],
-        index=bins.index,
+            for lt, md, rt, rk in zip(
+                left.iloc[first_rows],
+                mid.iloc[first_rows],
+                right.iloc[first_rows],
+                rank.iloc[first_rows],
+            )
+        ]
     )
     # Convert to numeric if possible
-    labels = pd.to_numeric(labels, errors="ignore")
+    bin_labels = pd.to_numeric(bin_labels, errors="ignore")
+    labels = pd.Series(bin_labels.to_numpy()[bin_rows.reshape(-1)], index=bins.index)
     return labels
 
 
@@ -202,6 +215,178 @@ def manual_breaks(
         return bins
 
 
+# the table whose group-by aggregations can be computed chunk by chunk
+AGGREGATION_TABLE = "trips_merged"
+
+# name of the combined partial aggregates when finalizing a summary expression
+PARTIAL_AGGREGATE = "_partial_aggregate"
+
+# aggregations whose partial results can be summed
+PARTIAL_AGGREGATIONS = ("sum", "count", "size")
+
+
+class PartialAggregation(NamedTuple):
+    """
+    A summary expression split into a chunk by chunk aggregation and a finalizer.
+    """
+
+    aggregate: CodeType
+    """Evaluates the group-by aggregation of a chunk of trips_merged."""
+
+    finalize: CodeType
+    """Evaluates the summary expression from the combined aggregates."""
+
+    summed_columns: list[str]
+    """Columns that are summed, which must be integers to sum in any order."""
+
+
+def _constant_strings(node: ast.AST) -> list[str] | None:
+    """The strings of a str or list of str constant node, or None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if (
+        isinstance(node, ast.List)
+        and node.elts
+        and all(
+            isinstance(e, ast.Constant) and isinstance(e.value, str) for e in node.elts
+        )
+    ):
+        return [e.value for e in node.elts]
+    return None
+
+
+def _group_by_aggregation(node: ast.AST) -> tuple[str, list[str]] | None:
+    """
+    The aggregation and columns of a node like
+    ``trips_merged.groupby(keys)[columns].sum()`` or
+    ``trips_merged.groupby(keys).column.sum()``, or None for any other node.
+
+    Keys and columns must be constant, and group by options are not supported.
+    """
+    if not (
+        isinstance(node, ast.Call)
+        and not node.args
+        and not node.keywords
+        and isinstance(node.func, ast.Attribute)
+        and node.func.attr in PARTIAL_AGGREGATIONS
+    ):
+        return None
+    how = node.func.attr
+    grouped = node.func.value
+    columns = []
+    if isinstance(grouped, ast.Subscript):
+        columns = _constant_strings(grouped.slice)
+        if columns is None:
+            return None
+        grouped = grouped.value
+    elif isinstance(grouped, ast.Attribute):
+        columns = [grouped.attr]
+        grouped = grouped.value
+    elif how != "size":
+        # would aggregate every column
+        return None
+    if not (
+        isinstance(grouped, ast.Call)
+        and isinstance(grouped.func, ast.Attribute)
+        and grouped.func.attr == "groupby"
+        and isinstance(grouped.func.value, ast.Name)
+        and grouped.func.value.id == AGGREGATION_TABLE
+        and len(grouped.args) == 1
+        and not grouped.keywords
+        and _constant_strings(grouped.args[0]) is not None
+    ):
+        return None
+    return how, columns
+
+
+def plan_partial_aggregation(expr: str) -> PartialAggregation | None:
+    """
+    Plan a summary expression as partial aggregates of trips_merged, if possible.
+
+    This is possible if trips_merged is only used once, in a group-by count, size or
+    sum of some columns, e.g. ``trips_merged.groupby('trip_mode')[['trips']].sum()``.
+    The rest of the expression is applied to the combined aggregates, so it can
+    reshape or rename them (e.g. ``.T`` or ``.unstack(-1).reset_index()``).
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        return None
+
+    uses = [
+        n
+        for n in ast.walk(tree)
+        if isinstance(n, ast.Name) and n.id == AGGREGATION_TABLE
+    ]
+    aggregations = [n for n in ast.walk(tree) if _group_by_aggregation(n)]
+    if len(uses) != 1 or len(aggregations) != 1:
+        return None
+
+    aggregation = aggregations[0]
+    how, columns = _group_by_aggregation(aggregation)
+    aggregate = compile(ast.Expression(aggregation), "<summarize>", "eval")
+
+    class ReplaceAggregation(ast.NodeTransformer):
+        def visit_Call(self, node):
+            if node is aggregation:
+                return ast.copy_location(ast.Name(PARTIAL_AGGREGATE, ast.Load()), node)
+            return self.generic_visit(node)
+
+    finalize = ast.fix_missing_locations(ReplaceAggregation().visit(tree))
+
+    return PartialAggregation(
+        aggregate=aggregate,
+        finalize=compile(finalize, "<summarize>", "eval"),
+        summed_columns=columns if how == "sum" else [],
+    )
+
+
+def combine_partial_aggregates(partials: list) -> pd.Series | pd.DataFrame:
+    """
+    Combine group-by aggregates of chunks into the aggregate of the whole table.
+
+    Groups are sorted as the group-by sorts them, and only groups (including
+    unobserved categories) present in some chunk result are kept.
+    """
+    combined = pd.concat(partials)
+    return combined.groupby(
+        level=list(range(combined.index.nlevels)), sort=True, observed=True
+    ).sum()
+
+
+def partial_aggregates(
+    plans: dict[int, PartialAggregation], chunks
+) -> dict[int, pd.Series | pd.DataFrame | None]:
+    """
+    Aggregate chunks of trips_merged for each plan and combine the results.
+
+    Plans that sum non-integer columns, or miss columns, get None, since float
+    sums depend on the order of the values, and are left to the full table.
+    """
+    partials = {i: [] for i in plans}
+    for chunk in chunks:
+        for i, plan in plans.items():
+            if partials[i] is None:
+                continue
+            if not all(
+                c in chunk.columns and chunk[c].dtype.kind in "iub"
+                for c in plan.summed_columns
+            ):
+                logger.info(
+                    f"summary {i} sums columns that are not integers, "
+                    f"evaluating it on the full trips_merged"
+                )
+                partials[i] = None
+                continue
+            partials[i].append(
+                eval(plan.aggregate, globals(), {AGGREGATION_TABLE: chunk})
+            )
+
+    return {
+        i: combine_partial_aggregates(p) if p else None for i, p in partials.items()
+    }
+
+
 class SummarizeSettings(PydanticReadable, extra="allow"):
     """
     Settings for the `summarize` component.
@@ -218,6 +403,57 @@ class SummarizeSettings(PydanticReadable, extra="allow"):
 
     preprocessor: PreprocessorSettings | None = None
 
+    MERGE_REFERENCED_COLUMNS_ONLY: bool = False
+    """Only merge tour columns referenced by the summaries into trips_merged.
+
+    By default every tours_merged column is copied onto each trip.  When enabled,
+    the summarize spec, the preprocessor spec and these settings are scanned for
+    column names, and tour columns that are not mentioned anywhere are left out
+    of trips_merged.  This can greatly reduce memory use for large trip tables,
+    but requires expressions to refer to trips_merged columns by their names
+    (e.g. not to build column names dynamically, or to summarize all columns).
+    Ignored when EXPORT_PIPELINE_TABLES is enabled.
+
+    .. versionadded:: 1.6
+    """
+
+    AGGREGATION_CHUNK_SIZE: int = 0
+    """Number of trips per chunk for streaming group-by summaries of trips_merged.
+
+    If this is greater than zero, summary expressions that only use trips_merged
+    in a group-by count, size or sum of integer columns (see
+    `plan_partial_aggregation`) are computed as partial aggregates of chunks of
+    trips and combined, which gives identical results.  Other expressions are
+    evaluated on the full trips_merged as usual.
+
+    If every expression that uses trips_merged can be computed this way, and there
+    are no trips_merged BIN or AGGREGATE settings, the full trips_merged is never
+    built: each chunk of trips is merged with tours and annotated by the
+    preprocessor on its own.  The preprocessor expressions must then only combine
+    values within each trip.  Ignored when EXPORT_PIPELINE_TABLES is enabled.
+
+    .. versionadded:: 1.6
+    """
+
+
+def referenced_names(
+    state: workflow.State, model_settings: SummarizeSettings, spec: pd.DataFrame
+) -> set[str]:
+    """
+    Names that may be referenced by the summarize spec, preprocessor or settings.
+
+    This is a conservative scan for every word in the expressions and settings,
+    so it finds column names whether used as attributes, strings or bare names.
+    """
+    texts = spec["Expression"].astype(str).tolist()
+    texts.append(str(model_settings.model_dump()))
+    if model_settings.preprocessor is not None:
+        spec_name = model_settings.preprocessor.SPEC
+        if not spec_name.endswith(".csv"):
+            spec_name = f"{spec_name}.csv"
+        texts.append(state.filesystem.get_config_file_path(spec_name).read_text())
+    return set(re.findall(r"\w+", "\n".join(texts)))
+
 
 @workflow.step
 def summarize(
@@ -265,14 +501,23 @@ def summarize(
     tours = tours_merged
 
     # - trips_merged - merge trips and tours_merged
-    trips_merged = pd.merge(
-        trips,
-        tours_merged.drop(columns=["person_id", "household_id"]),
-        left_on="tour_id",
-        right_index=True,
-        suffixes=("_trip", "_tour"),
-        how="left",
-    )
+    tour_columns = tours_merged.columns.drop(["person_id", "household_id"])
+    if (
+        model_settings.MERGE_REFERENCED_COLUMNS_ONLY
+        and not model_settings.EXPORT_PIPELINE_TABLES
+    ):
+        names = referenced_names(state, model_settings, spec)
+        # columns shared with trips are kept so they are suffixed just the same,
+        # and tour start and end are needed to wrap skims
+        tour_columns = [
+            c
+            for c in tour_columns
+            if c in names or c in trips.columns or c in ("start", "end")
+        ]
+        logger.info(
+            f"merging {len(tour_columns)} of {len(tours_merged.columns)} "
+            f"tours_merged columns into trips_merged"
+        )
 
     # Add dataframes as local variables
     locals_d = {
@@ -281,19 +526,69 @@ def summarize(
         "households": households,
         "households_merged": households_merged,
         "trips": trips,
-        "trips_merged": trips_merged,
+        "trips_merged": None,
         "tours": tours_merged,
         "tours_merged": tours_merged,
         "land_use": land_use,
     }
 
-    skims = wrap_skims(network_los, trips_merged)
+    def merge_trips(trips):
+        trips_merged = pd.merge(
+            trips,
+            tours_merged[tour_columns],
+            left_on="tour_id",
+            right_index=True,
+            suffixes=("_trip", "_tour"),
+            how="left",
+        )
+        locals_d["trips_merged"] = trips_merged
 
-    # Annotate trips_merged
-    expressions.annotate_preprocessors(
-        state, trips_merged, locals_d, skims, model_settings, "summarize"
+        skims = wrap_skims(network_los, trips_merged)
+
+        # Annotate trips_merged
+        expressions.annotate_preprocessors(
+            state, trips_merged, locals_d, skims, model_settings, "summarize"
+        )
+        return trips_merged
+
+    # - plan group-by summaries of trips_merged as partial aggregates of chunks
+    chunk_size = model_settings.AGGREGATION_CHUNK_SIZE
+    plans = {}
+    if chunk_size > 0 and not model_settings.EXPORT_PIPELINE_TABLES:
+        for i, expr in spec["Expression"].items():
+            plan = isinstance(expr, str) and plan_partial_aggregation(expr)
+            if plan:
+                plans[i] = plan
+    stream_trips = (
+        len(plans) > 0
+        and not hasattr(model_settings, AGGREGATION_TABLE)
+        and not any(
+            re.search(rf"\b{AGGREGATION_TABLE}\b", str(expr))
+            for i, expr in spec["Expression"].items()
+            if i not in plans
+        )
+    )
+    logger.info(
+        f"computing {len(plans)} of {len(spec)} summaries from partial aggregates"
+        f"{', without building the full trips_merged' if stream_trips else ''}"
     )
 
+    if stream_trips:
+        aggregates = partial_aggregates(
+            plans,
+            (
+                merge_trips(trips.iloc[start : start + chunk_size])
+                for start in range(0, len(trips), chunk_size)
+            ),
+        )
+        trips_merged = None
+        if any(aggregate is None for aggregate in aggregates.values()):
+            # some summaries must be evaluated on the full table after all
+            trips_merged = merge_trips(trips)
+        locals_d["trips_merged"] = trips_merged
+    else:
+        trips_merged = merge_trips(trips)
+
     for table_name, df in locals_d.items():
         if hasattr(model_settings, table_name):
             meta = getattr(model_settings, table_name)
@@ -354,6 +649,21 @@ def summarize(
         }
     )
 
+    if plans and not stream_trips:
+        aggregates = partial_aggregates(
+            plans,
+            (
+                trips_merged.iloc[start : start + chunk_size]
+                for start in range(0, len(trips_merged), chunk_size)
+            ),
+        )
+
+    def evaluate(i, expr):
+        if plans and aggregates.get(i) is not None:
+            locals_d[PARTIAL_AGGREGATE] = aggregates[i]
+            return eval(plans[i].finalize, globals(), locals_d)
+        return eval(expr, globals(), locals_d)
+
     if state.settings.expression_profile:
         perf_log_file = Path(trace_label + ".log")
     else:
@@ -369,13 +679,13 @@ def summarize(
             logger.debug(f"Temp Variable: {expr} -> {out_file}")
 
             with performance_timer.time_expression(expr):
-                locals_d[out_file] = eval(expr, globals(), locals_d)
+                locals_d[out_file] = evaluate(i, expr)
             continue
 
         logger.debug(f"Summary: {expr} -> {out_file}.csv")
 
         with performance_timer.time_expression(expr):
-            resultset = eval(expr, globals(), locals_d)
+            resultset = evaluate(i, expr)
         resultset.to_csv(
             state.get_output_file_path(
                 os.path.join(output_location, f"{out_file}.csv")
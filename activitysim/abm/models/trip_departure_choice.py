@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+import numba as nb
 import numpy as np
 import pandas as pd
 
@@ -54,9 +55,18 @@ def generate_tour_leg_id(tour_leg_row):
     )
 
 
+def tour_leg_ids(df):
+    """
+    Vectorized generate_tour_leg_id for the rows of df.
+    """
+    return df[TOUR_ID].to_numpy() + np.where(
+        df[OUTBOUND].to_numpy(), int(MAX_TOUR_ID), int(2 * MAX_TOUR_ID)
+    )
+
+
 def get_tour_legs(trips):
     tour_legs = trips.groupby([TOUR_ID, OUTBOUND], as_index=False)[TRIP_NUM].max()
-    tour_legs[TOUR_LEG_ID] = tour_legs.apply(generate_tour_leg_id, axis=1)
+    tour_legs[TOUR_LEG_ID] = tour_leg_ids(tour_legs)
     tour_legs = tour_legs.set_index(TOUR_LEG_ID)
     return tour_legs
 
@@ -91,9 +101,12 @@ def generate_alternatives(trips, alternative_col_name):
     leg_alts = None
     durations = np.where(legs[OUTBOUND], legs[OB_DURATION], legs[IB_DURATION])
     if len(durations) > 0:
+        # 0..duration for each leg
+        alt_counts = durations + 1
+        leg_offsets = np.repeat(np.cumsum(alt_counts) - alt_counts, alt_counts)
         leg_alts = pd.Series(
-            np.concatenate([np.arange(0, duration + 1) for duration in durations]),
-            np.repeat(legs.index, durations + 1),
+            np.arange(alt_counts.sum()) - leg_offsets,
+            np.repeat(legs.index, alt_counts),
             name=alternative_col_name,
         ).to_frame()
 
@@ -113,54 +126,151 @@ def generate_alternatives(trips, alternative_col_name):
     return leg_alts if not legs.empty else single_alts
 
 
+@nb.njit
+def _duration_patterns(duration, num_stops):
+    """
+    All ways of splitting duration into num_stops non-negative stop durations, in
+    lexicographic order.
+    """
+    if num_stops == 0:
+        return np.zeros((1 if duration == 0 else 0, 0), dtype=np.int64)
+
+    num_patterns = 1
+    for i in range(1, num_stops):
+        num_patterns = num_patterns * (duration + i) // i
+
+    patterns = np.zeros((num_patterns, num_stops), dtype=np.int64)
+    pattern = np.zeros(num_stops, dtype=np.int64)
+    pattern[num_stops - 1] = duration
+    for p in range(num_patterns):
+        patterns[p] = pattern
+        # next pattern: move one period from the tail into the rightmost stop that
+        # has a non-empty tail after it, and put the rest of the tail in the last stop
+        tail = pattern[num_stops - 1]
+        i = num_stops - 2
+        while i >= 0 and tail == 0:
+            tail += pattern[i]
+            i -= 1
+        if i < 0:
+            break
+        pattern[i] += 1
+        pattern[i + 1 :] = 0
+        pattern[num_stops - 1] = tail - 1
+    return patterns
+
+
+@nb.njit
+def _gather_patterns(
+    tour_pattern_sets, set_offsets, set_sizes, set_num_stops, all_patterns
+):
+    """
+    Long format (tour position, pattern, stop, stop duration) rows of the patterns of
+    each tour, stop by stop (as pandas.melt orders them).
+    """
+    num_rows = 0
+    max_num_stops = 0
+    for t in range(tour_pattern_sets.size):
+        k = tour_pattern_sets[t]
+        num_rows += set_sizes[k] * set_num_stops[k]
+        max_num_stops = max(max_num_stops, set_num_stops[k])
+
+    tour_positions = np.empty(num_rows, dtype=np.int64)
+    pattern_ixs = np.empty(num_rows, dtype=np.int64)
+    stop_nums = np.empty(num_rows, dtype=np.int64)
+    stop_durations = np.empty(num_rows, dtype=np.int64)
+
+    row = 0
+    for j in range(max_num_stops):
+        for t in range(tour_pattern_sets.size):
+            k = tour_pattern_sets[t]
+            if set_num_stops[k] <= j:
+                continue
+            for p in range(set_offsets[k], set_offsets[k] + set_sizes[k]):
+                tour_positions[row] = t
+                pattern_ixs[row] = p
+                stop_nums[row] = j
+                stop_durations[row] = all_patterns[p, j]
+                row += 1
+
+    return tour_positions, pattern_ixs, stop_nums, stop_durations
+
+
 def build_patterns(trips, time_windows):
+    """
+    Build the stop duration patterns of each tour leg.
+
+    The patterns of a leg are the ways of splitting its duration among its
+    trip_count - 1 intermediate stops (columns of time_windows). They are
+    enumerated once for each distinct (duration, trip_count) pair and gathered for
+    all tours in one compiled pass.
+
+    Parameters
+    ----------
+    trips : pandas.DataFrame
+    time_windows : numpy.ndarray
+        from get_time_windows(max_duration, max_trip_count - 1)
+
+    Returns
+    -------
+    patterns : pandas.DataFrame
+        one row per tour leg, pattern and stop, indexed by tour_leg_id
+    """
     tours = trips.groupby([TOUR_ID])[[TRIP_DURATION, TRIP_COUNT]].first()
-    duration_and_counts = tours[[TRIP_DURATION, TRIP_COUNT]].values
-
-    # We subtract 1 here, because we already know
-    # the one trip of the tour leg based on main tour
-    # leg duration
-    max_trip_count = trips[TRIP_COUNT].max() - 1
-
-    patterns = []
-    pattern_sizes = []
-
-    for duration, trip_count in duration_and_counts:
-        possible_windows = time_windows[
-            : trip_count - 1,
-            np.where(time_windows[: trip_count - 1].sum(axis=0) == duration)[0],
-        ]
-        possible_windows = np.unique(possible_windows, axis=1).transpose()
-        filler = np.full((possible_windows.shape[0], max_trip_count), np.nan)
-        filler[
-            : possible_windows.shape[0], : possible_windows.shape[1]
-        ] = possible_windows
-        patterns.append(filler)
-        pattern_sizes.append(filler.shape[0])
-
-    patterns = np.concatenate(patterns)
-    pattern_names = ["_".join("%0.0f" % x for x in y[~np.isnan(y)]) for y in patterns]
-    indexes = np.repeat(tours.index, pattern_sizes)
-
-    # If we've done everything right, the indexes
-    # calculated above should be the same length as
-    # the pattern options
-    assert patterns.shape[0] == len(indexes)
-
-    patterns = pd.DataFrame(index=indexes, data=patterns)
-    patterns.index.name = tours.index.name
-    patterns[PATTERN_ID] = pattern_names
-
-    patterns = patterns.melt(
-        id_vars=PATTERN_ID,
-        value_name=STOP_TIME_DURATION,
-        var_name=TRIP_NUM,
-        ignore_index=False,
-    ).reset_index()
-    patterns = patterns[~patterns[STOP_TIME_DURATION].isnull()].copy()
-
-    patterns[TRIP_NUM] = patterns[TRIP_NUM] + 1
-    patterns[STOP_TIME_DURATION] = patterns[STOP_TIME_DURATION].astype(int)
+
+    # durations longer than the time windows have no patterns
+    max_num_stops, max_duration = time_windows.shape[0], time_windows[0].max()
+
+    duration_and_stops = pd.DataFrame(
+        {
+            "duration": tours[TRIP_DURATION].to_numpy().astype(np.int64),
+            "num_stops": np.minimum(
+                tours[TRIP_COUNT].to_numpy() - 1, max_num_stops
+            ).astype(np.int64),
+        }
+    )
+    pattern_sets = duration_and_stops.drop_duplicates()
+    tour_pattern_sets = (
+        duration_and_stops.merge(
+            pattern_sets.reset_index(drop=True).reset_index(), how="left"
+        )["index"]
+        .to_numpy()
+        .astype(np.int64)
+    )
+
+    set_patterns = [
+        _duration_patterns(duration, num_stops)
+        if 0 <= duration <= max_duration
+        else np.zeros((0, num_stops), dtype=np.int64)
+        for duration, num_stops in pattern_sets.itertuples(index=False)
+    ]
+    set_sizes = np.array([p.shape[0] for p in set_patterns], dtype=np.int64)
+    set_num_stops = pattern_sets["num_stops"].to_numpy()
+    set_offsets = np.cumsum(set_sizes) - set_sizes
+
+    all_patterns = np.zeros((set_sizes.sum(), max(set_num_stops.max(), 1)), np.int64)
+    for offset, patterns in zip(set_offsets, set_patterns):
+        all_patterns[offset : offset + len(patterns), : patterns.shape[1]] = patterns
+    pattern_names = np.array(
+        [
+            "_".join(str(x) for x in all_patterns[p, :num_stops])
+            for offset, size, num_stops in zip(set_offsets, set_sizes, set_num_stops)
+            for p in range(offset, offset + size)
+        ],
+        dtype=object,
+    )
+
+    tour_positions, pattern_ixs, stop_nums, stop_durations = _gather_patterns(
+        tour_pattern_sets, set_offsets, set_sizes, set_num_stops, all_patterns
+    )
+
+    patterns = pd.DataFrame(
+        {
+            tours.index.name: tours.index.to_numpy()[tour_positions],
+            PATTERN_ID: pattern_names[pattern_ixs],
+            TRIP_NUM: stop_nums + 1,
+            STOP_TIME_DURATION: stop_durations,
+        }
+    )
 
     patterns = pd.merge(
         patterns,
@@ -168,8 +278,7 @@ def build_patterns(trips, time_windows):
         on=[TOUR_ID, TRIP_NUM],
     )
 
-    patterns.index = patterns.apply(generate_tour_leg_id, axis=1)
-    patterns.index.name = TOUR_LEG_ID
+    patterns.index = pd.Index(tour_leg_ids(patterns), name=TOUR_LEG_ID)
 
     return patterns
 
@@ -293,9 +402,7 @@ def choose_tour_leg_pattern(
         [TOUR_ID, OUTBOUND, PATTERN_ID], as_index=False
     )[["utility"]].sum()
 
-    interaction_utilities[TOUR_LEG_ID] = interaction_utilities.apply(
-        generate_tour_leg_id, axis=1
-    )
+    interaction_utilities[TOUR_LEG_ID] = tour_leg_ids(interaction_utilities)
 
     tour_choosers = interaction_utilities.set_index(TOUR_LEG_ID)
     interaction_utilities = tour_choosers[["utility"]].copy()
@@ -6,17 +6,21 @@ import logging
 from pathlib import Path
 from typing import Any
 
+import numba as nb
 import numpy as np
 import openmatrix as omx
 import pandas as pd
 
-from activitysim.core import config, expressions, los, workflow
+from activitysim.core import chunk, config, expressions, los, workflow
 from activitysim.core.configuration.base import PreprocessorSettings, PydanticReadable
 from activitysim.core.configuration.logit import LogitComponentSettings
 from activitysim.abm.models.parking_location_choice import ParkingLocationSettings
 
 logger = logging.getLogger(__name__)
 
+# partial sums saved by each sub-process for coalesce_pipelines to reduce
+PARTIAL_MATRICES_FILE_NAME = "trip_matrices_partial.npz"
+
 
 class MatrixTableSettings(PydanticReadable):
     name: str
@@ -45,6 +49,29 @@ class WriteTripMatricesSettings(PydanticReadable):
 
     preprocessor: PreprocessorSettings | None = None
 
+    ACCUMULATE_MATRICES: bool = False
+    """Accumulate matrices chunk by chunk instead of from the whole trips table.
+
+    When enabled, trips are annotated in chunks of whole tours and each chunk is
+    added into preallocated zone-by-zone arrays, so the full annotated trips table
+    is never held in memory (unless SAVE_TRIPS_TABLE is also set).  When run in a
+    multiprocess step, each sub-process saves its partial matrices and they are
+    reduced and written to OMX by coalesce_pipelines.
+
+    Annotation expressions must be row-wise (i.e. not depend on other trips)
+    for chunked results to match the whole-table results.
+
+    .. versionadded:: 1.6
+    """
+
+    explicit_chunk: float = 0
+    """
+    If > 0, use this chunk size instead of adaptive chunking when accumulating
+    matrices. If less than 1, use this fraction of the total number of tours.
+
+    .. versionadded:: 1.6
+    """
+
 
 @workflow.step(copy_tables=["trips"])
 def write_trip_matrices(
@@ -83,33 +110,17 @@ def write_trip_matrices(
             model_settings_file_name,
         )
 
+    if model_settings.ACCUMULATE_MATRICES:
+        accumulate_trip_matrices(state, network_los, trips, model_settings)
+        return
+
     trips_df = annotate_trips(state, trips, network_los, model_settings)
 
-    # This block adjusts household sample rate column to account for skipped households.
-    # Note: the `HH_EXPANSION_WEIGHT_COL` is pointing to the `sample_rate` column in the households table.
-    # Based on the calculation in write_matrices() function, the sample_rate is used to calculate the expansion weight as 1 / sample_rate.
-    # A sample_rate of 0.01 means the sample household should be expanded 1/0.01 = 100 times in the actual population households.
-    # In simulation, the `sample_rate` is calculated and added to the synthetic households
-    # based on household_sample_size / total_household_count, and therefore is the same for all households.
-    # In estimation, the `sample_rate` may vary by household, but weights are not used in estimation, and write_trip_matrices is not called during estimation.
-    # But we still try to cover both cases (when rates are the same vs when they vary) here for consistency.
     hh_weight_col = model_settings.HH_EXPANSION_WEIGHT_COL
-    household_sample_rate = state.get_dataframe("households")[hh_weight_col]
-    zero_household_sample_rate = household_sample_rate == 0
-
-    # Check if there are households with zero `sample_rate`, which will result in inf expansion weight.
-    # If all households have zero `sample_rate`, then all trips will have inf expansion weight, we will use household count instead of weight for adjustment factor calculation
-    # If some households have zero `sample_rate`, we will print a warning and skip trips from those households in the trip matrix generation.
-    if zero_household_sample_rate.all():
-        logger.warning(
-            f"All households have {hh_weight_col} of 0, which will result in inf expansion weight. "
-            f"Trip matrix generation will be based on household count instead of weight."
-        )
-    elif zero_household_sample_rate.any():
-        logger.warning(
-            f"Some households have {hh_weight_col} of 0, which will result in inf expansion weight. "
-            f"Trips from those households will be skipped in trip matrix generation."
-        )
+    skip_zero_weights, adjustment_factor = household_weight_adjustment(
+        state, model_settings
+    )
+    if skip_zero_weights:
         trips_df = trips_df[trips_df[hh_weight_col] != 0]
         # skip trip matrix generation if there are no trips left after filtering out zero sample_rate households
         if trips_df.empty:
@@ -118,70 +129,13 @@ def write_trip_matrices(
                 f"Trip matrix generation will be skipped."
             )
             return
-
-    if state.get("num_skipped_households", 0) > 0:
-        logger.info(
-            f"Adjusting household sample rate in {hh_weight_col} to account for {state.get('num_skipped_households', 0)} skipped households."
-        )
-        skipped_sample_rate = state.get_dataframe("households_skipped")[hh_weight_col]
-        remaining_sample_rate = household_sample_rate
-
-        if zero_household_sample_rate.all():
-            # if all households have zero sample rate, we will use household count instead of weight for adjustment factor calculation
-            skipped_household_count = state.get("num_skipped_households", 0)
-            remaining_household_count = len(state.get_dataframe("households"))
-            total_household_count = skipped_household_count + remaining_household_count
-            adjustment_factor = remaining_household_count / total_household_count
-        else:
-            # adjust the hh sample rates to account for skipped households
-            # first get the total expansion weight of the skipped households, which will be the sum of inverse of their sample rates
-            skipped_household_weights = (
-                1 / skipped_sample_rate[skipped_sample_rate != 0]
-            ).sum()
-            # next get the total expansion weight of the remaining households
-            remaining_household_weights = (
-                1 / remaining_sample_rate[remaining_sample_rate != 0]
-            ).sum()
-            # the adjustment factor is the remaining household weight / (remaining household weight + skipped household weight)
-            total_household_weights = (
-                remaining_household_weights + skipped_household_weights
-            )
-            adjustment_factor = remaining_household_weights / total_household_weights
+    if adjustment_factor is not None:
         trips_df[hh_weight_col] = trips_df[hh_weight_col] * adjustment_factor
 
     if model_settings.SAVE_TRIPS_TABLE:
         state.add_table("trips", trips_df)
 
-    if "parking_location" in state.settings.models:
-        parking_settings = ParkingLocationSettings.read_settings_file(
-            state.filesystem,
-            "parking_location_choice.yaml",
-        )
-        parking_taz_col_name = parking_settings.ALT_DEST_COL_NAME
-        if ~(trips_df["trip_mode"].isin(parking_settings.AUTO_MODES)).any():
-            logger.warning(
-                f"Parking location choice model is enabled, but none of {parking_settings.AUTO_MODES} auto modes found in trips table."
-                "See AUTO_MODES setting in parking_location_choice.yaml."
-            )
-
-        if parking_taz_col_name in trips_df:
-            trips_df["true_origin"] = trips_df["origin"]
-            trips_df["true_destination"] = trips_df["destination"]
-
-            # Get origin parking zone if vehicle not parked at origin
-            trips_df["origin_parking_zone"] = np.where(
-                (trips_df["tour_id"] == trips_df["tour_id"].shift(1))
-                & trips_df["trip_mode"].isin(parking_settings.AUTO_MODES),
-                trips_df[parking_taz_col_name].shift(1),
-                -1,
-            )
-
-            trips_df.loc[trips_df[parking_taz_col_name] > 0, "destination"] = trips_df[
-                parking_taz_col_name
-            ]
-            trips_df.loc[trips_df["origin_parking_zone"] > 0, "origin"] = trips_df[
-                "origin_parking_zone"
-            ]
+    park_trips(state, trips_df)
 
     # write matrices by zone system type
     if network_los.zone_system == los.ONE_ZONE:  # taz trips written to taz matrices
@@ -266,6 +220,129 @@ def write_trip_matrices(
             state, aggregate_trips, zone_index, orig_index, dest_index, model_settings
         )
 
+    unpark_trips(state, network_los, trips_df)
+
+
+def household_weight_adjustment(
+    state: workflow.State, model_settings: WriteTripMatricesSettings
+) -> tuple[bool, float | None]:
+    """
+    Check household expansion weights before trips are aggregated.
+
+    Returns
+    -------
+    skip_zero_weights : bool
+        whether trips from households with a zero weight column must be skipped
+    adjustment_factor : float or None
+        factor to apply to the weight column of trips to account for skipped
+        households, or None if no households were skipped
+    """
+    hh_weight_col = model_settings.HH_EXPANSION_WEIGHT_COL
+    # This block adjusts household sample rate column to account for skipped households.
+    # Note: the `HH_EXPANSION_WEIGHT_COL` is pointing to the `sample_rate` column in the households table.
+    # Based on the calculation in write_matrices() function, the sample_rate is used to calculate the expansion weight as 1 / sample_rate.
+    # A sample_rate of 0.01 means the sample household should be expanded 1/0.01 = 100 times in the actual population households.
+    # In simulation, the `sample_rate` is calculated and added to the synthetic households
+    # based on household_sample_size / total_household_count, and therefore is the same for all households.
+    # In estimation, the `sample_rate` may vary by household, but weights are not used in estimation, and write_trip_matrices is not called during estimation.
+    # But we still try to cover both cases (when rates are the same vs when they vary) here for consistency.
+    household_sample_rate = state.get_dataframe("households")[hh_weight_col]
+    zero_household_sample_rate = household_sample_rate == 0
+    skip_zero_weights = False
+    adjustment_factor = None
+
+    # Check if there are households with zero `sample_rate`, which will result in inf expansion weight.
+    # If all households have zero `sample_rate`, then all trips will have inf expansion weight, we will use household count instead of weight for adjustment factor calculation
+    # If some households have zero `sample_rate`, we will print a warning and skip trips from those households in the trip matrix generation.
+    if zero_household_sample_rate.all():
+        logger.warning(
+            f"All households have {hh_weight_col} of 0, which will result in inf expansion weight. "
+            f"Trip matrix generation will be based on household count instead of weight."
+        )
+    elif zero_household_sample_rate.any():
+        logger.warning(
+            f"Some households have {hh_weight_col} of 0, which will result in inf expansion weight. "
+            f"Trips from those households will be skipped in trip matrix generation."
+        )
+        skip_zero_weights = True
+
+    if state.get("num_skipped_households", 0) > 0:
+        logger.info(
+            f"Adjusting household sample rate in {hh_weight_col} to account for {state.get('num_skipped_households', 0)} skipped households."
+        )
+        skipped_sample_rate = state.get_dataframe("households_skipped")[hh_weight_col]
+        remaining_sample_rate = household_sample_rate
+
+        if zero_household_sample_rate.all():
+            # if all households have zero sample rate, we will use household count instead of weight for adjustment factor calculation
+            skipped_household_count = state.get("num_skipped_households", 0)
+            remaining_household_count = len(state.get_dataframe("households"))
+            total_household_count = skipped_household_count + remaining_household_count
+            adjustment_factor = remaining_household_count / total_household_count
+        else:
+            # adjust the hh sample rates to account for skipped households
+            # first get the total expansion weight of the skipped households, which will be the sum of inverse of their sample rates
+            skipped_household_weights = (
+                1 / skipped_sample_rate[skipped_sample_rate != 0]
+            ).sum()
+            # next get the total expansion weight of the remaining households
+            remaining_household_weights = (
+                1 / remaining_sample_rate[remaining_sample_rate != 0]
+            ).sum()
+            # the adjustment factor is the remaining household weight / (remaining household weight + skipped household weight)
+            total_household_weights = (
+                remaining_household_weights + skipped_household_weights
+            )
+            adjustment_factor = remaining_household_weights / total_household_weights
+
+    return skip_zero_weights, adjustment_factor
+
+
+def park_trips(state: workflow.State, trips_df: pd.DataFrame) -> None:
+    """
+    Move auto trip ends to their parking zones, keeping the true ends.
+
+    Trips must be in tour order, as the origin parking zone of a trip is
+    the destination parking zone of the preceding trip on the same tour.
+    """
+    if "parking_location" in state.settings.models:
+        parking_settings = ParkingLocationSettings.read_settings_file(
+            state.filesystem,
+            "parking_location_choice.yaml",
+        )
+        parking_taz_col_name = parking_settings.ALT_DEST_COL_NAME
+        if ~(trips_df["trip_mode"].isin(parking_settings.AUTO_MODES)).any():
+            logger.warning(
+                f"Parking location choice model is enabled, but none of {parking_settings.AUTO_MODES} auto modes found in trips table."
+                "See AUTO_MODES setting in parking_location_choice.yaml."
+            )
+
+        if parking_taz_col_name in trips_df:
+            trips_df["true_origin"] = trips_df["origin"]
+            trips_df["true_destination"] = trips_df["destination"]
+
+            # Get origin parking zone if vehicle not parked at origin
+            trips_df["origin_parking_zone"] = np.where(
+                (trips_df["tour_id"] == trips_df["tour_id"].shift(1))
+                & trips_df["trip_mode"].isin(parking_settings.AUTO_MODES),
+                trips_df[parking_taz_col_name].shift(1),
+                -1,
+            )
+
+            trips_df.loc[trips_df[parking_taz_col_name] > 0, "destination"] = trips_df[
+                parking_taz_col_name
+            ]
+            trips_df.loc[trips_df["origin_parking_zone"] > 0, "origin"] = trips_df[
+                "origin_parking_zone"
+            ]
+
+
+def unpark_trips(
+    state: workflow.State, network_los: los.Network_LOS, trips_df: pd.DataFrame
+) -> None:
+    """
+    Restore the true trip ends moved by park_trips.
+    """
     if "parking_location" in state.settings.models:
         # Set trip origin and destination to be the actual location the person is and not where their vehicle is parked
         trips_df["origin"] = trips_df["true_origin"]
@@ -404,3 +481,334 @@ def write_matrices(
 
         logger.info("closing %s" % filepath)
         file.close()
+
+
+@nb.njit
+def _accumulate_od(totals, orig_index, dest_index, values):
+    for i in range(orig_index.shape[0]):
+        totals[orig_index[i], dest_index[i]] += values[i]
+
+
+class TripMatrixAccumulator:
+    """
+    Zone-by-zone trip matrices accumulated from chunks of annotated trips.
+
+    For each data_field the accumulator keeps the sum over trips by origin and
+    destination zone, together with the trip count and the sum of household
+    expansion weights, which is all that is needed to produce the same matrices
+    as write_matrices (i.e. sums divided by the mean expansion weight of the
+    trips between each pair of zones).  Accumulators for different slices of
+    the trips can be merged, and saved and loaded to pass them between processes.
+    """
+
+    def __init__(
+        self,
+        zone_labels: pd.Index,
+        data_fields: list[str],
+        hh_weight_col: str | None = None,
+    ):
+        self.zone_labels = pd.Index(zone_labels)
+        num_zones = len(self.zone_labels)
+        self.sums = {
+            col: np.zeros((num_zones, num_zones)) for col in dict.fromkeys(data_fields)
+        }
+        self.counts = np.zeros((num_zones, num_zones), dtype=np.int64)
+        self.hh_weight_col = hh_weight_col or None
+        self.weights = np.zeros((num_zones, num_zones)) if self.hh_weight_col else None
+
+    def add(self, orig_index: np.ndarray, dest_index: np.ndarray, trips_df):
+        """
+        Add trips into the matrices.
+
+        Parameters
+        ----------
+        orig_index, dest_index : array of int
+            positions of the origin and destination zone of each trip in zone_labels
+        trips_df : pandas.DataFrame
+            annotated trips with a column for each data_field (and the weight column)
+        """
+        orig_index = np.asanyarray(orig_index, dtype=np.int64)
+        dest_index = np.asanyarray(dest_index, dtype=np.int64)
+        for col, totals in self.sums.items():
+            _accumulate_od(
+                totals, orig_index, dest_index, trips_df[col].to_numpy(np.float64)
+            )
+        _accumulate_od(
+            self.counts, orig_index, dest_index, np.ones(len(orig_index), np.int64)
+        )
+        if self.weights is not None:
+            _accumulate_od(
+                self.weights,
+                orig_index,
+                dest_index,
+                trips_df[self.hh_weight_col].to_numpy(np.float64),
+            )
+
+    def merge(self, other: TripMatrixAccumulator) -> TripMatrixAccumulator:
+        """
+        Add the matrices accumulated by another accumulator into this one.
+        """
+        assert self.zone_labels.equals(other.zone_labels)
+        assert self.sums.keys() == other.sums.keys()
+        for col, totals in self.sums.items():
+            totals += other.sums[col]
+        self.counts += other.counts
+        if self.weights is not None:
+            self.weights += other.weights
+        return self
+
+    def matrix(self, data_field: str) -> np.ndarray:
+        """
+        Expanded zone-by-zone matrix for a data_field.
+        """
+        if self.weights is None:
+            return self.sums[data_field].copy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_weights = self.weights / self.counts
+            return np.where(self.counts > 0, self.sums[data_field] / mean_weights, 0)
+
+    def save(self, file_path: Path):
+        arrays = {f"sum_{col}": totals for col, totals in self.sums.items()}
+        if self.weights is not None:
+            arrays["weights"] = self.weights
+        np.savez(
+            file_path,
+            zone_labels=self.zone_labels.to_numpy(),
+            zone_name=np.array(self.zone_labels.name or ""),
+            hh_weight_col=np.array(self.hh_weight_col or ""),
+            counts=self.counts,
+            **arrays,
+        )
+
+    @classmethod
+    def load(cls, file_path: Path) -> TripMatrixAccumulator:
+        with np.load(file_path, allow_pickle=False) as arrays:
+            zone_labels = pd.Index(
+                arrays["zone_labels"], name=str(arrays["zone_name"]) or None
+            )
+            data_fields = [key[4:] for key in arrays.files if key.startswith("sum_")]
+            accumulator = cls(zone_labels, data_fields, str(arrays["hh_weight_col"]))
+            for col in data_fields:
+                accumulator.sums[col][:] = arrays[f"sum_{col}"]
+            accumulator.counts[:] = arrays["counts"]
+            if accumulator.weights is not None:
+                accumulator.weights[:] = arrays["weights"]
+        return accumulator
+
+
+def trip_matrix_zones(
+    state: workflow.State, network_los: los.Network_LOS
+) -> tuple[pd.Index, pd.Index]:
+    """
+    Zones indexed by trip ends and zone labels written to the matrices.
+
+    For the one zone system, the trip ends are land use zones, labeled with
+    their original zone ids.  For the two zone system, trip ends are mapped
+    to tazs and the taz skim zone names are used for both.
+    """
+    if network_los.zone_system == los.ONE_ZONE:
+        land_use = state.get_dataframe("land_use")
+        zone_index = land_use.index
+        try:
+            zone_labels = pd.Index(land_use[f"_original_{land_use.index.name}"])
+        except KeyError:
+            zone_labels = land_use.index
+        return zone_index, zone_labels
+
+    assert network_los.zone_system == los.TWO_ZONE
+    zone_index = pd.Index(network_los.get_tazs(state), name="TAZ")
+    return zone_index, zone_index
+
+
+def trip_od_positions(
+    state: workflow.State,
+    network_los: los.Network_LOS,
+    trips_df: pd.DataFrame,
+    zone_index: pd.Index,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of the origin and destination zone of each trip in zone_index.
+
+    For the two zone system this also adds the otaz and dtaz columns to trips_df.
+    """
+    if network_los.zone_system == los.ONE_ZONE:
+        orig_vals = trips_df["origin"]
+        dest_vals = trips_df["destination"]
+    else:
+        land_use = state.get_dataframe("land_use")
+        trips_df["otaz"] = land_use.reindex(trips_df["origin"]).TAZ.tolist()
+        trips_df["dtaz"] = land_use.reindex(trips_df["destination"]).TAZ.tolist()
+        orig_vals = trips_df["otaz"]
+        dest_vals = trips_df["dtaz"]
+        try:
+            land_use_taz = state.get_dataframe("land_use_taz")
+        except (KeyError, RuntimeError):
+            pass  # table missing, ignore
+        else:
+            if "_original_TAZ" in land_use_taz.columns:
+                orig_vals = orig_vals.map(land_use_taz["_original_TAZ"])
+                dest_vals = dest_vals.map(land_use_taz["_original_TAZ"])
+
+    orig_index = zone_index.get_indexer(orig_vals)
+    dest_index = zone_index.get_indexer(dest_vals)
+    assert (orig_index >= 0).all()
+    assert (dest_index >= 0).all()
+    return orig_index, dest_index
+
+
+def accumulate_trip_matrices(
+    state: workflow.State,
+    network_los: los.Network_LOS,
+    trips: pd.DataFrame,
+    model_settings: WriteTripMatricesSettings,
+) -> None:
+    """
+    Write trip matrices accumulated from chunks of annotated trips.
+
+    Trips are chunked by tour, so that parking zones can still be carried over
+    from one trip to the next, and each chunk is annotated and added into a
+    TripMatrixAccumulator.  In a multiprocess sub-process the accumulated
+    matrices are saved for coalesce_pipelines to reduce and write, otherwise
+    they are written to OMX directly.
+    """
+    trace_label = "write_trip_matrices"
+    hh_weight_col = model_settings.HH_EXPANSION_WEIGHT_COL
+
+    skip_zero_weights, adjustment_factor = household_weight_adjustment(
+        state, model_settings
+    )
+
+    zone_index, zone_labels = trip_matrix_zones(state, network_los)
+    data_fields = [
+        table.data_field
+        for matrix in model_settings.MATRICES
+        for table in matrix.tables
+    ]
+    accumulator = TripMatrixAccumulator(zone_labels, data_fields, hh_weight_col)
+
+    # consecutive trips on the same tour share a chunk_id so chunks are whole tours
+    trips["chunk_id"] = (
+        trips["tour_id"].ne(trips["tour_id"].shift()).cumsum().to_numpy() - 1
+    )
+
+    trips_chunks = []
+    for (
+        i,
+        trips_chunk,
+        chunk_trace_label,
+        chunk_sizer,
+    ) in chunk.adaptive_chunked_choosers_by_chunk_id(
+        state, trips, trace_label, explicit_chunk_size=model_settings.explicit_chunk
+    ):
+        trips_df = annotate_trips(
+            state, trips_chunk.drop(columns="chunk_id"), network_los, model_settings
+        )
+        chunk_sizer.log_df(chunk_trace_label, "trips_df", trips_df)
+
+        missing = [col for col in accumulator.sums if col not in trips_df]
+        if missing:
+            logger.error(f"missing {missing} columns in annotated trips DataFrame")
+            return
+
+        if skip_zero_weights:
+            trips_df = trips_df[trips_df[hh_weight_col] != 0]
+        if adjustment_factor is not None:
+            trips_df[hh_weight_col] = trips_df[hh_weight_col] * adjustment_factor
+
+        park_trips(state, trips_df)
+        orig_index, dest_index = trip_od_positions(
+            state, network_los, trips_df, zone_index
+        )
+        accumulator.add(orig_index, dest_index, trips_df)
+        unpark_trips(state, network_los, trips_df)
+
+        if model_settings.SAVE_TRIPS_TABLE:
+            trips_chunks.append(trips_df)
+        del trips_df
+        chunk_sizer.log_df(chunk_trace_label, "trips_df", None)
+
+    if model_settings.SAVE_TRIPS_TABLE:
+        state.add_table("trips", pd.concat(trips_chunks))
+
+    if state.get_injectable("num_processes", 1) > 1:
+        file_path = state.get_output_file_path(
+            PARTIAL_MATRICES_FILE_NAME,
+            prefix=state.get_injectable("pipeline_file_prefix"),
+        )
+        logger.info("write_trip_matrices deferring matrices to coalesce_pipelines")
+        accumulator.save(file_path)
+        return
+
+    if skip_zero_weights and not accumulator.counts.any():
+        logger.warning(
+            f"All trips have {hh_weight_col} of 0, which will result in inf expansion weight. "
+            f"Trip matrix generation will be skipped."
+        )
+        return
+
+    write_accumulated_matrices(state, accumulator, model_settings)
+
+
+def write_accumulated_matrices(
+    state: workflow.State,
+    accumulator: TripMatrixAccumulator,
+    model_settings: WriteTripMatricesSettings,
+):
+    """
+    Write matrices from a TripMatrixAccumulator to OMX format.
+
+    Unlike write_matrices, a data_field used by several tables is expanded
+    by the household weights only once.
+    """
+    matrix_settings = model_settings.MATRICES
+
+    if not matrix_settings:
+        logger.error("Missing MATRICES setting in write_trip_matrices.yaml")
+
+    zone_labels = accumulator.zone_labels
+    for matrix in matrix_settings:
+        filename = str(matrix.file_name)
+        filepath = state.get_output_file_path(filename)
+        logger.info("opening %s" % filepath)
+        with omx.open_file(str(filepath), "w") as file:
+            for table in matrix.tables:
+                data = accumulator.matrix(table.data_field)
+                logger.debug("writing %s sum %0.2f" % (table.name, data.sum()))
+                file[table.name] = data
+
+            logger.info(
+                "adding %s mapping for %s zones to %s"
+                % (zone_labels.name, zone_labels.size, filename)
+            )
+            file.create_mapping(zone_labels.name, zone_labels.to_numpy())
+
+
+def reduce_trip_matrices(state: workflow.State, sub_proc_names: list[str]) -> None:
+    """
+    Reduce and write the partial matrices saved by write_trip_matrices sub-processes.
+
+    This is called by coalesce_pipelines for multiprocess steps that run
+    write_trip_matrices, and does nothing unless ACCUMULATE_MATRICES is set.
+    """
+    model_settings = WriteTripMatricesSettings.read_settings_file(
+        state.filesystem, "write_trip_matrices.yaml"
+    )
+    if not model_settings.ACCUMULATE_MATRICES:
+        return
+
+    accumulator = None
+    for process_name in sub_proc_names:
+        file_path = state.get_output_file_path(
+            PARTIAL_MATRICES_FILE_NAME, prefix=process_name
+        )
+        if not file_path.exists():
+            logger.warning(f"no partial trip matrices from {process_name}")
+            continue
+        partial = TripMatrixAccumulator.load(file_path)
+        accumulator = partial if accumulator is None else accumulator.merge(partial)
+        file_path.unlink()
+
+    if accumulator is None:
+        return
+
+    write_accumulated_matrices(state, accumulator, model_settings)
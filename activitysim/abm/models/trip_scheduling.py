@@ -7,6 +7,7 @@ import warnings
 from builtins import range
 from typing import Any, List, Literal
 
+import numba as nb
 import numpy as np
 import pandas as pd
 
@@ -18,7 +19,11 @@ from activitysim.abm.models.util.trip import cleanup_failed_trips, failed_trip_c
 from activitysim.core import chunk, config, estimation, expressions, tracing, workflow
 from activitysim.core.configuration.base import PreprocessorSettings, PydanticReadable
 from activitysim.core.util import reindex
-from activitysim.core.exceptions import InvalidTravelError, PipelineError
+from activitysim.core.exceptions import (
+    InvalidTravelError,
+    ModelConfigurationError,
+    PipelineError,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -362,6 +367,211 @@ def schedule_trips_in_leg(
     return choices
 
 
+@nb.njit
+def _sample_leg_departures(offsets, probs, rands):
+    """
+    Draw the departure periods of the trips in each leg in a single forward pass.
+
+    The trips of a leg are visited in scheduling order, and may not depart before the
+    trip scheduled before them. Each trip departs at period t with probability
+    proportional to probs[trip, t] times the probability that the trips after it can
+    still depart at or after t, which is computed by a backward pass over the leg.
+    This gives the distribution that rescheduling legs until none of their trips fail
+    converges to, without any retries.
+
+    If no departure of a trip allows the rest of the leg to be scheduled, it departs
+    with its own (truncated) probabilities, and if it has none left it fails.
+
+    Parameters
+    ----------
+    offsets : array of int
+        trips of leg l are offsets[l]:offsets[l + 1]
+    probs : 2-D array of float
+        departure probability by trip (in scheduling order) and period, with periods
+        in scheduling direction and zero outside each trip's departure window
+    rands : array of float
+        one uniform random number per trip
+
+    Returns
+    -------
+    choices : array of int
+        period of each trip's departure, or of the most initial departure it could
+        have had (-1 if unconstrained) if it failed
+    failed : array of bool
+    """
+    num_trips, num_periods = probs.shape
+    choices = np.full(num_trips, -1, dtype=np.int64)
+    failed = np.zeros(num_trips, dtype=np.bool_)
+
+    # z[i, t] is proportional to the probability that the trips after trip i
+    # can depart if trip i departs at t
+    z = np.empty((num_trips, num_periods))
+    weights = np.empty(num_periods)
+
+    for leg in range(len(offsets) - 1):
+        start = offsets[leg]
+        end = offsets[leg + 1]
+
+        for t in range(num_periods):
+            z[end - 1, t] = 1.0
+        for i in range(end - 2, start - 1, -1):
+            # suffix sums of the next trip's weights, rescaled to avoid underflow
+            suffix = 0.0
+            for t in range(num_periods - 1, -1, -1):
+                suffix += probs[i + 1, t] * z[i + 1, t]
+                z[i, t] = suffix
+            if suffix > 0:
+                for t in range(num_periods):
+                    z[i, t] /= suffix
+
+        prev = -1
+        for i in range(start, end):
+            first = max(prev, 0)
+            total = 0.0
+            for t in range(first, num_periods):
+                weights[t] = probs[i, t] * z[i, t]
+                total += weights[t]
+            if total <= 0:
+                for t in range(first, num_periods):
+                    weights[t] = probs[i, t]
+                    total += weights[t]
+            if total <= 0:
+                failed[i] = True
+                choices[i] = prev
+                continue
+
+            threshold = rands[i] * total
+            cum = 0.0
+            choice = -1
+            for t in range(first, num_periods):
+                if weights[t] > 0:
+                    choice = t
+                    cum += weights[t]
+                    if threshold < cum:
+                        break
+            choices[i] = choice
+            prev = choice
+
+    return choices, failed
+
+
+def schedule_trips_in_leg_conditionally(
+    state: workflow.State,
+    outbound,
+    trips,
+    probs_spec,
+    model_settings: TripSchedulingSettings,
+    trace_label,
+    *,
+    chunk_sizer: chunk.ChunkSizer,
+):
+    """
+    Schedule the trips of a leg in a single pass per tour with _sample_leg_departures,
+    rather than trip_num by trip_num with failures left to later iterations.
+
+    Parameters
+    ----------
+    state
+    outbound
+    trips
+    probs_spec
+    model_settings
+    trace_label
+
+    Returns
+    -------
+    choices: pd.Series
+        depart choice for trips, indexed by trip_id (except for failed trips
+        when FAILFIX is drop_and_cleanup)
+    """
+    depart_alt_base = model_settings.DEPART_ALT_BASE
+    probs_join_cols = (
+        model_settings.probs_join_cols or PROBS_JOIN_COLUMNS_DEPARTURE_BASED
+    )
+
+    assert len(trips) > 0
+    assert (trips.outbound == outbound).all()
+
+    to_from_tour_orig = (
+        (trips.trip_num == 1) if outbound else (trips.trip_num == trips.trip_count)
+    )
+    do_not_schedule = to_from_tour_orig | (trips.primary_purpose == "atwork")
+    choices = trips.tour_hour[do_not_schedule]
+
+    if do_not_schedule.all():
+        return choices
+
+    result_list = [choices]
+
+    # trips in scheduling order, outbound forward and inbound backward in time
+    trips = trips[~do_not_schedule].sort_values(
+        ["tour_id", "trip_num"], ascending=[True, outbound]
+    )
+
+    if model_settings.preprocessor:
+        locals_dict = {"network_los": state.get_injectable("network_los")}
+        locals_dict.update(config.get_model_constants(model_settings))
+        expressions.annotate_preprocessors(
+            state,
+            df=trips,
+            locals_dict=locals_dict,
+            skims=None,
+            model_settings=model_settings,
+            trace_label=trace_label,
+        )
+
+    choosers = pd.merge(
+        trips.reset_index(), probs_spec, on=probs_join_cols, how="left"
+    ).set_index(trips.index.name)
+    probs_cols = [c for c in probs_spec.columns if c not in probs_join_cols]
+    probs = ps._clip_probs(trips, choosers[probs_cols], depart_alt_base).fillna(0)
+    chunk_sizer.log_df(trace_label, "probs", probs)
+
+    probs = probs.to_numpy(dtype=np.float64)
+    if not outbound:
+        probs = probs[:, ::-1]
+
+    _, leg_sizes = np.unique(trips.tour_id.to_numpy(), return_counts=True)
+    offsets = np.zeros(len(leg_sizes) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(leg_sizes)
+
+    rands = state.get_rn_generator().random_for_df(trips).reshape(-1)
+
+    periods, failed = _sample_leg_departures(
+        offsets, np.ascontiguousarray(probs), rands
+    )
+    if not outbound:
+        periods = np.where(periods >= 0, probs.shape[1] - 1 - periods, -1)
+
+    # failed trips get their most initial departure (the departure of the trip
+    # scheduled before them, or the edge of their window)
+    most_initial = trips.earliest if outbound else trips.latest
+    choices = pd.Series(
+        np.where(periods >= 0, periods + depart_alt_base, most_initial),
+        index=trips.index,
+    )
+
+    if failed.any():
+        if model_settings.FAILFIX == FAILFIX_CHOOSE_MOST_INITIAL:
+            logger.warning(
+                "%s coercing %s depart choices to most initial"
+                % (trace_label, failed.sum())
+            )
+        else:
+            choices = choices[~failed]
+
+    if state.settings.trace_hh_id and state.tracing.has_trace_targets(trips):
+        state.tracing.trace_df(choosers, "%s.choosers" % trace_label)
+        state.tracing.trace_df(
+            choices, "%s.choices" % trace_label, columns=[None, "depart"]
+        )
+
+    result_list.append(choices)
+    chunk_sizer.log_df(trace_label, "result_list", result_list)
+
+    return pd.concat(result_list)
+
+
 def run_trip_scheduling(
     state: workflow.State,
     trips_chunk,
@@ -387,16 +597,27 @@ def run_trip_scheduling(
     if trips_chunk.outbound.any():
         leg_chunk = trips_chunk[trips_chunk.outbound]
         leg_trace_label = tracing.extend_trace_label(trace_label, "outbound")
-        choices = schedule_trips_in_leg(
-            state,
-            outbound=True,
-            trips=leg_chunk,
-            probs_spec=probs_spec,
-            model_settings=model_settings,
-            is_last_iteration=is_last_iteration,
-            trace_label=leg_trace_label,
-            chunk_sizer=chunk_sizer,
-        )
+        if model_settings.depart_sampling == "conditional":
+            choices = schedule_trips_in_leg_conditionally(
+                state,
+                outbound=True,
+                trips=leg_chunk,
+                probs_spec=probs_spec,
+                model_settings=model_settings,
+                trace_label=leg_trace_label,
+                chunk_sizer=chunk_sizer,
+            )
+        else:
+            choices = schedule_trips_in_leg(
+                state,
+                outbound=True,
+                trips=leg_chunk,
+                probs_spec=probs_spec,
+                model_settings=model_settings,
+                is_last_iteration=is_last_iteration,
+                trace_label=leg_trace_label,
+                chunk_sizer=chunk_sizer,
+            )
         result_list.append(choices)
 
         chunk_sizer.log_df(trace_label, "result_list", result_list)
@@ -408,16 +629,27 @@ def run_trip_scheduling(
     if (~trips_chunk.outbound).any():
         leg_chunk = trips_chunk[~trips_chunk.outbound]
         leg_trace_label = tracing.extend_trace_label(trace_label, "inbound")
-        choices = schedule_trips_in_leg(
-            state,
-            outbound=False,
-            trips=leg_chunk,
-            probs_spec=probs_spec,
-            model_settings=model_settings,
-            is_last_iteration=is_last_iteration,
-            trace_label=leg_trace_label,
-            chunk_sizer=chunk_sizer,
-        )
+        if model_settings.depart_sampling == "conditional":
+            choices = schedule_trips_in_leg_conditionally(
+                state,
+                outbound=False,
+                trips=leg_chunk,
+                probs_spec=probs_spec,
+                model_settings=model_settings,
+                trace_label=leg_trace_label,
+                chunk_sizer=chunk_sizer,
+            )
+        else:
+            choices = schedule_trips_in_leg(
+                state,
+                outbound=False,
+                trips=leg_chunk,
+                probs_spec=probs_spec,
+                model_settings=model_settings,
+                is_last_iteration=is_last_iteration,
+                trace_label=leg_trace_label,
+                chunk_sizer=chunk_sizer,
+            )
         result_list.append(choices)
 
         chunk_sizer.log_df(trace_label, "result_list", result_list)
@@ -456,6 +688,22 @@ class TripSchedulingSettings(PydanticReadable):
 
     logic_version: int | None = None
 
+    depart_sampling: Literal["iterative", "conditional"] = "iterative"
+    """How the departures of the trips in each leg are sampled.
+
+    With "iterative", trips are scheduled trip_num by trip_num, each one from its
+    probabilities clipped to the window left by the trips before it, and legs
+    with a failed trip are rescheduled, up to MAX_ITERATIONS times, before FAILFIX
+    is applied. With "conditional", each leg is scheduled in a single pass, with
+    every trip's departure drawn conditional on the rest of its leg still having
+    a departure, so trips only fail (and FAILFIX only applies) if the probabilities
+    leave no way to schedule them at all, and MAX_ITERATIONS is not used. This
+    draws departures from the distribution that rescheduling failed legs converges
+    to. It is only available with the "departure" scheduling_mode.
+
+    .. versionadded:: 1.6
+    """
+
     CONSTANTS: dict[str, Any] = {}
 
 
@@ -572,6 +820,15 @@ def trip_scheduling(
     max_iterations = model_settings.MAX_ITERATIONS
     assert max_iterations > 0
 
+    if model_settings.depart_sampling == "conditional":
+        if model_settings.scheduling_mode != DEPARTURE_MODE:
+            raise ModelConfigurationError(
+                "conditional depart_sampling requires departure scheduling_mode, "
+                f"not {model_settings.scheduling_mode}"
+            )
+        # legs are scheduled in a single pass, so there is nothing to retry
+        max_iterations = 1
+
     choices_list = []
 
     for (
@@ -5,6 +5,7 @@ from __future__ import annotations
 import itertools
 import logging
 
+import numba as nb
 import numpy as np
 import pandas as pd
 
@@ -904,6 +905,195 @@ def hh_choosers(state: workflow.State, indiv_utils, hhsize):
     return choosers
 
 
+# activity codes in the order of the household pattern alternatives, e.g. HH, HM, HN, MH, ...
+PATTERN_ACTIVITIES = "HMN"
+
+# interaction ptype keys are the ptypes of the interacting persons as sorted decimal digits
+# (e.g. 13 for ptypes 3 and 1), so there are fewer than 10**MAX_INTERACTION_CARDINALITY
+MAX_INTERACTION_KEY = 10**MAX_INTERACTION_CARDINALITY
+
+
+def compile_interaction_coefficients(interaction_coefficients):
+    """
+    Tabulate preprocessed interaction coefficients for household_pattern_utilities
+
+    Coefficients for the same activity and interaction_ptypes override each other (the
+    last one applies) as they do in build_cdap_spec, where each repeated wildcard row
+    also adds another spec row with that coefficient.
+
+    Parameters
+    ----------
+    interaction_coefficients : pandas.DataFrame
+        as returned by preprocess_interaction_coefficients
+
+    Returns
+    -------
+    interaction_coefs : numpy.ndarray
+        coefficient by activity (in PATTERN_ACTIVITIES order) and interaction ptype key
+    wildcard_coefs : numpy.ndarray
+        coefficient by activity and household size, for the wildcard interactions that
+        apply when every member of a household has that activity
+    """
+    interaction_coefs = np.zeros((len(PATTERN_ACTIVITIES), MAX_INTERACTION_KEY))
+    wildcard_coefs = np.zeros((len(PATTERN_ACTIVITIES), MAX_HHSIZE + 1))
+    wildcard_rows = np.zeros_like(wildcard_coefs)
+
+    for row in interaction_coefficients.itertuples():
+        activity = PATTERN_ACTIVITIES.index(row.activity)
+        if not row.interaction_ptypes:
+            if row.cardinality <= MAX_HHSIZE:
+                wildcard_coefs[activity, row.cardinality] = row.coefficient
+                wildcard_rows[activity, row.cardinality] += 1
+            continue
+
+        if not (0 <= row.cardinality <= MAX_INTERACTION_CARDINALITY):
+            raise ModelConfigurationError(
+                "Bad row cardinality %d for %s. Try checking that all interaction terms include 3 or fewer person types."
+                % (row.cardinality, row.slug)
+            )
+        interaction_coefs[activity, int(row.interaction_ptypes)] = row.coefficient
+
+    return interaction_coefs, wildcard_coefs * wildcard_rows
+
+
+@nb.njit
+def _household_pattern_utilities(
+    indiv_utils, ptypes, interaction_coefs, wildcard_coefs, combinations
+):
+    n_households, hhsize, n_activities = indiv_utils.shape
+    n_alts = n_activities**hhsize
+    n_combinations = combinations.shape[0]
+
+    utils = np.zeros((n_households, n_alts))
+    alt_activities = np.empty(hhsize, dtype=np.int64)
+    combination_coefs = np.empty((n_combinations, n_activities))
+    key_ptypes = np.empty(MAX_INTERACTION_CARDINALITY, dtype=np.int64)
+
+    for h in range(n_households):
+        # coefficient for each activity shared by each combination of interacting persons
+        for c in range(n_combinations):
+            cardinality = 0
+            for k in range(MAX_INTERACTION_CARDINALITY):
+                if combinations[c, k] >= 0:
+                    key_ptypes[cardinality] = ptypes[h, combinations[c, k]]
+                    cardinality += 1
+            key_ptypes[:cardinality].sort()
+            key = 0
+            for k in range(cardinality):
+                key = key * 10 + key_ptypes[k]
+            for a in range(n_activities):
+                combination_coefs[c, a] = interaction_coefs[a, key]
+
+        for alt in range(n_alts):
+            # alternatives enumerate activities with the first person most significant
+            code = alt
+            for p in range(hhsize - 1, -1, -1):
+                alt_activities[p] = code % n_activities
+                code //= n_activities
+
+            u = 0.0
+            for p in range(hhsize):
+                u += indiv_utils[h, p, alt_activities[p]]
+
+            for c in range(n_combinations):
+                a = alt_activities[combinations[c, 0]]
+                shared = True
+                for k in range(1, MAX_INTERACTION_CARDINALITY):
+                    if (
+                        combinations[c, k] >= 0
+                        and alt_activities[combinations[c, k]] != a
+                    ):
+                        shared = False
+                if shared:
+                    u += combination_coefs[c, a]
+
+            a = alt_activities[0]
+            shared = True
+            for p in range(1, hhsize):
+                if alt_activities[p] != a:
+                    shared = False
+            if shared:
+                u += wildcard_coefs[a, hhsize]
+
+            utils[h, alt] = u
+
+    return utils
+
+
+def household_pattern_utilities(indiv_utils, interaction_coefficients, hhsize):
+    """
+    Calculate household utilities for each activity pattern alternative for households of
+    hhsize, directly from the individual utilities and the interaction coefficients.
+
+    This gives the same utilities as evaluating build_cdap_spec on hh_choosers, without
+    building either of them.
+
+    Parameters
+    ----------
+    indiv_utils : pandas.DataFrame
+        CDAP utilities for each individual, ignoring interactions, as returned by
+        individual_utilities
+    interaction_coefficients : pandas.DataFrame
+        as returned by preprocess_interaction_coefficients
+    hhsize : int
+        household size (2..MAX_HHSIZE) for which utilities should be calculated
+
+    Returns
+    -------
+    utils : pandas.DataFrame or None
+        utilities indexed by _hh_index_ with a column for each activity pattern,
+        or None if ptypes are not single digits (so interaction keys can't be formed)
+    """
+    if hhsize < MAX_HHSIZE:
+        include_households = indiv_utils[_hh_size_] == hhsize
+    else:
+        # we want to include larger households along with MAX_HHSIZE households
+        include_households = indiv_utils[_hh_size_] >= MAX_HHSIZE
+    members = indiv_utils[include_households & (indiv_utils["cdap_rank"] <= hhsize)]
+
+    ptype = members[_ptype_].to_numpy()
+    if len(ptype) and not ((ptype >= 1) & (ptype <= 9)).all():
+        return None
+
+    # households in the same order as in hh_choosers
+    household_ids = members.loc[members["cdap_rank"] == 1, _hh_id_].to_numpy()
+    rows = pd.Index(household_ids).get_indexer(members[_hh_id_])
+    cols = members["cdap_rank"].to_numpy() - 1
+
+    member_utils = np.zeros((len(household_ids), hhsize, len(PATTERN_ACTIVITIES)))
+    member_utils[rows, cols, :] = members[list(PATTERN_ACTIVITIES)].to_numpy(
+        dtype=np.float64
+    )
+    ptypes = np.zeros((len(household_ids), hhsize), dtype=np.int64)
+    ptypes[rows, cols] = ptype
+
+    # all combinations of 1 to MAX_INTERACTION_CARDINALITY persons, padded with -1
+    combinations = [
+        tup + (-1,) * (MAX_INTERACTION_CARDINALITY - len(tup))
+        for i in range(1, min(hhsize, MAX_INTERACTION_CARDINALITY) + 1)
+        for tup in itertools.combinations(range(hhsize), i)
+    ]
+
+    interaction_coefs, wildcard_coefs = compile_interaction_coefficients(
+        interaction_coefficients
+    )
+
+    utils = _household_pattern_utilities(
+        member_utils,
+        ptypes,
+        interaction_coefs,
+        wildcard_coefs,
+        np.array(combinations, dtype=np.int64),
+    )
+
+    alternatives = [
+        "".join(tup) for tup in itertools.product(PATTERN_ACTIVITIES, repeat=hhsize)
+    ]
+    return pd.DataFrame(
+        utils, index=pd.Index(household_ids, name=_hh_index_), columns=alternatives
+    )
+
+
 def household_activity_choices(
     state: workflow.State,
     indiv_utils,
@@ -915,6 +1105,7 @@ def household_activity_choices(
     *,
     chunk_sizer,
     compute_settings: ComputeSettings | None = None,
+    compiled_interaction_utilities=False,
 ):
     """
     Calculate household utilities for each activity pattern alternative for households of hhsize
@@ -933,6 +1124,10 @@ def household_activity_choices(
 
     hhsize : int
         the size of household for which activity perttern should be calculated (1..MAX_HHSIZE)
+    compiled_interaction_utilities : bool
+        compute household utilities with household_pattern_utilities rather than by
+        evaluating the spec from build_cdap_spec (not used with joint tour utility or
+        when tracing)
 
     Returns
     -------
@@ -951,6 +1146,17 @@ def household_activity_choices(
         # index on household_id, not person_id
         set_hh_index(utils)
     else:
+        choosers = utils = None
+        if (
+            compiled_interaction_utilities
+            and not add_joint_tour_utility
+            and not trace_hh_id
+        ):
+            utils = household_pattern_utilities(
+                indiv_utils, interaction_coefficients, hhsize
+            )
+
+    if hhsize > 1 and utils is None:
         choosers = hh_choosers(state, indiv_utils, hhsize=hhsize)
 
         spec = build_cdap_spec(
@@ -1210,6 +1416,7 @@ def _run_cdap(
     *,
     chunk_sizer,
     compute_settings: ComputeSettings | None = None,
+    compiled_interaction_utilities=False,
 ) -> pd.DataFrame | tuple:
     """
     Implements core run_cdap functionality on persons df (or chunked subset thereof)
@@ -1258,6 +1465,7 @@ def _run_cdap(
             add_joint_tour_utility=add_joint_tour_utility,
             chunk_sizer=chunk_sizer,
             compute_settings=compute_settings,
+            compiled_interaction_utilities=compiled_interaction_utilities,
         )
 
         hh_choices_list.append(choices)
@@ -1331,6 +1539,7 @@ def run_cdap(
     trace_label=None,
     add_joint_tour_utility=False,
     compute_settings: ComputeSettings | None = None,
+    compiled_interaction_utilities=False,
 ):
     """
     Choose individual activity patterns for persons.
@@ -1359,6 +1568,9 @@ def run_cdap(
         label for tracing or None if no tracing
     add_joint_tour_utility : Bool
         cdap model include joint tour utility or not
+    compiled_interaction_utilities : Bool
+        compute household pattern utilities directly from the individual utilities
+        and interaction coefficients, rather than by building and evaluating specs
 
     Returns
     -------
@@ -1395,6 +1607,7 @@ def run_cdap(
                 add_joint_tour_utility,
                 chunk_sizer=chunk_sizer,
                 compute_settings=compute_settings,
+                compiled_interaction_utilities=compiled_interaction_utilities,
             )
         else:
             cdap_results = _run_cdap(
@@ -1410,6 +1623,7 @@ def run_cdap(
                 add_joint_tour_utility,
                 chunk_sizer=chunk_sizer,
                 compute_settings=compute_settings,
+                compiled_interaction_utilities=compiled_interaction_utilities,
             )
 
         result_list.append(cdap_results)
@@ -2,8 +2,11 @@
 # See full license in LICENSE.txt.
 from __future__ import annotations
 
+import hashlib
 import logging
+import re
 
+import numpy as np
 import pandas as pd
 
 from activitysim.core import config, expressions, los, simulate, tracing, workflow
@@ -11,9 +14,313 @@ from activitysim.core.configuration.logit import (
     TourLocationComponentSettings,
     TourModeComponentSettings,
 )
+from activitysim.core.exceptions import ModelConfigurationError
 
 logger = logging.getLogger(__name__)
 
+# names in spec expressions, as in util.drop_unused_columns (this also picks up the
+# column names in string literals such as df['col'] or df.get('col'))
+SPEC_NAME_PATTERN = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+
+# uses of the chooser table as a whole, rather than of some of its columns
+WHOLE_TABLE_PATTERN = re.compile(
+    r"\bdf\s*\.\s*(index|iloc|loc|shape|columns|apply|iterrows|itertuples)\b"
+    r"|\blen\(\s*df\s*\)"
+)
+
+
+def logsum_key_columns(choosers, spec, locals_d, skim_key_columns):
+    """
+    Chooser columns that can affect the logsum of a row.
+
+    These are the columns named anywhere in the spec expressions, the columns named by
+    string values in locals_d (e.g. df[dest_col_name]) and the skim lookup columns.
+
+    Parameters
+    ----------
+    choosers : pandas.DataFrame
+    spec : pandas.DataFrame
+        logsum spec, with expressions as index
+    locals_d : dict
+    skim_key_columns : list of str
+
+    Returns
+    -------
+    list of str or None
+        key columns, in choosers column order, or None if the spec uses the chooser
+        table as a whole (e.g. its index or length), so rows cannot be deduplicated
+    """
+    expressions_text = "\n".join(spec.reset_index()["Expression"].astype(str))
+
+    if WHOLE_TABLE_PATTERN.search(expressions_text):
+        return None
+
+    names = set(SPEC_NAME_PATTERN.findall(expressions_text))
+
+    if choosers.index.name in names and choosers.index.name not in choosers.columns:
+        # non-@ expressions can read the index by name
+        return None
+
+    names.update(v for v in (locals_d or {}).values() if isinstance(v, str))
+    names.update(skim_key_columns)
+    # sharrow flows read this to select the spec segment
+    names.add("purpose_index_num")
+
+    return [c for c in choosers.columns if c in names]
+
+
+def deduplicated_logsums(choosers, key_columns, compute_logsums, trace_label):
+    """
+    Compute logsums once per distinct combination of key column values.
+
+    Parameters
+    ----------
+    choosers : pandas.DataFrame
+    key_columns : list of str
+        chooser columns that fully determine the logsum of a row
+    compute_logsums : callable
+        computes the logsums Series of a choosers DataFrame
+    trace_label : str
+
+    Returns
+    -------
+    logsums : pandas.Series
+        logsums with same index as choosers
+    """
+    if key_columns:
+        row_codes = (
+            choosers.groupby(key_columns, sort=False, dropna=False, observed=True)
+            .ngroup()
+            .to_numpy()
+        )
+    else:
+        row_codes = np.zeros(len(choosers), dtype=np.int64)
+
+    # with sort=False groups are numbered in order of first appearance
+    _, first_rows = np.unique(row_codes, return_index=True)
+
+    num_rows = len(choosers)
+    logger.info(
+        f"{trace_label} computing {len(first_rows)} distinct logsums for "
+        f"{num_rows} rows ({1 - len(first_rows) / max(num_rows, 1):.1%} duplicates)"
+    )
+
+    distinct_logsums = compute_logsums(choosers.iloc[first_rows])
+
+    return pd.Series(
+        distinct_logsums.to_numpy()[row_codes],
+        index=choosers.index,
+        name=distinct_logsums.name,
+    )
+
+
+def logsum_spec_fingerprint(spec, nest_spec, locals_d, key_columns):
+    """
+    Hash of everything besides the key column values that a logsum depends on.
+
+    Parameters
+    ----------
+    spec : pandas.DataFrame
+        logsum spec, with coefficients already evaluated
+    nest_spec : dict or LogitNestSpec or None
+    locals_d : dict
+        only the str, numeric and bool values (constants, coefficients and column
+        names) are included
+    key_columns : list of str
+
+    Returns
+    -------
+    str
+    """
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(spec.reset_index(), index=False).to_numpy())
+    h.update(repr(list(spec.columns)).encode())
+    h.update(repr(nest_spec).encode())
+    h.update(
+        repr(
+            sorted(
+                (k, v)
+                for k, v in (locals_d or {}).items()
+                if isinstance(v, (str, int, float, bool, np.number))
+            )
+        ).encode()
+    )
+    # sorted, since the same columns can come in a different order from other choosers
+    h.update(repr(sorted(key_columns)).encode())
+    return h.hexdigest()
+
+
+class LogsumCache:
+    """
+    Least recently used cache of logsums, kept across model steps.
+
+    Logsums are stored by fingerprint (see logsum_spec_fingerprint) and looked up by
+    a 64 bit hash of the key column values of a row. The key values themselves are
+    stored too, and a lookup only hits if they match, so hash collisions are treated
+    as misses. Logsums of every fingerprint are kept (e.g. for several tour purposes,
+    or for a spec that changed) until they are the least recently used when the
+    cache grows beyond max_bytes.
+    """
+
+    # bytes per cached logsum besides its key values: hash, logsum and last use
+    ENTRY_BYTES = 24
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        # fingerprint -> (hashes pandas.Index, key values DataFrame, logsums array,
+        # last_used array)
+        self.tables = {}
+        self.clock = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _table_entry_bytes(table):
+        """bytes per cached logsum of a table, including its key values"""
+        hashes, key_values, _, _ = table
+        key_bytes = key_values.memory_usage(index=False, deep=True).sum()
+        return LogsumCache.ENTRY_BYTES + key_bytes / max(len(hashes), 1)
+
+    @property
+    def nbytes(self):
+        return sum(
+            len(table[0]) * self._table_entry_bytes(table)
+            for table in self.tables.values()
+        )
+
+    def logsums(self, fingerprint, choosers, key_columns, compute_logsums, trace_label):
+        """
+        Logsums of choosers, computed only for key values that are not cached.
+
+        Parameters
+        ----------
+        fingerprint : str
+        choosers : pandas.DataFrame
+        key_columns : list of str
+            chooser columns that, with the fingerprint, fully determine the logsum of
+            a row
+        compute_logsums : callable
+            computes the logsums Series of a choosers DataFrame
+        trace_label : str
+
+        Returns
+        -------
+        logsums : pandas.Series
+            logsums with same index as choosers
+        """
+        key_columns = sorted(key_columns)
+
+        if key_columns:
+            row_hashes = pd.util.hash_pandas_object(
+                choosers[key_columns], index=False
+            ).to_numpy()
+        else:
+            row_hashes = np.zeros(len(choosers), dtype=np.uint64)
+        hashes, first_rows, row_codes = np.unique(
+            row_hashes, return_index=True, return_inverse=True
+        )
+        key_values = choosers[key_columns].iloc[first_rows].reset_index(drop=True)
+
+        self.clock += 1
+        distinct_logsums = np.empty(len(hashes), dtype=np.float64)
+
+        hit = np.zeros(len(hashes), dtype=bool)
+        table = self.tables.get(fingerprint)
+        if table is not None:
+            table_ixs = table[0].get_indexer(hashes)
+            found = np.flatnonzero(table_ixs >= 0)
+            # a matching hash is only a hit if the key values match too
+            found = found[
+                _same_key_values(
+                    table[1].iloc[table_ixs[found]], key_values.iloc[found]
+                )
+            ]
+            hit[found] = True
+            distinct_logsums[found] = table[2][table_ixs[found]]
+            table[3][table_ixs[found]] = self.clock
+
+        num_hits = hit.sum()
+        self.hits += num_hits
+        self.misses += len(hashes) - num_hits
+        logger.info(
+            f"{trace_label} found {num_hits} of {len(hashes)} distinct logsums "
+            f"for {len(choosers)} rows in logsum cache"
+        )
+
+        name = None
+        if num_hits < len(hashes):
+            computed = compute_logsums(choosers.iloc[first_rows[~hit]])
+            name = computed.name
+            distinct_logsums[~hit] = computed.to_numpy()
+            self._add(
+                fingerprint,
+                hashes[~hit],
+                key_values[~hit].reset_index(drop=True),
+                distinct_logsums[~hit],
+            )
+
+        return pd.Series(
+            distinct_logsums[row_codes.reshape(-1)],
+            index=choosers.index,
+            name=name or "logsums",
+        )
+
+    def _add(self, fingerprint, hashes, key_values, logsums):
+        last_used = np.full(len(hashes), self.clock, dtype=np.int64)
+        table = self.tables.get(fingerprint)
+        if table is not None:
+            # replace entries whose hash collided with one of the new keys
+            keep = ~table[0].isin(hashes)
+            hashes = np.concatenate([table[0].to_numpy()[keep], hashes])
+            key_values = pd.concat([table[1][keep], key_values], ignore_index=True)
+            logsums = np.concatenate([table[2][keep], logsums])
+            last_used = np.concatenate([table[3][keep], last_used])
+        self.tables[fingerprint] = (pd.Index(hashes), key_values, logsums, last_used)
+
+        num_bytes = self.nbytes
+        if num_bytes <= self.max_bytes:
+            return
+
+        # keep the most recently used logsums that fit in max_bytes
+        all_last_used = np.concatenate([t[3] for t in self.tables.values()])
+        entry_bytes = np.concatenate(
+            [
+                np.full(len(t[0]), self._table_entry_bytes(t))
+                for t in self.tables.values()
+            ]
+        )
+        order = np.argsort(-all_last_used, kind="stable")
+        num_kept = np.searchsorted(
+            np.cumsum(entry_bytes[order]), self.max_bytes, side="right"
+        )
+        # ties at the cutoff are evicted too
+        cutoff = all_last_used[order[num_kept]]
+        for fp, (hashes, key_values, logsums, last_used) in list(self.tables.items()):
+            keep = last_used > cutoff
+            if not keep.any():
+                del self.tables[fp]
+            elif not keep.all():
+                self.tables[fp] = (
+                    hashes[keep],
+                    key_values[keep].reset_index(drop=True),
+                    logsums[keep],
+                    last_used[keep],
+                )
+        logger.debug(
+            f"logsum cache evicted {num_bytes - self.nbytes:.0f} bytes "
+            f"of least recently used logsums"
+        )
+
+
+def _same_key_values(cached, current):
+    """rows of two key value DataFrames (same columns) that are equal, NaN matching NaN"""
+    same = np.ones(len(current), dtype=bool)
+    for c in current.columns:
+        x = np.asarray(cached[c])
+        y = np.asarray(current[c])
+        same &= (x == y) | (pd.isna(x) & pd.isna(y))
+    return same
+
 
 def compute_location_choice_logsums(
     state: workflow.State,
@@ -187,18 +494,49 @@ def compute_location_choice_logsums(
             trace_label=trace_label,
         )
 
-    logsums = simulate.simple_simulate_logsums(
-        state,
-        choosers,
-        logsum_spec,
-        nest_spec,
-        skims=skims,
-        locals_d=locals_dict,
-        chunk_size=chunk_size,
-        chunk_tag=chunk_tag,
-        trace_label=trace_label,
-        explicit_chunk_size=model_settings.explicit_chunk,
-        compute_settings=logsum_settings.compute_settings,
-    )
+    def compute_logsums(df):
+        return simulate.simple_simulate_logsums(
+            state,
+            df,
+            logsum_spec,
+            nest_spec,
+            skims=skims,
+            locals_d=locals_dict,
+            chunk_size=chunk_size,
+            chunk_tag=chunk_tag,
+            trace_label=trace_label,
+            explicit_chunk_size=model_settings.explicit_chunk,
+            compute_settings=logsum_settings.compute_settings,
+        )
+
+    key_columns = None
+    if model_settings.LOGSUM_DEDUPLICATE and not state.settings.trace_hh_id:
+        key_columns = logsum_key_columns(
+            choosers,
+            logsum_spec,
+            locals_dict,
+            [orig_col_name, dest_col_name, "in_period", "out_period"],
+        )
+        if key_columns is None:
+            logger.info(
+                f"{trace_label} not deduplicating logsums "
+                f"since the logsum spec uses the chooser table as a whole"
+            )
+
+    if key_columns is None:
+        return compute_logsums(choosers)
+
+    logsums = deduplicated_logsums(choosers, key_columns, compute_logsums, trace_label)
+
+    if model_settings.LOGSUM_DEDUPLICATE_CHECK:
+        all_logsums = compute_logsums(choosers)
+        if not np.array_equal(
+            all_logsums.to_numpy(), logsums.to_numpy(), equal_nan=True
+        ):
+            raise ModelConfigurationError(
+                f"{trace_label}: deduplicated logsums differ from logsums computed "
+                f"for every row; the logsum spec reads chooser data "
+                f"other than columns {key_columns}, set LOGSUM_DEDUPLICATE: False"
+            )
 
     return logsums
@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import logging
 
+import numba as nb
 import numpy as np
 import pandas as pd
 
 from activitysim.core import workflow
+from activitysim.core.timetable import I_MIDDLE
 
 logger = logging.getLogger(__name__)
 
+# p2p_type of a person pair, by the number of adults in the pair
+P2P_TYPES = ["cc", "ac", "aa"]
+
 
 def rle(a):
     """
@@ -92,6 +97,101 @@ def rle(a):
     return row_id, start_pos, run_length, run_val
 
 
+@nb.njit
+def _max_run(windows, row_ix1, row_ix2):
+    """
+    longest run of periods available in windows rows row_ix1 and (if row_ix2 >= 0)
+    row_ix2, ignoring the first and last (padding) periods
+    """
+    max_run = 0
+    run = 0
+    for c in range(1, windows.shape[1] - 1):
+        if windows[row_ix1, c] != I_MIDDLE and (
+            row_ix2 < 0 or windows[row_ix2, c] != I_MIDDLE
+        ):
+            run += 1
+            if run > max_run:
+                max_run = run
+        else:
+            run = 0
+    return max_run
+
+
+@nb.njit
+def _max_runs(windows, row_ixs1, row_ixs2):
+    max_runs = np.zeros(row_ixs1.size, dtype=np.int64)
+    for k in range(row_ixs1.size):
+        max_runs[k] = _max_run(windows, row_ixs1[k], row_ixs2[k])
+    return max_runs
+
+
+@nb.njit
+def _household_pairs(group_offsets):
+    """
+    positions (i, j), i < j, of every pair of persons in the same group, for persons
+    sorted by group with group g at positions group_offsets[g]:group_offsets[g + 1]
+    """
+    num_pairs = 0
+    for g in range(group_offsets.size - 1):
+        n = group_offsets[g + 1] - group_offsets[g]
+        num_pairs += n * (n - 1) // 2
+    pair_ixs1 = np.empty(num_pairs, dtype=np.int64)
+    pair_ixs2 = np.empty(num_pairs, dtype=np.int64)
+    k = 0
+    for g in range(group_offsets.size - 1):
+        for i in range(group_offsets[g], group_offsets[g + 1]):
+            for j in range(i + 1, group_offsets[g + 1]):
+                pair_ixs1[k] = i
+                pair_ixs2[k] = j
+                k += 1
+    return pair_ixs1, pair_ixs2
+
+
+@nb.njit
+def _household_max_overlaps(windows, row_ixs, group_offsets, adult):
+    """
+    max time window overlap of each p2p_type (P2P_TYPES order) over the pairs of
+    persons in each group, and over the pairs including each person, for persons
+    sorted by group
+    """
+    num_groups = group_offsets.size - 1
+    group_overlaps = np.zeros((num_groups, 3), dtype=np.int64)
+    person_overlaps = np.zeros((row_ixs.size, 3), dtype=np.int64)
+    for g in range(num_groups):
+        for i in range(group_offsets[g], group_offsets[g + 1]):
+            for j in range(i + 1, group_offsets[g + 1]):
+                p2p_type = adult[i] + adult[j]
+                overlap = _max_run(windows, row_ixs[i], row_ixs[j])
+                group_overlaps[g, p2p_type] = max(group_overlaps[g, p2p_type], overlap)
+                person_overlaps[i, p2p_type] = max(
+                    person_overlaps[i, p2p_type], overlap
+                )
+                person_overlaps[j, p2p_type] = max(
+                    person_overlaps[j, p2p_type], overlap
+                )
+    return group_overlaps, person_overlaps
+
+
+def _persons_by_household(persons, household_ids):
+    """
+    Sort persons by household (in household_ids order) and then person_id.
+
+    Returns
+    -------
+    order : numpy.ndarray of int
+        positions in persons, sorted, of persons in one of household_ids
+    group_offsets : numpy.ndarray of int
+        offsets in order of the persons of each household, and of the end
+    """
+    hh_codes = pd.Index(household_ids).get_indexer(persons["household_id"])
+    order = np.lexsort((persons.index.to_numpy(), hh_codes))
+    order = order[hh_codes[order] >= 0]
+    group_offsets = np.searchsorted(
+        hh_codes[order], np.arange(len(household_ids) + 1)
+    ).astype(np.int64)
+    return order, group_offsets
+
+
 def p2p_time_window_overlap(state: workflow.State, p1_ids, p2_ids):
     """
 
@@ -111,143 +211,92 @@ def p2p_time_window_overlap(state: workflow.State, p1_ids, p2_ids):
     # if series, ought to have same index
     assert (p1_ids.index == p2_ids.index).all()
 
-    # ndarray with one row per p2p and one column per time period
-    # array value of 1 where overlapping free periods and 0 elsewhere
-    available = timetable.pairwise_available(p1_ids, p2_ids)
-
-    row_ids, start_pos, run_length, run_val = rle(available)
-
-    # rle returns all runs, but we only care about runs of available (run_val == 1)
-    target_rows = np.where(run_val == 1)
-    row_ids = row_ids[target_rows]
-    run_length = run_length[target_rows]
-
-    df = pd.DataFrame({"row_ids": row_ids, "run_length": run_length})
-
-    # groupby index of row_ids match the numpy row indexes of timetable.pairwise_available ndarray
-    # but there may be missing values of any no-overlap persons pairs
-    max_overlap = df.groupby("row_ids").run_length.max()
-    # fill in any missing values to align with input arrays
-    input_row_ids = np.arange(len(p1_ids))
-    max_overlap = max_overlap.reindex(input_row_ids).fillna(0)
+    # longest run of periods where both persons are available, for each pair
+    max_overlap = _max_runs(
+        timetable.windows,
+        np.asarray(timetable.window_row_ix.apply_to(np.asarray(p1_ids))),
+        np.asarray(timetable.window_row_ix.apply_to(np.asarray(p2_ids))),
+    )
 
     # FIXME should we return series or ndarray?
-    max_overlap.index = p1_ids.index
-
-    return max_overlap
+    return pd.Series(max_overlap, index=p1_ids.index)
 
 
 def person_pairs(persons):
-    p = persons[["household_id", "adult"]].reset_index()
-    p2p = pd.merge(p, p, left_on="household_id", right_on="household_id", how="outer")
-
-    # we desire well known non-contingent column names
-    p2p.rename(
-        columns={
-            "%s_x" % persons.index.name: "person1",
-            "%s_y" % persons.index.name: "person2",
-        },
-        inplace=True,
+    order, group_offsets = _persons_by_household(
+        persons, persons["household_id"].unique()
     )
+    pair_ixs1, pair_ixs2 = _household_pairs(group_offsets)
+    pair_ixs1 = order[pair_ixs1]
+    pair_ixs2 = order[pair_ixs2]
 
-    p2p = p2p[p2p.person1 < p2p.person2]
+    adult = persons["adult"].to_numpy().astype(np.int64)
 
     # index is meaningless, but might as well be tidy
-    p2p.reset_index(drop=True, inplace=True)
-
-    p2p["p2p_type"] = (p2p.adult_x * 1 + p2p.adult_y * 1).map(
-        {0: "cc", 1: "ac", 2: "aa"}
+    p2p = pd.DataFrame(
+        {
+            "household_id": persons["household_id"].to_numpy()[pair_ixs1],
+            "person1": persons.index.to_numpy()[pair_ixs1],
+            "person2": persons.index.to_numpy()[pair_ixs2],
+            "p2p_type": np.array(P2P_TYPES, dtype=object)[
+                adult[pair_ixs1] + adult[pair_ixs2]
+            ],
+        }
     )
 
-    p2p = p2p[["household_id", "person1", "person2", "p2p_type"]]
-
     return p2p
 
 
-def hh_time_window_overlap(state: workflow.State, households, persons):
-    p2p = person_pairs(persons)
+def _max_overlaps_by_type(state: workflow.State, households_index, persons):
+    timetable = state.get_injectable("timetable")
 
-    p2p["max_overlap"] = p2p_time_window_overlap(state, p2p.person1, p2p.person2)
+    order, group_offsets = _persons_by_household(persons, households_index)
+    row_ixs = timetable.window_row_ix.apply_to(persons.index.to_numpy()[order])
 
-    hh_overlap = (
-        p2p.groupby(["household_id", "p2p_type"])
-        .max_overlap.max()
-        .unstack(level=-1, fill_value=0)
+    hh_overlaps, sorted_person_overlaps = _household_max_overlaps(
+        timetable.windows,
+        np.asarray(row_ixs),
+        group_offsets,
+        persons["adult"].to_numpy()[order].astype(np.int64),
     )
 
-    # fill in missing households (in case there were no overlaps)
-    hh_overlap = hh_overlap.reindex(households.index).fillna(0).astype(np.int8)
+    # persons not in any of the households have no overlaps
+    person_overlaps = np.zeros((len(persons), 3), dtype=np.int64)
+    person_overlaps[order] = sorted_person_overlaps
 
-    # make sure we have all p2p_types (if there were none to unstack, then column will be missing)
-    for c in ["aa", "cc", "ac"]:
-        if c not in hh_overlap.columns:
-            hh_overlap[c] = 0
+    return hh_overlaps, person_overlaps
 
-    return hh_overlap
 
-
-def person_time_window_overlap(state: workflow.State, persons):
-    p2p = person_pairs(persons)
-
-    p2p["max_overlap"] = p2p_time_window_overlap(state, p2p.person1, p2p.person2)
-
-    p_overlap = (
-        pd.concat(
-            [
-                p2p[["person1", "p2p_type", "max_overlap"]].rename(
-                    columns={"person1": "person_id"}
-                ),
-                p2p[["person2", "p2p_type", "max_overlap"]].rename(
-                    columns={"person2": "person_id"}
-                ),
-            ]
-        )
-        .groupby(["person_id", "p2p_type"])
-        .max_overlap.max()
+def _overlaps_df(overlaps, index):
+    # columns ordered aa, ac, cc
+    return pd.DataFrame(
+        overlaps[:, ::-1].astype(np.int8),
+        index=index,
+        columns=pd.Index(P2P_TYPES[::-1], name="p2p_type"),
     )
 
-    # unstack to create columns for each p2p_type (aa, cc, and ac)
-    p_overlap = p_overlap.unstack(level=-1, fill_value=0)
 
-    # make sure we have columns for all p2p_types (in case there were none of a p2ptype to unstack)
-    for c in ["aa", "cc", "ac"]:
-        if c not in p_overlap.columns:
-            p_overlap[c] = 0
+def hh_time_window_overlap(state: workflow.State, households, persons):
+    hh_overlaps, _ = _max_overlaps_by_type(state, households.index, persons)
+    return _overlaps_df(hh_overlaps, households.index)
 
-    # fill in missing households (in case there were persons with no overlaps)
-    p_overlap = p_overlap.reindex(persons.index).fillna(0).astype(np.int8)
 
-    return p_overlap
+def person_time_window_overlap(state: workflow.State, persons):
+    _, person_overlaps = _max_overlaps_by_type(
+        state, persons["household_id"].unique(), persons
+    )
+    return _overlaps_df(person_overlaps, persons.index)
 
 
 def person_max_window(state: workflow.State, persons):
     timetable = state.get_injectable("timetable")
 
-    # ndarray with one row per person and one column per time period
-    # array value of 1 where free periods and 0 elsewhere
-    s = pd.Series(persons.index.values, index=persons.index)
-    available = timetable.individually_available(s)
-
-    row_ids, start_pos, run_length, run_val = rle(available)
-
-    # rle returns all runs, but we only care about runs of available (run_val == 1)
-    target_rows = np.where(run_val == 1)
-    row_ids = row_ids[target_rows]
-    run_length = run_length[target_rows]
-
-    df = pd.DataFrame({"row_ids": row_ids, "run_length": run_length})
-
-    # groupby index of row_ids match the numpy row indexes of timetable.pairwise_available ndarray
-    # but there may be missing values of any no-overlap persons pairs
-    max_overlap = df.groupby("row_ids").run_length.max()
-    # fill in any missing values to align with input arrays
-    input_row_ids = np.arange(persons.shape[0])
-    max_window = max_overlap.reindex(input_row_ids).fillna(0)
+    # longest run of periods where each person is available
+    row_ixs = np.asarray(timetable.window_row_ix.apply_to(persons.index.to_numpy()))
+    max_window = _max_runs(timetable.windows, row_ixs, np.full_like(row_ixs, -1))
 
     # FIXME should we return series or ndarray?
-    max_window.index = persons.index
-
-    return max_window
+    return pd.Series(max_window, index=persons.index)
 
 
 def calculate_consecutive(array):
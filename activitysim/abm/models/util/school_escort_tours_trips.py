@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 
+import numba as nb
 import numpy as np
 import pandas as pd
 
@@ -13,12 +14,36 @@ from activitysim.core.util import reindex
 logger = logging.getLogger(__name__)
 
 
+def join_ids(ids):
+    """
+    Concatenate the ids in each row of a 2-D array into a single string.
+
+    e.g. the person_ids of the children in a bundle with -1 filled in for no child escorted.
+    Passing these into the function would return the person_ids concatenated with '_' and leading and trailing underscores removed.
+    So if the first child escorted has id 200 and the second child escorted has id 300, the output would be "200_300"
+
+    Parameters
+    ----------
+    ids : numpy.ndarray
+        2-D int64 array of ids, negative ids mark empty slots
+
+    Returns
+    -------
+    numpy.ndarray
+        object array of strings, one per row
+    """
+    tokens = np.where(ids < 0, "", ids.astype(str))
+    joined = tokens[:, 0]
+    for col in range(1, tokens.shape[1]):
+        joined = np.char.add(np.char.add(joined, "_"), tokens[:, col])
+    return np.char.strip(joined, "_").astype(object)
+
+
 def create_bundle_attributes(bundles):
     """
     Create attributes for school escorting bundles.
-    Majority of the code is to handle the different combinations of child order.
-    Structure is optimized for speed
-    (readability would be much better with pd.apply(), but this is too slow!)
+    The per child columns are gathered into 2-D arrays in the order the children
+    are dropped off / picked up and concatenated into strings.
 
     Parameters
     ----------
@@ -43,318 +68,278 @@ def create_bundle_attributes(bundles):
     if len(bundles) == 0:
         return bundles
 
-    bundles[["first_child", "second_child", "third_child"]] = pd.DataFrame(
-        bundles["child_order"].to_list(), index=bundles.index
-    ).astype(int)
-
-    # index needs to be unique for filtering below
-    original_idx = bundles.index
-    bundles = bundles.reset_index(drop=True)
-
-    def join_attributes(df, column_names):
-        """
-        Concatenate the values of the columns in column_names into a single string.
-
-        e.g. bundle_child[1,2,3] contains person_ids of children in the bundle with -1 filled in for no child escorted,
-        Passing these into the function would return a series with the person_ids concatenated with '_' and leading and trailing underscores removed.
-        So if the first child escorted has id 200 and the second child escorted has id 300, the output would be "200_300"
-
-        Parameters
-        ----------
-        df : pandas.DataFrame
-            DataFrame containing the columns to be concatenated
-        column_names : list
-            List of column names to be concatenated
-
-        Returns
-        -------
-        pandas.Series
-        """
-
-        # intialize series with empty strings
-        out_series = pd.Series("", index=df.index)
-        # loop through all columns and concatenate the values
-        for col in column_names:
-            series = (
-                df[col]
-                .fillna(-1)
-                .astype("int64")
-                .astype(str)
-                .replace("-1", "", regex=False)
-            )
-            out_series = out_series.str.cat(series, sep="_")
+    # zero based child number of the first, second, ... child escorted
+    child_order = np.array(bundles["child_order"].to_list(), dtype=np.int64) - 1
 
-        # return series with leading and trailing underscores removed
-        return out_series.str.replace(r"^_+", "", regex=True).str.replace(
-            r"_+$", "", regex=True
-        )
+    def ordered(prefix):
+        columns = [prefix + str(i + 1) for i in range(child_order.shape[1])]
+        values = bundles[columns].fillna(-1).to_numpy().astype(np.int64)
+        return np.take_along_axis(values, child_order, axis=1)
 
-    # Loop through all possible combinations of child order
-    # once the order is known, we can fill in the escorting information in the child order
-    for first_child in [1, 2, 3]:
-        for second_child in [1, 2, 3]:
-            for third_child in [1, 2, 3]:
-                if (
-                    (first_child == second_child)
-                    | (first_child == third_child)
-                    | (second_child == third_child)
-                ):
-                    # children order is not unique
-                    continue
-
-                filtered_bundles = bundles[
-                    (bundles.first_child == first_child)
-                    & (bundles.second_child == second_child)
-                    & (bundles.third_child == third_child)
-                ]
-
-                if len(filtered_bundles) == 0:
-                    # no bundles for this combination of child order
-                    continue
-
-                bundles.loc[filtered_bundles.index, "escortees"] = join_attributes(
-                    filtered_bundles,
-                    [
-                        f"bundle_child{first_child}",
-                        f"bundle_child{second_child}",
-                        f"bundle_child{third_child}",
-                    ],
-                )
+    escortees = ordered("bundle_child")
+    escorted = escortees > 0
 
-                # escortee_nums contain the child number of the escortees concatenated with '_'
-                escortee_num1 = pd.Series(
-                    np.where(
-                        filtered_bundles[f"bundle_child{first_child}"] > 0,
-                        str(first_child),
-                        "",
-                    ),
-                    index=filtered_bundles.index,
-                ).astype(str)
-                escortee_num2 = pd.Series(
-                    np.where(
-                        filtered_bundles[f"bundle_child{second_child}"] > 0,
-                        str(second_child),
-                        "",
-                    ),
-                    index=filtered_bundles.index,
-                ).astype(str)
-                escortee_num3 = pd.Series(
-                    np.where(
-                        filtered_bundles[f"bundle_child{third_child}"] > 0,
-                        str(third_child),
-                        "",
-                    ),
-                    index=filtered_bundles.index,
-                ).astype(str)
-                bundles.loc[filtered_bundles.index, "escortee_nums"] = (
-                    (escortee_num1 + "_" + escortee_num2 + "_" + escortee_num3)
-                    .str.replace(r"^_+", "", regex=True)
-                    .str.replace(r"_+$", "", regex=True)
-                )
+    bundles["escortees"] = join_ids(escortees)
+    # escortee_nums contain the child number of the escortees concatenated with '_'
+    bundles["escortee_nums"] = join_ids(np.where(escorted, child_order + 1, -1))
+    bundles["num_escortees"] = escorted.sum(axis=1)
 
-                # num_escortees contain the number of escortees
-                bundles.loc[filtered_bundles.index, "num_escortees"] = (
-                    filtered_bundles[
-                        [
-                            f"bundle_child{first_child}",
-                            f"bundle_child{second_child}",
-                            f"bundle_child{third_child}",
-                        ]
-                    ]
-                    > 0
-                ).sum(axis=1)
-
-                # school_destinations, school_starts, school_ends, and school_tour_ids are concatenated
-                bundles.loc[
-                    filtered_bundles.index, "school_destinations"
-                ] = join_attributes(
-                    filtered_bundles,
-                    [
-                        f"school_destination_child{first_child}",
-                        f"school_destination_child{second_child}",
-                        f"school_destination_child{third_child}",
-                    ],
-                )
+    # school_destinations, school_starts, school_ends, and school_tour_ids are concatenated
+    bundles["school_destinations"] = join_ids(ordered("school_destination_child"))
+    bundles["school_starts"] = join_ids(ordered("school_start_child"))
+    bundles["school_ends"] = join_ids(ordered("school_end_child"))
+    bundles["school_tour_ids"] = join_ids(ordered("school_tour_id_child"))
 
-                bundles.loc[filtered_bundles.index, "school_starts"] = join_attributes(
-                    filtered_bundles,
-                    [
-                        f"school_start_child{first_child}",
-                        f"school_start_child{second_child}",
-                        f"school_start_child{third_child}",
-                    ],
-                )
+    return bundles
 
-                bundles.loc[filtered_bundles.index, "school_ends"] = join_attributes(
-                    filtered_bundles,
-                    [
-                        f"school_end_child{first_child}",
-                        f"school_end_child{second_child}",
-                        f"school_end_child{third_child}",
-                    ],
-                )
 
-                bundles.loc[
-                    filtered_bundles.index, "school_tour_ids"
-                ] = join_attributes(
-                    filtered_bundles,
-                    [
-                        f"school_tour_id_child{first_child}",
-                        f"school_tour_id_child{second_child}",
-                        f"school_tour_id_child{third_child}",
-                    ],
-                )
+def ragged_ids(strings):
+    """
+    Parse strings of ids concatenated with '_' into a ragged array.
 
-    bundles.drop(columns=["first_child", "second_child", "third_child"], inplace=True)
+    Parameters
+    ----------
+    strings : pandas.Series
+        e.g. the escortees of each bundle
 
-    return bundles.set_index(original_idx)
+    Returns
+    -------
+    values : numpy.ndarray
+        int64 ids of all rows, one after the other
+    offsets : numpy.ndarray
+        the ids of row i are values[offsets[i]:offsets[i + 1]]
+    """
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    if len(strings) == 0:
+        return np.zeros(0, dtype=np.int64), offsets
+    np.cumsum(strings.str.count("_").to_numpy() + 1, out=offsets[1:])
+    values = np.array("_".join(strings).split("_")).astype(np.int64)
+    return values, offsets
 
 
-def create_column_as_concatenated_list(bundles, col_dict):
-    for col, data in col_dict.items():
-        df = pd.concat(
-            [df.dropna() for df in data], axis=1, ignore_index=False
-        ).reindex(bundles.index)
-        bundles[col] = [row.dropna().values.tolist() for _, row in df.iterrows()]
-    return bundles
+def escort_participants_table(escortees, offsets):
+    """
+    Every run of consecutive escortees of each bundle, as strings.
 
+    Column first * (width + 1) + last holds the escortees first..last - 1 of
+    each bundle concatenated with '_', and "" if first >= last.
+    """
+    width = int(np.diff(offsets).max(initial=0))
+    table = np.full((len(escortees), (width + 1) ** 2), "", dtype=object)
+    tokens = escortees.str.split("_", expand=True).reindex(columns=range(width))
+    for first in range(width):
+        participants = tokens[first]
+        for last in range(first + 1, width + 1):
+            if last > first + 1:
+                participants = participants.str.cat(tokens[last - 1], sep="_")
+            table[:, first * (width + 1) + last] = participants.to_numpy()
+    return table, width
+
+
+# escort stop types
+ESCORT_STOP = 0
+SCHOOL_STOP = 1
+HOME_STOP = 2
+MANDATORY_STOP = 3
+STOP_PURPOSES = np.array(["escort", "school", "home", None], dtype=object)
+
+
+@nb.njit
+def _chauf_trip_stops(offsets, dropoff, ride_share, pure_escort):
+    """
+    (bundle, escortee stop, first and last participant, trip number, outbound,
+    stop type) of each chauffeur trip, bundle by bundle.
 
-def create_chauf_trip_table(bundles):
-    bundles["dropoff"] = bundles["school_escort_direction"] == "outbound"
-    bundles["person_id"] = bundles["chauf_id"]
+    Escortee stop is the position of the escortee dropped off or picked up
+    in the bundle, and -1 for the trip to the mandatory tour or back home.
+    """
+    num_bundles = offsets.size - 1
+    num_trips = 0
+    for b in range(num_bundles):
+        num_trips += offsets[b + 1] - offsets[b]
+        if not dropoff[b] or ride_share[b]:
+            num_trips += 1
+
+    bundle = np.empty(num_trips, dtype=np.int64)
+    stop = np.empty(num_trips, dtype=np.int64)
+    first = np.empty(num_trips, dtype=np.int64)
+    last = np.empty(num_trips, dtype=np.int64)
+    trip_num = np.empty(num_trips, dtype=np.int64)
+    outbound = np.empty(num_trips, dtype=np.bool_)
+    stop_type = np.empty(num_trips, dtype=np.int64)
+
+    row = 0
+    for b in range(num_bundles):
+        n = offsets[b + 1] - offsets[b]
+        for i in range(n):
+            bundle[row] = b
+            stop[row] = i
+            trip_num[row] = i + 1
+            stop_type[row] = ESCORT_STOP
+            if dropoff[b]:
+                # escortees i.. are in the car until they are dropped off
+                first[row] = i
+                last[row] = n
+                outbound[row] = True
+            else:
+                # kids aren't in the car until after they are picked up
+                first[row] = 0
+                last[row] = i
+                # pure escort chauffeur is going out to pick up the first child
+                outbound[row] = i == 0 and pure_escort[b]
+            row += 1
+
+        if dropoff[b] and ride_share[b]:
+            # adding trip to work, kids have already been dropped off
+            first[row] = 0
+            last[row] = 0
+            outbound[row] = True
+            stop_type[row] = MANDATORY_STOP
+        elif not dropoff[b]:
+            # adding trip home for inbound
+            first[row] = 0
+            last[row] = n
+            outbound[row] = False
+            stop_type[row] = HOME_STOP
+        else:
+            continue
+        bundle[row] = b
+        stop[row] = -1
+        trip_num[row] = n + 1
+        row += 1
+
+    return bundle, stop, first, last, trip_num, outbound, stop_type
+
+
+@nb.njit
+def _escortee_trip_stops(offsets, dropoff, escortee_num):
+    """
+    (bundle, escortee stop, first and last participant, trip number, stop type)
+    of each trip of the escortee_num'th escortee of the bundles, bundle by bundle.
+    """
+    num_bundles = offsets.size - 1
+    num_trips = 0
+    for b in range(num_bundles):
+        n = offsets[b + 1] - offsets[b]
+        if escortee_num < n:
+            num_trips += escortee_num + 1 if dropoff[b] else n - escortee_num
+
+    bundle = np.empty(num_trips, dtype=np.int64)
+    stop = np.empty(num_trips, dtype=np.int64)
+    first = np.empty(num_trips, dtype=np.int64)
+    last = np.empty(num_trips, dtype=np.int64)
+    trip_num = np.empty(num_trips, dtype=np.int64)
+    stop_type = np.empty(num_trips, dtype=np.int64)
+
+    row = 0
+    for b in range(num_bundles):
+        n = offsets[b + 1] - offsets[b]
+        if escortee_num >= n:
+            continue
+        if dropoff[b]:
+            # dropping off children up through the escortee
+            for i in range(escortee_num + 1):
+                bundle[row] = b
+                stop[row] = i
+                first[row] = i
+                last[row] = n
+                trip_num[row] = i + 1
+                stop_type[row] = SCHOOL_STOP if i == escortee_num else ESCORT_STOP
+                row += 1
+        else:
+            # picking up children after the escortee, then going home
+            num_pickups = n - escortee_num
+            for i in range(num_pickups):
+                bundle[row] = b
+                first[row] = 0
+                last[row] = escortee_num + i + 1
+                trip_num[row] = i + 1
+                if i == num_pickups - 1:
+                    stop[row] = -1
+                    stop_type[row] = HOME_STOP
+                else:
+                    stop[row] = escortee_num + i + 1
+                    stop_type[row] = ESCORT_STOP
+                row += 1
+
+    return bundle, stop, first, last, trip_num, stop_type
+
+
+def school_escort_trip_destinations(bundles, trip_bundle, stop, stop_type):
+    """
+    School destination of the escortee stop of each trip, the home zone for
+    trips home and the mandatory tour destination for trips to work.
+    """
+    school_destinations, offsets = ragged_ids(bundles["school_destinations"])
+    destination = school_destinations[offsets[trip_bundle] + np.maximum(stop, 0)]
+    home = stop_type == HOME_STOP
+    destination[home] = bundles["home_zone_id"].to_numpy()[trip_bundle[home]]
+    mandatory = stop_type == MANDATORY_STOP
+    destination[mandatory] = bundles["first_mand_tour_dest"].to_numpy()[
+        trip_bundle[mandatory]
+    ]
+    return destination
 
-    original_index = bundles.index
-    bundles.reset_index(drop=True, inplace=True)
 
-    participants = []
-    school_escort_trip_num = []
-    outbound = []
-    purposes = []
-    destinations = []
+def school_escort_departure_times(bundles):
+    """
+    Departure time of each bundle, the first school start in the outbound
+    direction and the last school end in the inbound direction.
+    """
+    starts, offsets = ragged_ids(bundles["school_starts"])
+    ends, _ = ragged_ids(bundles["school_ends"])
+    if len(bundles) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.where(
+        bundles["school_escort_direction"] == "outbound",
+        np.minimum.reduceat(starts, offsets[:-1]),
+        np.maximum.reduceat(ends, offsets[:-1]),
+    )
 
-    for i in range(bundles["num_escortees"].max()):
-        dropoff_mask = (bundles["dropoff"] == True) & (
-            bundles["num_escortees"] >= (i + 1)
-        )
-        pickup_mask = (bundles["dropoff"] == False) & (
-            bundles["num_escortees"] >= (i + 1)
-        )
-        participants.append(
-            bundles.loc[dropoff_mask, "escortees"].str.split("_").str[i:].str.join("_")
-        )
-        participants.append(
-            bundles.loc[pickup_mask, "escortees"]
-            .str.split("_")
-            .str[: i + 1]
-            .str.join("_")
-        )
-        school_escort_trip_num.append(
-            pd.Series(index=bundles.loc[dropoff_mask | pickup_mask].index, data=(i + 1))
-        )
 
-        outbound_flag = np.where(
-            # is outbound trip
-            (
-                bundles.loc[dropoff_mask | pickup_mask, "school_escort_direction"]
-                == "outbound"
-            )
-            # or chauf is going back to pick up the first child
-            | (
-                (i == 0)
-                & (
-                    bundles.loc[dropoff_mask | pickup_mask, "escort_type"]
-                    == "pure_escort"
-                )
-                & (
-                    bundles.loc[dropoff_mask | pickup_mask, "school_escort_direction"]
-                    == "inbound"
-                )
-            ),
-            True,
-            # chauf is inbound and has already picked up a child or taken their mandatory tour
-            False,
-        )
-        outbound.append(
-            pd.Series(
-                index=bundles.loc[dropoff_mask | pickup_mask].index, data=outbound_flag
-            )
-        )
+def create_chauf_trip_table(bundles):
+    """
+    Create a row for each chauffeur trip of the school escorting bundles.
 
-        purposes.append(
-            pd.Series(
-                index=bundles.loc[dropoff_mask | pickup_mask].index, data="escort"
-            )
-        )
-        destinations.append(
-            bundles.loc[dropoff_mask | pickup_mask, "school_destinations"]
-            .str.split("_")
-            .str[i]
-        )
+    The bundle columns are repeated on each of its trips, which are in the
+    order they are made.
+    """
+    escortees, offsets = ragged_ids(bundles["escortees"])
+    participants, width = escort_participants_table(bundles["escortees"], offsets)
 
-    # adding trip home for inbound
-    inbound_mask = bundles["dropoff"] == False
-    outbound.append(pd.Series(index=bundles.loc[inbound_mask].index, data=False))
-    school_escort_trip_num.append(bundles.loc[inbound_mask, "num_escortees"] + 1)
-    purposes.append(pd.Series(index=bundles.loc[inbound_mask].index, data="home"))
-    destinations.append(bundles.loc[inbound_mask, "home_zone_id"])
-    # kids aren't in the car until after they are picked up, inserting empty car for first trip
-    participants.insert(0, pd.Series(index=bundles.loc[inbound_mask].index, data=""))
-
-    # adding trip to work
-    to_work_mask = (bundles["dropoff"] == True) & (
-        bundles["escort_type"] == "ride_share"
-    )
-    outbound.append(pd.Series(index=bundles.loc[to_work_mask].index, data=True))
-    school_escort_trip_num.append(bundles.loc[to_work_mask, "num_escortees"] + 1)
-    purposes.append(bundles.loc[to_work_mask, "first_mand_tour_purpose"])
-    destinations.append(bundles.loc[to_work_mask, "first_mand_tour_dest"])
-    # kids have already been dropped off
-    participants.append(pd.Series(index=bundles.loc[to_work_mask].index, data=""))
-
-    bundles = create_column_as_concatenated_list(
-        bundles,
-        {
-            "destination": destinations,
-            "escort_participants": participants,
-            "school_escort_trip_num": school_escort_trip_num,
-            "outbound": outbound,
-            "purpose": purposes,
-        },
+    trip_bundle, stop, first, last, trip_num, outbound, stop_type = _chauf_trip_stops(
+        offsets,
+        (bundles["school_escort_direction"] == "outbound").to_numpy(),
+        (bundles["escort_type"] == "ride_share").to_numpy(),
+        (bundles["escort_type"] == "pure_escort").to_numpy(),
     )
 
-    bundles.drop(columns=["dropoff"], inplace=True)
-    bundles["person_id"] = bundles["person_id"].fillna(-1).astype("int64")
+    purpose = STOP_PURPOSES[stop_type]
+    mandatory = stop_type == MANDATORY_STOP
+    purpose[mandatory] = bundles["first_mand_tour_purpose"].to_numpy()[
+        trip_bundle[mandatory]
+    ]
 
-    bundles.index = original_index
-    return bundles
+    trips = bundles.take(trip_bundle)
+    trips["person_id"] = trips["chauf_id"].fillna(-1).astype("int64")
+    trips["destination"] = school_escort_trip_destinations(
+        bundles, trip_bundle, stop, stop_type
+    )
+    trips["escort_participants"] = participants[trip_bundle, first * (width + 1) + last]
+    trips["school_escort_trip_num"] = trip_num
+    trips["outbound"] = outbound
+    trips["purpose"] = purpose
 
+    return trips
 
-def create_chauf_escort_trips(bundles):
-    chauf_trip_bundles = create_chauf_trip_table(bundles.copy())
-    chauf_trip_bundles["tour_id"] = bundles["chauf_tour_id"].astype("int64")
 
-    # departure time is the first school start in the outbound school_escort_direction and the last school end in the inbound school_escort_direction
-    starts = (
-        chauf_trip_bundles["school_starts"].str.split("_", expand=True).astype(float)
-    )
-    ends = chauf_trip_bundles["school_ends"].str.split("_", expand=True).astype(float)
-    chauf_trip_bundles["depart"] = np.where(
-        chauf_trip_bundles["school_escort_direction"] == "outbound",
-        starts.min(axis=1),
-        ends.max(axis=1),
-    )
+def create_chauf_escort_trips(bundles):
+    bundles = bundles.copy()
+    bundles["tour_id"] = bundles["chauf_tour_id"].to_numpy().astype("int64")
+    bundles["depart"] = school_escort_departure_times(bundles).astype(float)
 
     # create a new trip for each escortee destination
-    chauf_trips = chauf_trip_bundles.explode(
-        [
-            "destination",
-            "escort_participants",
-            "school_escort_trip_num",
-            "outbound",
-            "purpose",
-        ]
-    ).reset_index(drop=True)
-
+    chauf_trips = create_chauf_trip_table(bundles).reset_index(drop=True)
     # numbering trips such that outbound escorting trips must come first and inbound trips must come last
     outbound_trip_num = -1 * (
         chauf_trips.groupby(["tour_id", "outbound"]).cumcount(ascending=False) + 1
@@ -412,133 +397,46 @@ def create_chauf_escort_trips(bundles):
 
 
 def create_child_escorting_stops(bundles, escortee_num):
-    bundles["num_escortees"] = bundles["escortees"].str.split("_").str.len()
-
-    # only want the escortee bundles where the escortee_num is less than the number of escortees
-    if (escortee_num > (bundles["num_escortees"] - 1)).all():
-        return bundles
-    bundles = bundles[escortee_num <= (bundles["num_escortees"] - 1)]
-    original_index = bundles.index
-    bundles.reset_index(drop=True, inplace=True)
-
-    # intializing variables
-    bundles["dropoff"] = bundles["school_escort_direction"] == "outbound"
-    bundles["person_id"] = bundles["escortees"].str.split("_").str[escortee_num]
-    bundles["tour_id"] = bundles["school_tour_ids"].str.split("_").str[escortee_num]
-    participants = []
-    purposes = []
-    destinations = []
-    school_escort_trip_num = []
-
-    # looping up through the current escorting destination
-    for i in range(escortee_num + 1):
-        # dropping off children
-        dropoff_mask = (bundles["dropoff"] == True) & (
-            bundles["num_escortees"] >= (i + 1)
-        )
-        participants.append(
-            bundles.loc[dropoff_mask, "escortees"].str.split("_").str[i:].str.join("_")
-        )
-        destinations.append(
-            bundles.loc[dropoff_mask, "school_destinations"].str.split("_").str[i]
-        )
-        purposes.append(
-            pd.Series(
-                index=bundles.loc[dropoff_mask].index,
-                data=np.where(
-                    bundles.loc[dropoff_mask, "person_id"]
-                    == bundles.loc[dropoff_mask, "escortees"].str.split("_").str[i],
-                    "school",
-                    "escort",
-                ),
-            )
-        )
-        school_escort_trip_num.append(
-            pd.Series(index=bundles.loc[dropoff_mask].index, data=(i + 1))
-        )
+    """
+    Create a row for each trip of the escortee_num'th escortee of the school
+    escorting bundles, for the bundles with more than escortee_num escortees.
+    """
+    escortees, offsets = ragged_ids(bundles["escortees"])
+    participants, width = escort_participants_table(bundles["escortees"], offsets)
+    school_tour_ids, _ = ragged_ids(bundles["school_tour_ids"])
+    bundles["num_escortees"] = np.diff(offsets)
 
-    # picking up children after the current child, i.e. escortees[escortee_num:]
-    bundles["pickup_count"] = np.where(
-        bundles["num_escortees"] >= escortee_num,
-        bundles["escortees"].str.split("_").str[escortee_num:],
-        0,
+    trip_bundle, stop, first, last, trip_num, stop_type = _escortee_trip_stops(
+        offsets,
+        (bundles["school_escort_direction"] == "outbound").to_numpy(),
+        escortee_num,
     )
-    for i in range(bundles["pickup_count"].str.len().max()):
-        pickup_mask = (bundles["dropoff"] == False) & (
-            bundles["pickup_count"].str[i].isna() == False
-        )
-        participants.append(
-            bundles.loc[pickup_mask, "escortees"]
-            .str.split("_")
-            .str[: escortee_num + i + 1]
-            .str.join("_")
-        )
-        is_last_stop = i == (bundles.loc[pickup_mask, "pickup_count"].str.len() - 1)
-        destinations.append(
-            pd.Series(
-                index=bundles.loc[pickup_mask].index,
-                data=np.where(
-                    is_last_stop,
-                    bundles.loc[pickup_mask, "home_zone_id"],
-                    bundles.loc[pickup_mask, "school_destinations"]
-                    .str.split("_")
-                    .str[escortee_num + i + 1],
-                ),
-            )
-        )
-        purposes.append(
-            pd.Series(
-                index=bundles.loc[pickup_mask].index,
-                data=np.where(is_last_stop, "home", "escort"),
-            )
-        )
-
-        school_escort_trip_num.append(
-            pd.Series(index=bundles.loc[pickup_mask].index, data=(i + 1))
-        )
 
-    bundles = create_column_as_concatenated_list(
-        bundles,
-        {
-            "escort_participants": participants,
-            "school_escort_trip_num": school_escort_trip_num,
-            "purpose": purposes,
-            "destination": destinations,
-        },
+    trips = bundles.take(trip_bundle)
+    trips["person_id"] = escortees[offsets[trip_bundle] + escortee_num]
+    trips["tour_id"] = school_tour_ids[offsets[trip_bundle] + escortee_num]
+    trips["escort_participants"] = participants[trip_bundle, first * (width + 1) + last]
+    trips["school_escort_trip_num"] = trip_num
+    trips["purpose"] = STOP_PURPOSES[stop_type]
+    trips["destination"] = school_escort_trip_destinations(
+        bundles, trip_bundle, stop, stop_type
     )
 
-    bundles.drop(columns=["dropoff", "pickup_count"], inplace=True)
-    bundles["person_id"] = bundles["person_id"].fillna(-1).astype("int64")
-
-    bundles.index = original_index
-    return bundles
+    return trips
 
 
 def create_escortee_trips(bundles):
-    escortee_trips = []
-    for escortee_num in range(0, int(bundles.num_escortees.max()) + 1):
-        escortee_bundles = create_child_escorting_stops(bundles.copy(), escortee_num)
-        escortee_trips.append(escortee_bundles)
-
-    escortee_trips = pd.concat(escortee_trips)
-    escortee_trips = escortee_trips[escortee_trips.person_id > 0]
-
-    # departure time is the first school start in the outbound direction and the last school end in the inbound direction
-    starts = escortee_trips["school_starts"].str.split("_", expand=True).astype(float)
-    ends = escortee_trips["school_ends"].str.split("_", expand=True).astype(float)
-    escortee_trips["outbound"] = np.where(
-        escortee_trips["school_escort_direction"] == "outbound", True, False
-    )
-    escortee_trips["depart"] = np.where(
-        escortee_trips["school_escort_direction"] == "outbound",
-        starts.min(axis=1),
-        ends.max(axis=1),
-    ).astype(int)
-    escortee_trips["primary_purpose"] = "school"
+    bundles = bundles.copy()
+    bundles["outbound"] = (bundles["school_escort_direction"] == "outbound").to_numpy()
+    bundles["depart"] = school_escort_departure_times(bundles).astype(int)
+    bundles["primary_purpose"] = "school"
 
     # create a new trip for each escortee destination
-    escortee_trips = escortee_trips.explode(
-        ["destination", "escort_participants", "school_escort_trip_num", "purpose"]
+    escortee_trips = pd.concat(
+        [
+            create_child_escorting_stops(bundles.copy(), escortee_num)
+            for escortee_num in range(int(bundles.num_escortees.max()))
+        ]
     ).reset_index(drop=True)
 
     # numbering trips such that outbound escorting trips must come first and inbound trips must come last
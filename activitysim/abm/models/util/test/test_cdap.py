@@ -258,3 +258,96 @@ def test_cdap_explicit_error_terms_parity(people, model_settings):
 
     # Check that they are reasonably close
     pdt.assert_series_equal(dist_no_eet, dist_eet, atol=0.05, check_names=False)
+
+
+def test_household_pattern_utilities():
+    state = workflow.State.make_default(__file__)
+    interaction_coefficients = pd.read_csv(
+        state.filesystem.get_config_file_path("cdap_interaction_coefficients.csv"),
+        comment="#",
+    )
+    interaction_coefficients = cdap.preprocess_interaction_coefficients(
+        interaction_coefficients
+    )
+
+    # random households of every size, with enough of them that most ptype
+    # combinations in the interaction coefficients turn up
+    rng = np.random.default_rng(0)
+    hh_sizes = np.repeat(np.arange(2, cdap.MAX_HHSIZE + 3), 200)
+    indiv_utils = pd.DataFrame(
+        {
+            "household_id": np.repeat(np.arange(len(hh_sizes)), hh_sizes),
+            "cdap_rank": np.concatenate([np.arange(1, n + 1) for n in hh_sizes]),
+            "ptype": rng.integers(1, 9, hh_sizes.sum()),
+            "M": rng.normal(size=hh_sizes.sum()),
+            "N": rng.normal(size=hh_sizes.sum()),
+            "H": rng.normal(size=hh_sizes.sum()),
+        },
+        index=pd.RangeIndex(hh_sizes.sum(), name="person_id"),
+    )
+    indiv_utils[cdap._hh_id_] = indiv_utils.household_id
+    indiv_utils[cdap._hh_size_] = np.repeat(hh_sizes, hh_sizes)
+    indiv_utils = indiv_utils.sample(frac=1, random_state=1)
+
+    for hhsize in range(2, cdap.MAX_HHSIZE + 1):
+        choosers = cdap.hh_choosers(state, indiv_utils, hhsize=hhsize)
+        spec = cdap.build_cdap_spec(
+            state, interaction_coefficients, hhsize=hhsize, cache=False
+        )
+        expected = simulate.eval_variables(state, spec.index, choosers).dot(spec)
+
+        utils = cdap.household_pattern_utilities(
+            indiv_utils, interaction_coefficients, hhsize
+        )
+
+        pdt.assert_frame_equal(utils, expected, check_names=False, rtol=1e-9)
+
+
+def test_cdap_compiled_interaction_utilities(people, model_settings):
+    person_type_map = model_settings.get("PERSON_TYPE_MAP", {})
+
+    large_people = pd.concat([people] * 50).reset_index(drop=True)
+    large_people.index.name = "person_id"
+    large_people["household_id"] = (
+        large_people.household_id.diff().fillna(0).ne(0).cumsum()
+    )
+
+    choices = []
+    for compiled in [False, True]:
+        state = workflow.State.make_default(__file__)
+        cdap_indiv_spec = state.filesystem.read_model_spec(
+            file_name="cdap_indiv_and_hhsize1.csv"
+        )
+        interaction_coefficients = cdap.preprocess_interaction_coefficients(
+            pd.read_csv(
+                state.filesystem.get_config_file_path(
+                    "cdap_interaction_coefficients.csv"
+                ),
+                comment="#",
+            )
+        )
+        cdap_fixed_relative_proportions = pd.DataFrame(
+            {"activity": ["M", "N", "H"], "coefficient": [0.33, 0.33, 0.34]}
+        )
+        state.rng().set_base_seed(42)
+        state.rng().begin_step("test_cdap_compiled_interaction_utilities")
+        state.rng().add_channel("person_id", large_people)
+        state.rng().add_channel(
+            "household_id",
+            large_people.drop_duplicates("household_id").set_index("household_id"),
+        )
+
+        choices.append(
+            cdap.run_cdap(
+                state,
+                large_people,
+                person_type_map,
+                cdap_indiv_spec,
+                interaction_coefficients,
+                cdap_fixed_relative_proportions,
+                locals_d=None,
+                compiled_interaction_utilities=compiled,
+            )
+        )
+
+    pdt.assert_series_equal(choices[0], choices[1])
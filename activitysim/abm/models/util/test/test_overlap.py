@@ -0,0 +1,108 @@
+# ActivitySim
+# See full license in LICENSE.txt.
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from activitysim.abm.models.util import overlap
+from activitysim.core import timetable as tt
+from activitysim.core import workflow
+
+
+def _max_run_lengths(available):
+    row_ids, _, run_length, run_val = overlap.rle(available)
+    max_runs = np.zeros(available.shape[0], dtype=np.int64)
+    np.maximum.at(max_runs, row_ids[run_val == 1], run_length[run_val == 1])
+    return max_runs
+
+
+def test_time_window_overlaps():
+    rng = np.random.default_rng(0)
+    state = workflow.State().default_settings()
+
+    num_periods = 19
+    start, end = np.triu_indices(num_periods)
+    tdd_alts = pd.DataFrame({"start": start + 5, "end": end + 5})
+    tdd_alts["duration"] = tdd_alts.end - tdd_alts.start
+
+    num_persons = 600
+    persons = pd.DataFrame(
+        {
+            "household_id": rng.integers(0, num_persons // 3, num_persons),
+            "adult": rng.random(num_persons) < 0.6,
+        },
+        index=pd.Index(rng.permutation(num_persons) + 10, name="person_id"),
+    )
+    households = pd.DataFrame(
+        index=pd.Index(np.arange(num_persons // 3 + 5), name="household_id")
+    )
+
+    timetable = tt.TimeTable(
+        tt.create_timetable_windows(persons, tdd_alts), tdd_alts
+    ).attach_state(state)
+    for _ in range(2):
+        person_ids = pd.Series(persons.index)
+        tdds = pd.Series(rng.integers(0, len(tdd_alts), num_persons))
+        available = timetable.tour_available(person_ids, tdds)
+        timetable.assign(person_ids[available], tdds[available])
+    state.add_injectable("timetable", timetable)
+
+    # pairs are every two persons of a household
+    p2p = overlap.person_pairs(persons)
+    hh_sizes = persons.household_id.value_counts()
+    assert len(p2p) == (hh_sizes * (hh_sizes - 1) // 2).sum()
+    assert (p2p.person1 < p2p.person2).all()
+    assert (
+        persons.household_id[p2p.person1].to_numpy() == p2p.household_id.to_numpy()
+    ).all()
+    assert (
+        persons.household_id[p2p.person2].to_numpy() == p2p.household_id.to_numpy()
+    ).all()
+
+    # max overlaps match the longest runs of pairwise availability
+    p2p["max_overlap"] = _max_run_lengths(
+        timetable.pairwise_available(p2p.person1, p2p.person2)
+    )
+    pdt.assert_series_equal(
+        overlap.p2p_time_window_overlap(state, p2p.person1, p2p.person2),
+        p2p.max_overlap,
+        check_names=False,
+    )
+
+    hh_overlap = overlap.hh_time_window_overlap(state, households, persons)
+    expected = (
+        p2p.groupby(["household_id", "p2p_type"])
+        .max_overlap.max()
+        .unstack(fill_value=0)
+        .reindex(index=households.index, columns=["aa", "ac", "cc"], fill_value=0)
+        .astype(np.int8)
+    )
+    pdt.assert_frame_equal(hh_overlap, expected)
+
+    p_overlap = overlap.person_time_window_overlap(state, persons)
+    expected = (
+        pd.concat(
+            [
+                p2p[[person, "p2p_type", "max_overlap"]].rename(
+                    columns={person: "person_id"}
+                )
+                for person in ["person1", "person2"]
+            ]
+        )
+        .groupby(["person_id", "p2p_type"])
+        .max_overlap.max()
+        .unstack(fill_value=0)
+        .reindex(index=persons.index, columns=["aa", "ac", "cc"], fill_value=0)
+        .astype(np.int8)
+    )
+    pdt.assert_frame_equal(p_overlap, expected)
+
+    pdt.assert_series_equal(
+        overlap.person_max_window(state, persons),
+        pd.Series(
+            _max_run_lengths(timetable.individually_available(persons.index)),
+            index=persons.index,
+        ),
+    )
@@ -50,18 +50,35 @@ def test_create_bundle_attributes():
     pdt.assert_frame_equal(outbound_result, outbound_expected, check_dtype=False)
 
 
+def _explode_trip_lists(bundles, columns):
+    """Expand the per bundle trip lists of the original implementation into trips."""
+    trips = bundles.explode(columns)
+    trips["destination"] = trips["destination"].astype(float).astype("int64")
+    trips["school_escort_trip_num"] = trips["school_escort_trip_num"].astype("int64")
+    trips["purpose"] = trips["purpose"].astype(object)
+    return trips
+
+
 def test_create_chauf_trip_table():
     data_dir = os.path.join(os.path.dirname(__file__), "data")
     bundles = pd.read_pickle(
         os.path.join(data_dir, "create_chauf_trip_table__input.pkl")
     )
-    chauf_trip_bundles = create_chauf_trip_table(bundles.copy())
-
-    chauf_trip_bundles_expected = pd.read_pickle(
-        os.path.join(data_dir, "create_chauf_trip_table__output.pkl")
+    chauf_trips = create_chauf_trip_table(bundles.copy())
+
+    chauf_trips_expected = _explode_trip_lists(
+        pd.read_pickle(os.path.join(data_dir, "create_chauf_trip_table__output.pkl")),
+        [
+            "destination",
+            "escort_participants",
+            "school_escort_trip_num",
+            "outbound",
+            "purpose",
+        ],
     )
+    chauf_trips_expected["outbound"] = chauf_trips_expected["outbound"].astype(bool)
 
-    pdt.assert_frame_equal(chauf_trip_bundles, chauf_trip_bundles_expected)
+    pdt.assert_frame_equal(chauf_trips, chauf_trips_expected)
 
 
 def test_create_child_escorting_stops():
@@ -80,6 +97,14 @@ def test_create_child_escorting_stops():
     escortee_trips_expected = pd.read_pickle(
         os.path.join(data_dir, "create_child_escorting_stops__output.pkl")
     )
+    # bundles without an escortee_num'th escortee have no trips
+    escortee_trips_expected = _explode_trip_lists(
+        escortee_trips_expected[escortee_trips_expected.person_id.notna()],
+        ["escort_participants", "school_escort_trip_num", "purpose", "destination"],
+    )
+    escortee_trips_expected[["person_id", "tour_id"]] = escortee_trips_expected[
+        ["person_id", "tour_id"]
+    ].astype("int64")
 
     pdt.assert_frame_equal(escortee_trips, escortee_trips_expected)
 
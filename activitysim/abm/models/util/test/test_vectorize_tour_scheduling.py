@@ -3,14 +3,17 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 import pandas.testing as pdt
 
 from activitysim.abm.models.util.vectorize_tour_scheduling import (
     TourSchedulingSettings,
     get_previous_tour_by_tourid,
+    tdd_interaction_dataset,
     vectorize_tour_scheduling,
 )
+from activitysim.core import timetable as tt
 from activitysim.core import workflow
 
 
@@ -78,3 +81,35 @@ def test_vts():
     # by the trip index.  shrug?
     expected = [2, 2, 2, 0, 0]
     assert (tdd_choices.values == expected).all()
+
+
+def test_tdd_interaction_dataset():
+    state = workflow.State.make_default(__file__)
+
+    alts = pd.DataFrame({"start": [1, 1, 2, 3], "end": [1, 4, 5, 6]}, dtype=np.int8)
+    alts["duration"] = alts.end - alts.start
+
+    persons = pd.DataFrame(index=pd.Index([1, 2, 3], name="person_id"))
+    timetable = tt.TimeTable(tt.create_timetable_windows(persons, alts), alts)
+    timetable.assign(pd.Series([1, 2]), pd.Series([1, 0]))
+
+    tours = pd.DataFrame(
+        {"person_id": [3, 1, 2]}, index=pd.Index([30, 10, 20], name="tour_id")
+    )
+
+    alt_tdd = tdd_interaction_dataset(
+        state, tours, alts, timetable, "tdd", "person_id", "test"
+    )
+
+    # every alt for every tour, in tour order, less those that collide
+    expected = alts.take(np.tile(alts.index, 3))
+    expected.index = pd.Index(np.repeat(tours.index, 4), name="tour_id")
+    expected["tdd"] = np.tile(alts.index, 3)
+    expected = expected[
+        timetable.tour_available(
+            np.repeat(tours.person_id.values, 4), expected["tdd"].values
+        )
+    ]
+    assert len(expected) < 12
+
+    pdt.assert_frame_equal(alt_tdd, expected)
@@ -23,6 +23,7 @@ from activitysim.core import (
 from activitysim.core.configuration.logit import TourLocationComponentSettings
 from activitysim.core.interaction_sample import (
     interaction_sample,
+    join_sample_choosers,
     resolve_sample_method,
 )
 from activitysim.core.interaction_sample_simulate import interaction_sample_simulate
@@ -89,6 +90,7 @@ def _destination_sample(
     zone_layer=None,
     stable_alt_positions=None,
     n_total_alts=None,
+    chooser_key=None,
 ):
     model_spec = simulate.spec_for_segment(
         state,
@@ -168,6 +170,7 @@ def _destination_sample(
         compute_settings=model_settings.compute_settings.subcomponent_settings(
             "sample"
         ),
+        chooser_key=chooser_key,
     )
 
     # if special person id is passed
@@ -648,6 +651,14 @@ def destination_presample(
     skim_dict = network_los.get_skim_dict("taz")
     skims = skim_dict.wrap(ORIG_TAZ, DEST_TAZ)
 
+    # choosers with the same origin TAZ and key attributes share sample probabilities
+    if model_settings.PRESAMPLE_CHOOSER_KEY is not None:
+        chooser_key = [ORIG_TAZ] + [
+            c for c in model_settings.PRESAMPLE_CHOOSER_KEY if c != ORIG_TAZ
+        ]
+    else:
+        chooser_key = None
+
     taz_sample = _destination_sample(
         state,
         spec_segment_name,
@@ -662,6 +673,7 @@ def destination_presample(
         zone_layer="taz",
         stable_alt_positions=stable_alt_positions,
         n_total_alts=len(full_taz_index) if full_taz_index is not None else None,
+        chooser_key=chooser_key,
     )
 
     # choose a MAZ for each DEST_TAZ choice, choice probability based on MAZ size_term fraction of TAZ total
@@ -794,12 +806,8 @@ def run_destination_logsums(
     chunk_tag = "tour_destination.logsums"
 
     # merge persons into tours
-    choosers = pd.merge(
-        destination_sample,
-        persons_merged,
-        left_on=chooser_id_column,
-        right_index=True,
-        how="left",
+    choosers = join_sample_choosers(
+        destination_sample, persons_merged, chooser_id_col=chooser_id_column
     )
 
     logger.debug("Running %s with %s rows", trace_label, len(choosers))
@@ -145,6 +145,7 @@ def _od_sample(
     chunk_size,
     chunk_tag,
     trace_label,
+    chooser_key=None,
 ):
     model_spec = simulate.spec_for_segment(
         state,
@@ -239,6 +240,7 @@ def _od_sample(
         compute_settings=model_settings.compute_settings.subcomponent_settings(
             "sample"
         ),
+        chooser_key=chooser_key,
     )
 
     return choices
@@ -681,6 +683,8 @@ def od_presample(
         chunk_size,
         chunk_tag,
         trace_label,
+        # origins are alternatives here, so the key is just the configured columns
+        chooser_key=model_settings.PRESAMPLE_CHOOSER_KEY,
     )
 
     orig_MAZ_dest_TAZ_sample[ORIG_MAZ] = (
@@ -13,6 +13,7 @@ import pandas as pd
 from pydantic import field_validator
 
 from activitysim.abm.models.tour_mode_choice import TourModeComponentSettings
+from activitysim.abm.models.util import logsums as logsum
 from activitysim.core import chunk, config, expressions, los, simulate
 from activitysim.core import timetable as tt
 from activitysim.core import tracing, workflow
@@ -210,21 +211,66 @@ def _compute_logsums(
             nest_spec, coefficients, trace_label
         )
 
-        logsums = simulate.simple_simulate_logsums(
-            state,
-            choosers,
-            logsum_spec,
-            nest_spec,
-            skims=skims,
-            locals_d=locals_dict,
-            chunk_size=0,
-            trace_label=trace_label,
-            compute_settings=model_settings.compute_settings,
-        )
+        def compute_logsums(df):
+            return simulate.simple_simulate_logsums(
+                state,
+                df,
+                logsum_spec,
+                nest_spec,
+                skims=skims,
+                locals_d=locals_dict,
+                chunk_size=0,
+                trace_label=trace_label,
+                compute_settings=model_settings.compute_settings,
+            )
+
+        logsum_cache = _logsum_cache(state)
+        key_columns = None
+        if logsum_cache is not None:
+            key_columns = logsum.logsum_key_columns(
+                choosers,
+                logsum_spec,
+                locals_dict,
+                [
+                    skims["orig_col_name"],
+                    skims["dest_col_name"],
+                    "out_period",
+                    "in_period",
+                ],
+            )
+
+        if key_columns is None:
+            logsums = compute_logsums(choosers)
+        else:
+            fingerprint = logsum.logsum_spec_fingerprint(
+                logsum_spec, nest_spec, locals_dict, key_columns
+            )
+            logsums = logsum_cache.logsums(
+                fingerprint,
+                choosers,
+                key_columns,
+                compute_logsums,
+                trace_label,
+            )
 
     return logsums
 
 
+def _logsum_cache(state: workflow.State):
+    """
+    The tour scheduling logsum cache of this run, or None if it is not used.
+    """
+    max_mb = state.settings.tour_scheduling_logsum_cache_mb
+    if not max_mb or state.settings.trace_hh_id:
+        return None
+
+    logsum_cache = state.get("tour_scheduling_logsum_cache", None)
+    if logsum_cache is None:
+        logsum_cache = logsum.LogsumCache(max_bytes=max_mb * 1_000_000)
+        state.set("tour_scheduling_logsum_cache", logsum_cache)
+    return logsum_cache
+
+
 def dedupe_alt_tdd(state: workflow.State, alt_tdd, tour_purpose, trace_label):
     tdd_segments = state.get_injectable("tdd_alt_segments", None)
     alt_tdd_periods = None
@@ -570,52 +616,38 @@ def tdd_interaction_dataset(
     trace_label = tracing.extend_trace_label(trace_label, "tdd_interaction_dataset")
 
     with chunk.chunk_log(state, trace_label) as chunk_sizer:
-        alts_ids = np.tile(alts.index, len(tours.index))
+        # the timetable keeps a bitmap of the tdd alts available to each window row, so
+        # we get the (tour, tdd) pairs of available alt_tdds directly, without building
+        # and testing the full cross product of tours and alts
+        positions, alts_ids = timetable.available_tdds(tours[window_id_col])
         chunk_sizer.log_df(trace_label, "alts_ids", alts_ids)
 
-        tour_ids = np.repeat(tours.index, len(alts.index))
-        window_row_ids = np.repeat(tours[window_id_col], len(alts.index))
-        chunk_sizer.log_df(trace_label, "window_row_ids", window_row_ids)
+        # alts may be a subset of the timetable tdd alts
+        alts_ixs = alts.index.get_indexer(alts_ids)
+        if (alts_ixs < 0).any():
+            in_alts = alts_ixs >= 0
+            positions = positions[in_alts]
+            alts_ids = alts_ids[in_alts]
+            alts_ixs = alts_ixs[in_alts]
 
-        alt_tdd = alts.take(alts_ids)
-
-        alt_tdd.index = tour_ids
-
-        import xarray as xr
-
-        alt_tdd_ = xr.Dataset.from_dataframe(alt_tdd)
-        dimname = alt_tdd.index.name or "index"
-        # alt_tdd_[window_id_col] = xr.DataArray(window_row_ids, dims=(dimname,))
-        alt_tdd_[choice_column] = xr.DataArray(
-            alts_ids, dims=(dimname,), coords=alt_tdd_.coords
+        logger.debug(
+            f"tdd_interaction_dataset keeping {len(alts_ids)} of "
+            f"({len(tours.index) * len(alts.index)}) available alt_tdds"
         )
+        assert len(alts_ids) > 0
 
-        # add tdd alternative id
-        # by convention, the choice column is the first column in the interaction dataset
-        # alt_tdd.insert(loc=0, column=choice_column, value=alts_ids)
-
-        # slice out all non-available tours
-        available = timetable.tour_available(window_row_ids, alts_ids)
+        alt_tdd = alts.take(alts_ixs)
 
-        del window_row_ids
-        chunk_sizer.log_df(trace_label, "window_row_ids", None)
-
-        logger.debug(
-            f"tdd_interaction_dataset keeping {available.sum()} of ({len(available)}) available alt_tdds"
+        alt_tdd.index = pd.Index(
+            tours.index.values[positions],
+            name=tours.index.name or "index",
         )
-        assert available.any()
 
-        chunk_sizer.log_df(
-            trace_label, "alt_tdd_", alt_tdd_
-        )  # catch this before we slice on available
-
-        alt_tdd = alt_tdd_.isel({dimname: available}).to_dataframe()
+        # add tdd alternative id
+        alt_tdd[choice_column] = alts_ids
 
         chunk_sizer.log_df(trace_label, "alt_tdd", alt_tdd)
 
-        # FIXME - don't need this any more after slicing
-        # del alt_tdd[window_id_col]
-
     return alt_tdd
 
 
@@ -754,6 +786,10 @@ def _schedule_tours(
     )
 
     # merge persons into tours
+    # later tour_num passes are much smaller than persons_merged, so only merge the persons
+    # with tours in this pass (taking them by position with the persons index engine)
+    person_ixs = persons_merged.index.get_indexer(tours.person_id.unique())
+    persons_merged = persons_merged.take(person_ixs[person_ixs >= 0])
     # avoid dual suffix for redundant columns names (e.g. household_id) that appear in both
     tours = pd.merge(
         tours,
@@ -5,12 +5,12 @@ from __future__ import annotations
 import ctypes
 import logging
 import multiprocessing
-import time
 from collections import OrderedDict
 from typing import Any, Literal
 
 import numpy as np
 import pandas as pd
+from pydantic import PositiveInt, field_validator
 
 from activitysim.abm.tables.size_terms import size_terms as get_size_terms
 from activitysim.abm.tables.size_terms import tour_destination_size_terms
@@ -49,18 +49,18 @@ size_table: pandas.DataFrame
 
 
 """
-Artisanal reverse semaphores to synchronize concurrent access to shared data buffer
+Per-process slots to synchronize concurrent access to shared data buffer
 
-we use the first two rows of the final column in numpy-wrapped shared data as 'reverse semaphores'
-(they synchronize concurrent access to shared data resource rather than throttling access)
+the shared modeled size buffer has one (num_zones, num_segments + 1) slot per sub-process, so each
+sub-process writes its local counts into its own slot without locking, and the global aggregate zone
+counts are a vectorized sum over the slots. Sub-processes wait for each other at a multiprocessing.Barrier
+(passed in data_buffers under SHADOW_PRICING_BARRIER) rather than polling tallies.
 
-ShadowPriceCalculator.synchronize_modeled_size coordinates access to the global aggregate zone counts
-(local_modeled_size summed across all sub-processes) using these two semaphores
-(which are really only tuples of indexes of locations in the shared data array.
+we use the first row of the final column of each slot to flag whether that sub-process still has
+pending (sampled) persons.
 """
-TALLY_CHECKIN = (0, -1)
-TALLY_CHECKOUT = (1, -1)
-TALLY_PENDING_PERSONS = (2, -1)
+SHADOW_PRICING_BARRIER = "shadow_pricing_barrier"
+PENDING_PERSONS = (0, -1)
 
 default_segment_to_name_dict = {
     # model_selector : persons_segment_name
@@ -121,6 +121,63 @@ class ShadowPriceSettings(PydanticReadable, extra="forbid"):
     DAMPING_FACTOR: float = 1
     """ctramp-style damping factor"""
 
+    SHADOW_PRICE_ACCELERATION: Literal["none", "momentum", "anderson"] = "none"
+    """Extrapolation applied on top of the ctramp or daysim shadow price update.
+
+    The ctramp or daysim update is treated as a fixed point map on the shadow price
+    vector (in log space for ctramp) and the history of previous iterations is used
+    to extrapolate toward its fixed point:
+
+    * ``none`` uses the plain update
+    * ``momentum`` adds ACCELERATION_MOMENTUM times the previous price step
+    * ``anderson`` uses Anderson mixing over the last ACCELERATION_HISTORY iterations
+
+    If the update residual grows from one iteration to the next, the history is
+    discarded and the plain update is used for that iteration. Acceleration is not
+    used by the ``simulation`` method.
+
+    .. versionadded:: 1.6
+    """
+
+    ACCELERATION_HISTORY: PositiveInt = 3
+    """Number of previous iterations used by ``anderson`` acceleration."""
+
+    ACCELERATION_MOMENTUM: float = 0.5
+    """Weight of the previous price step for ``momentum`` acceleration."""
+
+    ACCELERATION_DAMPING: float = 1
+    """Fraction of the update residual mixed in by ``anderson`` acceleration."""
+
+    @field_validator("ACCELERATION_DAMPING")
+    @classmethod
+    def _check_acceleration_damping(cls, value):
+        if not 0 < value <= 1:
+            raise ValueError(f"ACCELERATION_DAMPING must be in (0, 1], got {value}")
+        return value
+
+    RESIMULATE_CHANGED_ZONES_ONLY: bool = False
+    """Only re-simulate choosers affected by shadow price changes after the first iteration.
+
+    Used by the ctramp and daysim methods. Zones whose shadow price for a segment
+    changed by more than RESIMULATE_PRICE_TOLERANCE count as changed, and all other
+    choosers keep their choices from the previous iteration:
+
+    * if any zone of a segment became more attractive, any chooser in the segment
+      could now sample it, so the whole segment is re-simulated
+    * if zones of a segment only became less attractive, choosers who chose, or had
+      in their location sample, one of those zones are re-simulated. This only holds
+      with explicit error terms, where the other choosers' samples cannot change, so
+      without them the whole segment is re-simulated.
+
+    This is an approximation of a full re-simulation, as price changes within
+    RESIMULATE_PRICE_TOLERANCE are ignored.
+
+    .. versionadded:: 1.6
+    """
+
+    RESIMULATE_PRICE_TOLERANCE: float = 0.01
+    """Shadow price change (in log units for ctramp) above which a zone counts as changed."""
+
     SCALE_SIZE_TABLE: bool = False
 
     DAYSIM_ABSOLUTE_TOLERANCE: float = 50
@@ -152,12 +209,15 @@ class ShadowPriceCalculator:
         shared_data_choice=None,
         shared_data_choice_lock=None,
         shared_sp_choice_df=None,
+        shared_data_barrier=None,
+        process_num=0,
     ):
         """
         Presence of shared_data is used as a flag for multiprocessing
         If we are multiprocessing, shared_data should be a multiprocessing.RawArray buffer
-        to aggregate modeled_size across all sub-processes, and shared_data_lock should be
-        a multiprocessing.Lock object to coordinate access to that buffer.
+        with one slot per sub-process to aggregate modeled_size across all sub-processes,
+        and shared_data_barrier should be a multiprocessing.Barrier for all sub-processes
+        to coordinate access to that buffer.
 
         Optionally load saved shadow_prices from data_dir if config setting use_shadow_pricing
         and shadow_setting LOAD_SAVED_SHADOW_PRICES are both True
@@ -167,9 +227,13 @@ class ShadowPriceCalculator:
         model_settings : dict
         shared_data : multiprocessing.Array or None (if single process)
         shared_data_lock : numpy array wrapping multiprocessing.RawArray or None (if single process)
+        shared_data_barrier : multiprocessing.Barrier or None (if single process)
+        process_num : int
+            index of this sub-process's slot in shared_data
         """
 
         self.num_processes = num_processes
+        self.process_num = process_num
         self.use_shadow_pricing = bool(state.settings.use_shadow_pricing)
         self.saved_shadow_price_file_path = (
             None  # set by read_saved_shadow_prices if loaded
@@ -234,13 +298,16 @@ class ShadowPriceCalculator:
 
         # - shared_data
         if shared_data is not None:
-            assert shared_data.shape[0] == self.desired_size.shape[0]
+            assert shared_data.shape[0] >= self.num_processes  # one slot per process
+            assert 0 <= self.process_num < shared_data.shape[0]
+            assert shared_data.shape[1] == self.desired_size.shape[0]
             assert (
-                shared_data.shape[1] == self.desired_size.shape[1] + 1
-            )  # tally column
+                shared_data.shape[2] == self.desired_size.shape[1] + 1
+            )  # pending persons column
             assert shared_data_lock is not None
         self.shared_data = shared_data
         self.shared_data_lock = shared_data_lock
+        self.shared_data_barrier = shared_data_barrier
 
         self.shared_data_choice = shared_data_choice
         self.shared_data_choice_lock = shared_data_choice_lock
@@ -256,6 +323,13 @@ class ShadowPriceCalculator:
             self.shadow_prices = None
             self.shadow_price_method = self.shadow_settings.SHADOW_PRICE_METHOD
             assert self.shadow_price_method in ["daysim", "ctramp", "simulation"]
+            if (
+                self.shadow_price_method == "simulation"
+                and self.shadow_settings.SHADOW_PRICE_ACCELERATION != "none"
+            ):
+                logger.warning(
+                    "SHADOW_PRICE_ACCELERATION is ignored by the simulation shadow price method"
+                )
             # ignore convergence criteria for zones smaller than target_threshold
             self.target_threshold = self.shadow_settings.TARGET_THRESHOLD
 
@@ -290,6 +364,8 @@ class ShadowPriceCalculator:
         self.choices_by_iteration = pd.DataFrame()
         self.global_pending_persons = 1
         self.sampled_persons = pd.DataFrame()
+        # (prices, updated_prices, residual) of previous iterations for accelerated updates
+        self.acceleration_history = []
         # Under EET, simulation-method shadow pricing uses a dedicated RNG channel to be independent of the location
         # choice randoms. Registered lazily on first call to update_shadow_prices.
         self._sp_rng_channel_registered = False
@@ -371,22 +447,22 @@ class ShadowPriceCalculator:
     def synchronize_modeled_size(self, local_modeled_size):
         """
         We have to wait until all processes have computed choices and aggregated them by segment
-        and zone before we can compute global aggregate zone counts (by segment). Since the global
-        zone counts are in shared data, we have to coordinate access to the data structure across
-        sub-processes.
-        Note that all access to self.shared_data has to be protected by acquiring shared_data_lock
-        ShadowPriceCalculator.synchronize_modeled_size coordinates access to the global aggregate
-        zone counts (local_modeled_size summed across all sub-processes).
-        * All processes wait (in case we are iterating) until any stragglers from the previous
-          iteration have exited the building. (TALLY_CHECKOUT goes to zero)
-        * Processes then add their local counts into the shared_data and increment TALLY_CHECKIN
-        * All processes wait until everybody has checked in (TALLY_CHECKIN == num_processes)
-        * Processes make local copy of shared_data and check out (increment TALLY_CHECKOUT)
-        * first_in process waits until all processes have checked out, then zeros shared_data
-          and clears semaphores
+        and zone before we can compute global aggregate zone counts (by segment).
+
+        Each sub-process owns one slot (indexed by process_num) in the shared data buffer, so
+        writes need no locking. Coordination is done with a multiprocessing.Barrier shared by all
+        sub-processes of the step:
+
+        * Processes write their local counts (and pending persons flag) into their own slot
+        * All processes wait at the barrier until everybody has written their slot
+        * Processes sum the slots (vectorized reduction over the first axis)
+        * All processes wait at the barrier again until everybody has read the slots, so that
+          nobody overwrites its slot in the next iteration while others are still summing
+
         Parameters
         ----------
         local_modeled_size : pandas DataFrame
+
         Returns
         -------
         global_modeled_size_df : pandas DataFrame
@@ -396,48 +472,30 @@ class ShadowPriceCalculator:
 
         # shouldn't be called if we are not multiprocessing
         assert self.shared_data is not None
+        assert self.shared_data_barrier is not None
         assert self.num_processes > 1
 
-        def get_tally(t):
-            with self.shared_data_lock:
-                return self.shared_data[t]
-
-        def wait(tally, target):
-            while get_tally(tally) != target:
-                time.sleep(1)
-
-        # - nobody checks in until checkout clears
-        wait(TALLY_CHECKOUT, 0)
-
-        # - add local_modeled_size data, increment TALLY_CHECKIN
-        with self.shared_data_lock:
-            first_in = self.shared_data[TALLY_CHECKIN] == 0
-            # add local data from df to shared data buffer
-            # final column is used for tallys, hence the negative index
-            # Ellipsis expands : to fill available dims so [..., 0:-1] is the whole array except for the tallys
-            self.shared_data[..., 0:-1] += local_modeled_size.values
-            self.shared_data[TALLY_CHECKIN] += 1
-            if len(self.sampled_persons) > 0:
-                self.shared_data[TALLY_PENDING_PERSONS] += 1
-
-        # - wait until everybody else has checked in
-        wait(TALLY_CHECKIN, self.num_processes)
-
-        # - copy shared data, increment TALLY_CHECKOUT
-        with self.shared_data_lock:
-            logger.info("copy shared_data")
-            # numpy array with sum of local_modeled_size.values from all processes
-            global_modeled_size_array = self.shared_data[..., 0:-1].copy()
-            self.global_pending_persons = self.shared_data[TALLY_PENDING_PERSONS]
-            self.shared_data[TALLY_CHECKOUT] += 1
-
-        # - first in waits until all other processes have checked out, and cleans tub
-        if first_in:
-            wait(TALLY_CHECKOUT, self.num_processes)
-            with self.shared_data_lock:
-                # zero shared_data, clear TALLY_CHECKIN, and TALLY_CHECKOUT semaphores
-                self.shared_data[:] = 0
-            logger.info("first_in clearing shared_data")
+        slot = self.shared_data[self.process_num]
+
+        # - write local_modeled_size data into our own slot
+        # final column is used for the pending persons flag, hence the negative index
+        # Ellipsis expands : to fill available dims so [..., 0:-1] is the whole array except for the flags
+        slot[..., 0:-1] = local_modeled_size.values
+        slot[PENDING_PERSONS] = 1 if len(self.sampled_persons) > 0 else 0
+
+        # - wait until everybody else has written their slot
+        self.shared_data_barrier.wait()
+
+        # numpy array with sum of local_modeled_size.values from all processes
+        global_modeled_size_array = self.shared_data[
+            0 : self.num_processes, :, 0:-1
+        ].sum(axis=0)
+        self.global_pending_persons = self.shared_data[
+            (slice(0, self.num_processes),) + PENDING_PERSONS
+        ].sum()
+
+        # - wait until everybody else has summed before any slot can be rewritten
+        self.shared_data_barrier.wait()
 
         # convert summed numpy array data to conform to original dataframe
         global_modeled_size_df = pd.DataFrame(
@@ -448,76 +506,57 @@ class ShadowPriceCalculator:
 
         return global_modeled_size_df
 
-    def synchronize_choices(self, local_modeled_size):
+    def synchronize_choices(self, choices):
         """
         Same thing as the above synchronize_modeled_size method with the small
         difference of keeping track of the individual choices instead of the
         aggregate modeled choices between processes.
 
+        Each person is simulated by exactly one sub-process, so processes write the
+        choices of their own persons directly into their rows of the shared buffer
+        without locking, and clear them again once everybody has read the buffer.
+
         Parameters
         ----------
-        local_modeled_size : pandas DataFrame
-
+        choices : pandas.Series
+            zone id of location choice indexed by person_id
 
         Returns
         -------
-        global_modeled_size_df : pandas DataFrame
-            local copy of shared global_modeled_size data as dataframe
-            with same shape and columns as local_modeled_size
+        choices_synced : pandas DataFrame
+            local copy of shared choices for all persons as dataframe
+            with a single choice column indexed by person_id
         """
 
         # shouldn't be called if we are not multiprocessing
         assert self.shared_data_choice is not None
+        assert self.shared_data_barrier is not None
         assert self.num_processes > 1
 
-        def get_tally(t):
-            with self.shared_data_choice_lock:
-                return self.shared_data_choice[t]
-
-        def wait(tally, target):
-            while get_tally(tally) != target:
-                time.sleep(1)
-
-        # - nobody checks in until checkout clears
-        wait(TALLY_CHECKOUT, 0)
-
-        # - add local_modeled_size data, increment TALLY_CHECKIN
-        with self.shared_data_choice_lock:
-            first_in = self.shared_data_choice[TALLY_CHECKIN] == 0
-            # add local data from df to shared data buffer
-            # final column is used for tallys, hence the negative index
-            # Ellipsis expands : to fill available dims so [..., 0:-1] is the whole array except for the tallys
-            self.shared_data_choice[..., 0:-1] += local_modeled_size.values.astype(
-                np.int64
-            )
-            self.shared_data_choice[TALLY_CHECKIN] += 1
-
-        # - wait until everybody else has checked in
-        wait(TALLY_CHECKIN, self.num_processes)
-
-        # - copy shared data, increment TALLY_CHECKIN
-        with self.shared_data_choice_lock:
-            logger.info("copy shared_data")
-            # numpy array with sum of local_modeled_size.values from all processes
-            global_modeled_size_array = self.shared_data_choice[..., 0:-1].copy()
-            self.shared_data_choice[TALLY_CHECKOUT] += 1
-
-        # - first in waits until all other processes have checked out, and cleans tub
-        if first_in:
-            wait(TALLY_CHECKOUT, self.num_processes)
-            with self.shared_data_choice_lock:
-                # zero shared_data, clear TALLY_CHECKIN, and TALLY_CHECKOUT semaphores
-                self.shared_data_choice[:] = 0
-            logger.info("first_in clearing shared_data")
+        # rows of our persons in the shared choice buffer (persons not in the buffer are ignored)
+        rows = self.shared_sp_choice_df.index.get_indexer(choices.index)
+        local = rows >= 0
+        rows = rows[local]
 
-        # convert summed numpy array data to conform to original dataframe
-        global_modeled_size_df = pd.DataFrame(
-            data=global_modeled_size_array,
-            index=local_modeled_size.index,
-            columns=local_modeled_size.columns,
+        # - write our choices into their rows
+        self.shared_data_choice[rows, 0] = choices.values[local].astype(np.int64)
+
+        # - wait until everybody else has written their choices
+        self.shared_data_barrier.wait()
+
+        global_choice_array = self.shared_data_choice[:, 0:1].copy()
+
+        # - wait until everybody else has copied, then clear our rows for the next iteration
+        self.shared_data_barrier.wait()
+        self.shared_data_choice[rows, 0] = 0
+
+        choices_synced = pd.DataFrame(
+            data=global_choice_array,
+            index=self.shared_sp_choice_df.index,
+            columns=["choice"],
         )
 
-        return global_modeled_size_df
+        return choices_synced
 
     def set_choices(self, choices, segment_ids):
         """
@@ -552,22 +591,7 @@ class ShadowPriceCalculator:
             self.modeled_size = self.synchronize_modeled_size(modeled_size)
 
             # need to also store individual choices if simulation approach
-            choice_merged = pd.merge(
-                self.shared_sp_choice_df,
-                choices,
-                left_index=True,
-                right_index=True,
-                how="left",
-                suffixes=("_x", "_y"),
-            )
-
-            choice_merged["choice_y"] = choice_merged["choice_y"].fillna(0)
-            choice_merged["choice"] = (
-                choice_merged["choice_x"] + choice_merged["choice_y"]
-            )
-            choice_merged = choice_merged.drop(columns=["choice_x", "choice_y"])
-
-            self.choices_synced = self.synchronize_choices(choice_merged)
+            self.choices_synced = self.synchronize_choices(choices)
 
     def check_fit(self, state: workflow.State, iteration):
         """
@@ -801,7 +825,9 @@ class ShadowPriceCalculator:
             new_shadow_prices.where(
                 self.modeled_size > 0, self.shadow_prices, inplace=True
             )
-            self.shadow_prices = new_shadow_prices
+            self.shadow_prices = self.accelerate_shadow_prices(
+                new_shadow_prices, update_mask=self.modeled_size > 0
+            )
 
         elif shadow_price_method == "daysim":
             # - Daysim
@@ -825,31 +851,34 @@ class ShadowPriceCalculator:
             percent_tolerance = self.shadow_settings.DAYSIM_PERCENT_TOLERANCE / 100.0
             assert 0 <= percent_tolerance <= 1
 
+            # tolerance band around the desired size
+            upper_target = np.minimum(
+                self.desired_size * (1 + percent_tolerance),
+                self.desired_size + absolute_tolerance,
+            )
+            lower_target = np.maximum(
+                self.desired_size * (1 - percent_tolerance),
+                self.desired_size - absolute_tolerance,
+            )
             target = np.where(
                 self.modeled_size > self.desired_size,
-                np.minimum(
-                    self.modeled_size,
-                    np.minimum(
-                        self.desired_size * (1 + percent_tolerance),
-                        self.desired_size + absolute_tolerance,
-                    ),
-                ),
-                np.maximum(
-                    self.modeled_size,
-                    np.maximum(
-                        self.desired_size * (1 - percent_tolerance),
-                        self.desired_size - absolute_tolerance,
-                    ),
-                ),
+                np.minimum(self.modeled_size, upper_target),
+                np.maximum(self.modeled_size, lower_target),
             )
 
-            # adjustment = np.log(np.maximum(target, 0.01) / np.maximum(self.modeled_size, 0.01))
-            adjustment = np.log(
-                np.maximum(target, 0.01) / np.maximum(self.modeled_size, 1)
-            )
+            def adjustment_to(target):
+                # adjustment = np.log(np.maximum(target, 0.01) / np.maximum(self.modeled_size, 0.01))
+                return np.log(
+                    np.maximum(target, 0.01) / np.maximum(self.modeled_size, 1)
+                )
 
-            new_shadow_prices = self.shadow_prices + adjustment
-            self.shadow_prices = new_shadow_prices
+            new_shadow_prices = self.shadow_prices + adjustment_to(target)
+            # accelerated prices may not step past the tolerance band either
+            self.shadow_prices = self.accelerate_shadow_prices(
+                new_shadow_prices,
+                lower=self.shadow_prices + adjustment_to(lower_target),
+                upper=self.shadow_prices + adjustment_to(upper_target),
+            )
 
         elif shadow_price_method == "simulation":
             # - NewMethod
@@ -976,6 +1005,143 @@ class ShadowPriceCalculator:
                 % shadow_price_method
             )
 
+    def accelerate_shadow_prices(
+        self, new_shadow_prices, update_mask=None, lower=None, upper=None
+    ):
+        """
+        Extrapolate the ctramp or daysim shadow price update toward its fixed point
+
+        The plain update maps the current shadow prices x to new_shadow_prices g(x).
+        Depending on SHADOW_PRICE_ACCELERATION, the history of previous (x, g(x)) pairs
+        is used to take a bigger step than g(x). ctramp prices are multiplicative, so they
+        are extrapolated in log space (and zones whose prices are zero are left alone).
+
+        Parameters
+        ----------
+        new_shadow_prices : pandas.DataFrame
+            shadow prices from the plain update, same shape as self.shadow_prices
+        update_mask : pandas.DataFrame of bool, optional
+            prices the plain update leaves unchanged where False, and so does acceleration
+        lower, upper : pandas.DataFrame, optional
+            bounds the plain update keeps the prices within, accelerated prices are
+            clipped to them
+
+        Returns
+        -------
+        pandas.DataFrame
+            accelerated shadow prices
+        """
+
+        acceleration = self.shadow_settings.SHADOW_PRICE_ACCELERATION
+        if acceleration == "none":
+            return new_shadow_prices
+
+        multiplicative = self.shadow_settings.SHADOW_PRICE_METHOD == "ctramp"
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = self.shadow_prices.values.astype(np.float64).ravel()
+            g = new_shadow_prices.values.astype(np.float64).ravel()
+            if multiplicative:
+                x = np.log(x)
+                g = np.log(g)
+
+        # only accelerate prices that are finite before and after the plain update
+        valid = np.isfinite(x) & np.isfinite(g)
+        x = np.where(valid, x, 0.0)
+        g = np.where(valid, g, 0.0)
+        residual = g - x
+
+        history = self.acceleration_history
+        if history and np.linalg.norm(residual) > np.linalg.norm(history[-1][2]):
+            # safeguard: previous step made things worse, restart from the plain update
+            logger.info(
+                f"shadow_pricing {self.model_selector} {acceleration} acceleration "
+                f"restarted (residual grew)"
+            )
+            history.clear()
+
+        if not history:
+            accelerated = g
+        elif acceleration == "momentum":
+            momentum = self.shadow_settings.ACCELERATION_MOMENTUM
+            accelerated = g + momentum * (x - history[-1][0])
+        else:
+            # anderson mixing (type II) with damping
+            damping = self.shadow_settings.ACCELERATION_DAMPING
+            d_x = np.column_stack([x - h[0] for h in history])
+            d_r = np.column_stack([residual - h[2] for h in history])
+            gamma = np.linalg.lstsq(d_r, residual, rcond=None)[0]
+            accelerated = x + damping * residual - (d_x + damping * d_r) @ gamma
+
+        if not np.isfinite(accelerated).all():
+            accelerated = g
+
+        history.append((x, g, residual))
+        del history[: -self.shadow_settings.ACCELERATION_HISTORY]
+
+        logger.info(
+            f"shadow_pricing {self.model_selector} {acceleration} acceleration "
+            f"residual norm {np.linalg.norm(residual)} history {len(history)}"
+        )
+
+        accelerated = np.where(valid, accelerated, np.nan)
+        if multiplicative:
+            accelerated = np.exp(accelerated)
+        if lower is not None or upper is not None:
+            accelerated = np.clip(
+                accelerated,
+                None if lower is None else np.asarray(lower, dtype=np.float64).ravel(),
+                None if upper is None else np.asarray(upper, dtype=np.float64).ravel(),
+            )
+        if update_mask is not None:
+            accelerated = np.where(
+                np.asarray(update_mask).ravel(),
+                accelerated,
+                self.shadow_prices.values.astype(np.float64).ravel(),
+            )
+
+        accelerated_shadow_prices = pd.DataFrame(
+            data=accelerated.reshape(new_shadow_prices.shape),
+            index=new_shadow_prices.index,
+            columns=new_shadow_prices.columns,
+        )
+        accelerated_shadow_prices.where(
+            valid.reshape(new_shadow_prices.shape), new_shadow_prices, inplace=True
+        )
+
+        return accelerated_shadow_prices
+
+    def changed_zones(self, previous_shadow_prices):
+        """
+        Direction of the shadow price changes larger than RESIMULATE_PRICE_TOLERANCE
+
+        ctramp shadow prices are multiplicative, so their change is measured in log units,
+        which makes the tolerance comparable to the additive daysim shadow prices.
+        Higher prices make a zone more attractive for either method.
+
+        Parameters
+        ----------
+        previous_shadow_prices : pandas.DataFrame
+            shadow prices before the last call to update_shadow_prices
+
+        Returns
+        -------
+        pandas.DataFrame
+            same shape as shadow_prices (zones by segment), 1 where a zone became
+            more attractive, -1 where it became less attractive and 0 if unchanged
+        """
+
+        tolerance = self.shadow_settings.RESIMULATE_PRICE_TOLERANCE
+
+        if self.shadow_settings.SHADOW_PRICE_METHOD == "ctramp":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # prices moving to or from zero always count as changed
+                change = np.log(self.shadow_prices / previous_shadow_prices).fillna(0)
+        else:
+            change = self.shadow_prices - previous_shadow_prices
+
+        return np.sign(change).where(change.abs() > tolerance, 0).astype(int)
+
     def dest_size_terms(self, segment):
         assert segment in self.segment_ids
 
@@ -1067,12 +1233,13 @@ def block_name(model_selector):
     return model_selector
 
 
-def buffers_for_shadow_pricing(shadow_pricing_info):
+def buffers_for_shadow_pricing(shadow_pricing_info, num_processes=1):
     """
     Allocate shared_data buffers for multiprocess shadow pricing
 
     Allocates one buffer per model_selector.
-    Buffer datatype and shape specified by shadow_pricing_info
+    Buffer datatype and block shape specified by shadow_pricing_info,
+    with one block (slot) per sub-process
 
     buffers are multiprocessing.Array (RawArray protected by a multiprocessing.Lock wrapper)
     We don't actually use the wrapped version as it slows access down and doesn't provide
@@ -1083,6 +1250,8 @@ def buffers_for_shadow_pricing(shadow_pricing_info):
     Parameters
     ----------
     shadow_pricing_info : dict
+    num_processes : int
+        max number of sub-processes that will share the buffers
 
     Returns
     -------
@@ -1096,7 +1265,7 @@ def buffers_for_shadow_pricing(shadow_pricing_info):
     data_buffers = {}
     for block_key, block_shape in block_shapes.items():
         # buffer_size must be int, not np.int64
-        buffer_size = util.iprod(block_shape)
+        buffer_size = int(num_processes) * util.iprod(block_shape)
 
         csz = buffer_size * np.dtype(dtype).itemsize
         logger.info(
@@ -1188,14 +1357,13 @@ def shadow_price_data_from_buffers_choice(
     data_buffers : dict of {<model_selector> : <multiprocessing.Array>}
         multiprocessing.Array is simply a convenient way to bundle Array and Lock
         we extract the lock and wrap the RawArray in a numpy array for convenience in indexing
-        The shared data buffer has shape (<num_zones, <num_segments> + 1)
-        extra column is for reverse semaphores with TALLY_CHECKIN and TALLY_CHECKOUT
+        The shared data buffer has shape (<num_persons>, 1)
     shadow_pricing_info : dict
         dict of useful info
            dtype: sp_dtype,
            block_shapes : OrderedDict({<model_selector>: <shape tuple>})
-           dict mapping model_selector to block shape (including extra column for semaphores)
-           e.g. {'school': (num_zones, num_segments + 1)
+           dict mapping model_selector to block shape
+           e.g. {'school': (num_persons, 1)
     model_selector : str
         location type model_selector (e.g. school or workplace)
 
@@ -1238,13 +1406,13 @@ def shadow_price_data_from_buffers(data_buffers, shadow_pricing_info, model_sele
     data_buffers : dict of {<model_selector> : <multiprocessing.Array>}
         multiprocessing.Array is simply a convenient way to bundle Array and Lock
         we extract the lock and wrap the RawArray in a numpy array for convenience in indexing
-        The shared data buffer has shape (<num_zones, <num_segments> + 1)
-        extra column is for reverse semaphores with TALLY_CHECKIN and TALLY_CHECKOUT
+        The shared data buffer has shape (<num_slots>, <num_zones>, <num_segments> + 1)
+        with one slot per sub-process, extra column is for the PENDING_PERSONS flag
     shadow_pricing_info : dict
         dict of useful info
            dtype: sp_dtype,
            block_shapes : OrderedDict({<model_selector>: <shape tuple>})
-           dict mapping model_selector to block shape (including extra column for semaphores)
+           dict mapping model_selector to slot block shape (including extra column for flags)
            e.g. {'school': (num_zones, num_segments + 1)
     model_selector : str
         location type model_selector (e.g. school or workplace)
@@ -1271,7 +1439,8 @@ def shadow_price_data_from_buffers(data_buffers, shadow_pricing_info, model_sele
             "Block %s not in data_buffers" % block_name(model_selector)
         )
 
-    shape = block_shapes[model_selector]
+    # one block per sub-process slot
+    shape = (-1,) + tuple(block_shapes[model_selector])
     data = data_buffers[block_name(model_selector)]
 
     return np.frombuffer(data.get_obj(), dtype=dtype).reshape(shape), data.get_lock()
@@ -1327,6 +1496,8 @@ def load_shadow_price_calculator(
             shared_sp_choice_df = data_buffers["shadow_price_choice_df"]
         else:
             shared_sp_choice_df = None
+        barrier = data_buffers.get(SHADOW_PRICING_BARRIER, None)
+        process_num = state.get_injectable("process_num", 0)
 
     else:
         assert num_processes == 1
@@ -1335,6 +1506,8 @@ def load_shadow_price_calculator(
         data_choice = None
         lock_choice = None
         shared_sp_choice_df = None
+        barrier = None
+        process_num = 0
 
     # - ShadowPriceCalculator
     spc = ShadowPriceCalculator(
@@ -1346,6 +1519,8 @@ def load_shadow_price_calculator(
         data_choice,
         lock_choice,
         shared_sp_choice_df,
+        barrier,
+        process_num,
     )
 
     return spc
@@ -1512,7 +1687,7 @@ def get_shadow_pricing_info(state):
     """
     return dict with info about dtype and shapes of desired and modeled size tables
 
-    block shape is (num_zones, num_segments + 1)
+    block shape is (num_zones, num_segments + 1) per sub-process slot
 
 
     Returns
@@ -1537,7 +1712,7 @@ def get_shadow_pricing_info(state):
         sp_rows = len(land_use)
         sp_cols = len(size_terms[size_terms.model_selector == model_selector])
 
-        # extra tally column for TALLY_CHECKIN and TALLY_CHECKOUT semaphores
+        # extra column for PENDING_PERSONS flag
         blocks[block_name(model_selector)] = (sp_rows, sp_cols + 1)
 
     sp_dtype = np.int64
@@ -1557,7 +1732,7 @@ def get_shadow_pricing_choice_info(state):
     """
     return dict with info about dtype and shapes of desired and modeled size tables
 
-    block shape is (num_zones, num_segments + 1)
+    block shape is (num_persons, 1)
 
 
     Returns
@@ -1581,8 +1756,7 @@ def get_shadow_pricing_choice_info(state):
         # each person will have a work or school location choice
         sp_rows = len(persons)
 
-        # extra tally column for TALLY_CHECKIN and TALLY_CHECKOUT semaphores
-        blocks[block_name(model_selector)] = (sp_rows, 2)
+        blocks[block_name(model_selector)] = (sp_rows, 1)
 
     sp_dtype = np.int64
     # sp_dtype = np.str
@@ -71,4 +71,6 @@ def timetable(
     state: workflow.State, person_windows: pd.DataFrame, tdd_alts: pd.DataFrame
 ) -> tt.TimeTable:
     logging.debug("@workflow.cached_object timetable")
+    if state.settings.packed_timetable_windows:
+        return tt.PackedTimeTable(person_windows, tdd_alts, "person_windows")
     return tt.TimeTable(person_windows, tdd_alts, "person_windows")
@@ -156,3 +156,93 @@ def test_jtp_explicit_error_terms_parity(candidates, model_spec):
     pdt.assert_series_equal(
         comp_parity_no_eet, comp_parity_eet, atol=0.1, check_names=False
     )
+
+
+def _exact_pattern_shares(probs, adult, mixed):
+    # enumerate all participation patterns and condition on tour satisfaction
+    import itertools
+
+    shares = {}
+    for pattern in itertools.product([False, True], repeat=len(probs)):
+        pattern = np.array(pattern)
+        participants = pattern.sum()
+        adults = (pattern & adult).sum()
+        if mixed:
+            satisfied = adults > 0 and participants > adults
+        else:
+            satisfied = participants > 1
+        if satisfied:
+            shares[tuple(pattern)] = np.prod(np.where(pattern, probs, 1 - probs))
+    total = sum(shares.values())
+    return {k: v / total for k, v in shares.items()}
+
+
+@pytest.mark.parametrize("mixed", [False, True])
+def test_sample_participation_matches_conditional_distribution(mixed):
+    probs = np.array([0.7, 0.2, 0.4, 0.05])
+    adult = np.array([True, False, True, False])
+    num_tours = 40000
+
+    offsets = np.arange(num_tours + 1) * len(probs)
+    rng = np.random.default_rng(0)
+    participate, feasible = joint_tour_participation._sample_participation(
+        offsets,
+        np.tile(probs, num_tours),
+        np.tile(adult, num_tours),
+        np.full(num_tours, mixed),
+        rng.random(num_tours * len(probs)),
+    )
+    assert feasible.all()
+
+    patterns = pd.Series(
+        [tuple(p) for p in participate.reshape(num_tours, len(probs))]
+    ).value_counts(normalize=True)
+    expected = pd.Series(_exact_pattern_shares(probs, adult, mixed))
+
+    # every drawn pattern satisfies the tour, with the conditional frequencies
+    assert set(patterns.index) <= set(expected.index)
+    pdt.assert_series_equal(
+        patterns.reindex(expected.index, fill_value=0),
+        expected,
+        atol=0.01,
+        check_names=False,
+    )
+
+
+def test_conditional_participants_chooser(candidates):
+    candidates = candidates.copy()
+    candidates["composition"] = candidates.composition.str.lower()
+    rng = np.random.default_rng(1)
+    p = rng.random(len(candidates))
+    probs = pd.DataFrame(
+        {"participate": p, "not_participate": 1 - p}, index=candidates.index
+    )
+    # a tour that can only be satisfied one way
+    only_tour = candidates.tour_id == candidates.tour_id.iloc[0]
+    probs.loc[only_tour, "participate"] = [1.0, 0.0, 0.0, 1.0]
+    probs.loc[only_tour, "not_participate"] = [0.0, 1.0, 1.0, 0.0]
+
+    state = add_canonical_dirs("configs_test_misc").default_settings()
+    state.rng().set_base_seed(42)
+    state.rng().begin_step("test_conditional")
+    state.rng().add_channel("participant_id", candidates)
+
+    choices, rands = joint_tour_participation.conditional_participants_chooser(
+        state, probs, candidates, 0, trace_label="test_conditional"
+    )
+
+    assert choices.index.equals(candidates.index)
+    assert rands.index.equals(candidates.index)
+    participate = choices == 0
+    assert joint_tour_participation.get_tour_satisfaction(candidates, participate).all()
+    assert participate[only_tour].tolist() == [True, False, False, True]
+
+    # tours that can't be satisfied are an error rather than an endless rechoose
+    probs.loc[only_tour, "participate"] = [1.0, 0.0, 0.0, 0.0]
+    probs.loc[only_tour, "not_participate"] = [0.0, 1.0, 1.0, 1.0]
+    state.rng().end_step("test_conditional")
+    state.rng().begin_step("test_conditional_2")
+    with pytest.raises(joint_tour_participation.InvalidTravelError):
+        joint_tour_participation.conditional_participants_chooser(
+            state, probs, candidates, 0, trace_label="test_conditional"
+        )
@@ -50,6 +50,7 @@ def test_location_presample_uses_taz_stable_mapping(monkeypatch):
         zone_layer=None,
         stable_alt_positions=None,
         n_total_alts=None,
+        chooser_key=None,
     ):
         captured["alt_dest_col_name"] = alt_dest_col_name
         captured["zone_layer"] = zone_layer
@@ -92,6 +93,7 @@ def test_location_presample_uses_taz_stable_mapping(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "zone_id",
         },
     )()
@@ -177,6 +179,7 @@ def test_location_presample_passes_full_taz_index_for_eet_poisson(monkeypatch):
         zone_layer=None,
         stable_alt_positions=None,
         n_total_alts=None,
+        chooser_key=None,
     ):
         captured["alt_dest_col_name"] = alt_dest_col_name
         captured["zone_layer"] = zone_layer
@@ -220,6 +223,7 @@ def test_location_presample_passes_full_taz_index_for_eet_poisson(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "zone_id",
         },
     )()
@@ -300,6 +304,7 @@ def test_location_sample_uses_maz_stable_mapping(monkeypatch):
         zone_layer=None,
         stable_alt_positions=None,
         n_total_alts=None,
+        chooser_key=None,
     ):
         captured["alt_dest_col_name"] = alt_dest_col_name
         captured["zone_layer"] = zone_layer
@@ -324,6 +329,7 @@ def test_location_sample_uses_maz_stable_mapping(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "zone_id",
         },
     )()
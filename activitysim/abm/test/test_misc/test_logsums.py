@@ -0,0 +1,181 @@
+# ActivitySim
+# See full license in LICENSE.txt.
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from activitysim.abm.models.util import logsums
+
+
+def _spec(*expressions):
+    return pd.DataFrame(
+        {"coefficient": np.ones(len(expressions))},
+        index=pd.Index(list(expressions), name="Expression"),
+    )
+
+
+def test_logsum_key_columns():
+    choosers = pd.DataFrame(
+        {
+            "income": [1, 2],
+            "age": [30, 40],
+            "num_escortees": [0, 1],
+            "home_zone_id": [1, 2],
+            "dest_zone_id": [3, 4],
+            "out_period": ["AM", "AM"],
+            "pick_count": [1, 2],
+            "prob": [0.5, 0.5],
+        },
+        index=pd.Index([10, 11], name="person_id"),
+    )
+    spec = _spec(
+        "income > 5",
+        "@df.get('num_escortees', 0)",
+        "@odt_skims['SOV_TIME'] * df[dest_col_name]",
+    )
+    locals_d = {"dest_col_name": "dest_zone_id", "c_ivt": -0.02}
+
+    assert logsums.logsum_key_columns(
+        choosers, spec, locals_d, ["home_zone_id", "dest_zone_id", "out_period"]
+    ) == ["income", "num_escortees", "home_zone_id", "dest_zone_id", "out_period"]
+
+    # the chooser table as a whole (or its index) can't be keyed on
+    for expression in ["@len(df) > 1", "@df.index.values % 2", "person_id > 10"]:
+        assert (
+            logsums.logsum_key_columns(
+                choosers, _spec("income", expression), locals_d, []
+            )
+            is None
+        )
+
+
+def test_deduplicated_logsums():
+    rng = np.random.default_rng(0)
+    num_rows = 200
+    choosers = pd.DataFrame(
+        {
+            "orig": rng.integers(0, 3, num_rows),
+            "dest": rng.integers(0, 4, num_rows),
+            "period": pd.Categorical(rng.choice(["AM", "PM"], num_rows)),
+            "income": rng.choice([np.nan, 1.0, 2.0], num_rows),
+            "rand": rng.random(num_rows),
+        },
+        index=pd.Index(np.repeat(np.arange(num_rows // 4), 4), name="person_id"),
+    )
+
+    def compute_logsums(df):
+        compute_logsums.rows.append(len(df))
+        return pd.Series(
+            np.log1p(df.orig * 10 + df.dest)
+            + (df.period == "AM")
+            + df.income.fillna(-1),
+            index=df.index,
+            name="logsums",
+        )
+
+    compute_logsums.rows = []
+    deduped = logsums.deduplicated_logsums(
+        choosers, ["orig", "dest", "period", "income"], compute_logsums, "test"
+    )
+    expected = compute_logsums(choosers)
+
+    pd.testing.assert_series_equal(deduped, expected)
+    assert compute_logsums.rows[0] <= 3 * 4 * 2 * 3
+
+    # no key columns means every row has the same logsum
+    compute_logsums.rows = []
+    same = logsums.deduplicated_logsums(
+        choosers, [], lambda df: compute_logsums(df) * 0, "test"
+    )
+    assert compute_logsums.rows == [1]
+    assert (same == 0).all() and same.index.equals(choosers.index)
+
+
+def test_logsum_cache():
+    rng = np.random.default_rng(0)
+
+    def make_choosers(num_rows):
+        return pd.DataFrame(
+            {
+                "orig": rng.integers(0, 3, num_rows),
+                "dest": rng.integers(0, 4, num_rows),
+                "out_period": pd.Categorical(rng.choice(["AM", "PM"], num_rows)),
+                "income": rng.choice([np.nan, 1.0, 2.0], num_rows),
+            },
+            index=pd.Index(np.arange(num_rows), name="tour_id"),
+        )
+
+    def compute_logsums(df):
+        compute_logsums.rows.append(len(df))
+        return pd.Series(
+            np.log1p(df.orig * 10 + df.dest)
+            + (df.out_period == "AM")
+            + df.income.fillna(-1),
+            index=df.index,
+            name="logsums",
+        )
+
+    key_columns = ["orig", "dest", "out_period", "income"]
+    cache = logsums.LogsumCache(max_bytes=1_000_000)
+
+    compute_logsums.rows = []
+    choosers = make_choosers(200)
+    cached = cache.logsums("a", choosers, key_columns, compute_logsums, "test")
+    pd.testing.assert_series_equal(cached, compute_logsums(choosers))
+    assert compute_logsums.rows[0] <= 3 * 4 * 2 * 3
+
+    # a later call only computes logsums for keys it has not seen, whatever the
+    # order of the key columns
+    compute_logsums.rows = []
+    choosers = choosers.sample(100, random_state=1)
+    cached = cache.logsums(
+        "a", choosers[key_columns[::-1]], key_columns[::-1], compute_logsums, "test"
+    )
+    assert compute_logsums.rows == []
+    pd.testing.assert_series_equal(cached, compute_logsums(choosers))
+    assert logsums.logsum_spec_fingerprint(
+        pd.DataFrame(), None, {}, key_columns
+    ) == logsums.logsum_spec_fingerprint(pd.DataFrame(), None, {}, key_columns[::-1])
+
+    # a new fingerprint keeps the logsums of the others
+    cache.logsums("b", choosers, key_columns, compute_logsums, "test")
+    assert list(cache.tables) == ["a", "b"]
+
+    # a hash match with different key values is a miss, and replaces the entry
+    hashes, key_values, cached_logsums, last_used = cache.tables["a"]
+    cache.tables["a"] = (
+        hashes,
+        key_values.assign(orig=key_values.orig + 10),
+        cached_logsums,
+        last_used,
+    )
+    compute_logsums.rows = []
+    cached = cache.logsums("a", choosers, key_columns, compute_logsums, "test")
+    pd.testing.assert_series_equal(cached, compute_logsums(choosers))
+    assert compute_logsums.rows[0] > 0
+    assert cache.tables["a"][0].is_unique
+
+    # the least recently used logsums are evicted
+    def origins(*orig):
+        return make_choosers(len(orig)).assign(
+            orig=orig, dest=0, out_period="AM", income=1.0
+        )
+
+    # int64 orig and dest key values take 16 bytes per logsum
+    od_columns = ["orig", "dest"]
+    small_cache = logsums.LogsumCache(
+        max_bytes=5 * (logsums.LogsumCache.ENTRY_BYTES + 16)
+    )
+    for orig in range(4):
+        small_cache.logsums("a", origins(orig), od_columns, compute_logsums, "t")
+    small_cache.logsums("a", origins(0), od_columns, compute_logsums, "t")
+    small_cache.logsums("a", origins(7, 8), od_columns, compute_logsums, "t")
+    assert small_cache.hits == 1
+    assert small_cache.nbytes <= small_cache.max_bytes
+
+    compute_logsums.rows = []
+    small_cache.logsums("a", origins(0, 8), od_columns, compute_logsums, "t")
+    assert compute_logsums.rows == []
+    small_cache.logsums("a", origins(1), od_columns, compute_logsums, "t")
+    assert compute_logsums.rows == [1]
@@ -664,3 +664,212 @@ def test_shadow_pricing_dedicated_rng_channel_eet_only(
 
     # Reset for hygiene (other tests in this module assume MC default)
     state.settings.use_explicit_error_terms = False
+
+
+def test_shadow_pricing_synchronize_slots(state, model_settings, network_los):
+    """
+    Sub-processes write their local counts into their own slot of the shared buffer
+    and every one of them sees the summed global counts once all have synchronized.
+    """
+    import copy
+    import threading
+
+    spc = shadow_pricing.load_shadow_price_calculator(state, model_settings)
+
+    num_processes = 2
+    desired_size = spc.desired_size
+    shared_data = np.zeros(
+        (num_processes, desired_size.shape[0], desired_size.shape[1] + 1),
+        dtype=np.int64,
+    )
+    person_ids = pd.Index([11, 12, 13, 14], name="person_id")
+    shared_data_choice = np.zeros((len(person_ids), 1), dtype=np.int64)
+    # timeout so a failure in one thread surfaces instead of deadlocking the other
+    barrier = threading.Barrier(num_processes, timeout=60)
+
+    local_sizes = []
+    local_choices = [
+        pd.Series([3, 5], index=person_ids[[0, 2]], name="choice"),
+        pd.Series([7, 9], index=person_ids[[1, 3]], name="choice"),
+    ]
+    sub_spcs = []
+    for i in range(num_processes):
+        sub_spc = copy.copy(spc)
+        sub_spc.num_processes = num_processes
+        sub_spc.process_num = i
+        sub_spc.shared_data = shared_data
+        sub_spc.shared_data_choice = shared_data_choice
+        sub_spc.shared_data_barrier = barrier
+        # each sub-process has its own index (pandas index engines are not thread-safe)
+        sub_spc.shared_sp_choice_df = pd.DataFrame(index=person_ids.copy(deep=True))
+        sub_spc.sampled_persons = pd.DataFrame(index=person_ids[: 2 - i])
+        local_sizes.append(
+            pd.DataFrame(
+                np.full(desired_size.shape, i + 1, dtype=np.int64),
+                index=desired_size.index,
+                columns=desired_size.columns,
+            )
+        )
+        sub_spcs.append(sub_spc)
+
+    results = {}
+    errors = []
+
+    def run(i):
+        try:
+            # two iterations to check slots can be safely reused
+            for _ in range(2):
+                modeled_size = sub_spcs[i].synchronize_modeled_size(local_sizes[i])
+                choices = sub_spcs[i].synchronize_choices(local_choices[i])
+            results[i] = (modeled_size, choices)
+        except Exception as e:
+            errors.append(e)
+            barrier.abort()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(num_processes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    for i in range(num_processes):
+        modeled_size, choices = results[i]
+        pd.testing.assert_frame_equal(modeled_size, local_sizes[0] + local_sizes[1])
+        assert sub_spcs[i].global_pending_persons == 2
+        assert choices["choice"].tolist() == [3, 7, 5, 9]
+
+    # choice rows are cleared once everybody has read them
+    assert not shared_data_choice.any()
+
+
+@pytest.mark.parametrize("acceleration", ["momentum", "anderson"])
+def test_shadow_pricing_acceleration(state, model_settings, network_los, acceleration):
+    """
+    Accelerated updates reach the fixed point of a slowly contracting
+    daysim-style update in fewer iterations than the plain update.
+    """
+    spc = shadow_pricing.load_shadow_price_calculator(state, model_settings)
+
+    index = pd.Index(range(4), name="zone_id")
+    columns = ["a", "b"]
+    fixed_point = np.array([0.5, -1.0, 2.0, 0.0, -0.5, 1.5, 0.25, -2.0])
+    contraction = np.diag([0.9, 0.8, 0.85, 0.7, 0.95, 0.75, 0.6, 0.9])
+
+    def plain_update(prices):
+        x = prices.values.ravel()
+        g = fixed_point + contraction @ (x - fixed_point)
+        return pd.DataFrame(g.reshape(4, 2), index=index, columns=columns)
+
+    def iterations_to_converge(method):
+        spc.shadow_settings = shadow_pricing.ShadowPriceSettings(
+            SHADOW_PRICE_METHOD="daysim",
+            SHADOW_PRICE_ACCELERATION=method,
+            ACCELERATION_MOMENTUM=0.3,
+        )
+        spc.acceleration_history = []
+        spc.shadow_prices = pd.DataFrame(0.0, index=index, columns=columns)
+        for iteration in range(1, 200):
+            spc.shadow_prices = spc.accelerate_shadow_prices(
+                plain_update(spc.shadow_prices)
+            )
+            if np.abs(spc.shadow_prices.values.ravel() - fixed_point).max() < 1e-3:
+                return iteration
+        return np.inf
+
+    assert iterations_to_converge(acceleration) < iterations_to_converge("none")
+
+
+def test_shadow_pricing_acceleration_safeguards(state, model_settings, network_los):
+    """
+    Accelerated prices respect the ctramp zero-size mask and the daysim
+    tolerance band, and damping is validated with the settings.
+    """
+    with pytest.raises(ValueError, match="ACCELERATION_DAMPING"):
+        shadow_pricing.ShadowPriceSettings(ACCELERATION_DAMPING=1.5)
+
+    spc = shadow_pricing.load_shadow_price_calculator(state, model_settings)
+    index = pd.Index(range(3), name="zone_id")
+    spc.desired_size = pd.DataFrame({"a": [100.0, 100.0, 100.0]}, index=index)
+
+    def run(method, modeled_sizes):
+        spc.shadow_settings = shadow_pricing.ShadowPriceSettings(
+            SHADOW_PRICE_METHOD=method,
+            SHADOW_PRICE_ACCELERATION="momentum",
+            ACCELERATION_MOMENTUM=0.9,
+        )
+        spc.acceleration_history = []
+        spc.shadow_prices = pd.DataFrame(
+            {"a": [1.0, 1.0, 1.0] if method == "ctramp" else [0.0, 0.0, 0.0]},
+            index=index,
+        )
+        prices = []
+        for modeled_size in modeled_sizes:
+            spc.modeled_size = pd.DataFrame({"a": modeled_size}, index=index)
+            spc.update_shadow_prices(state)
+            prices.append(spc.shadow_prices["a"].to_numpy())
+        return prices
+
+    # zone 2 has no modeled size in the last iteration, so its price is left alone
+    prices = run("ctramp", [[50.0, 200.0, 50.0], [60.0, 150.0, 0.0]])
+    assert prices[1][2] == prices[0][2]
+
+    # zone 0 is within tolerance after the first step, momentum may not push it out
+    prices = run("daysim", [[50.0, 200.0, 100.0], [100.0, 150.0, 100.0]])
+    step = prices[1] - prices[0]
+    assert np.log(0.9) - 1e-12 <= step[0] <= np.log(1.1) + 1e-12
+
+
+def test_shadow_pricing_resimulate_changed_zones(state, model_settings, network_los):
+    """
+    A segment with a zone that became more attractive is re-simulated in full.
+    Otherwise, with explicit error terms, only choosers who chose, or sampled, a
+    zone that became less attractive are re-simulated.
+    """
+    from activitysim.abm.models.location_choice import choosers_in_changed_zones
+
+    spc = shadow_pricing.load_shadow_price_calculator(state, model_settings)
+    spc.shadow_settings = shadow_pricing.ShadowPriceSettings(
+        SHADOW_PRICE_METHOD="ctramp", RESIMULATE_PRICE_TOLERANCE=0.05
+    )
+
+    zones = pd.Index([1, 2, 3, 4], name="zone_id")
+    previous_shadow_prices = pd.DataFrame(
+        {"a": [1.0, 1.0, 1.0, 0.0], "b": [1.0, 1.0, 1.0, 1.0]}, index=zones
+    )
+    spc.shadow_prices = pd.DataFrame(
+        {"a": [1.01, 0.5, 1.0, 0.0], "b": [1.0, 1.0, 1.5, 0.0]}, index=zones
+    )
+
+    changed_zones = spc.changed_zones(previous_shadow_prices)
+    assert changed_zones["a"].tolist() == [0, -1, 0, 0]
+    assert changed_zones["b"].tolist() == [0, 0, 1, -1]
+
+    choosers = pd.DataFrame(
+        {"segment": [0, 0, 0, 0, 1, 1]},
+        index=pd.Index([10, 11, 12, 15, 13, 14], name="person_id"),
+    )
+    choices = pd.Series([2, 1, 1, 3, 3, 2], index=choosers.index)
+    sample_alternatives = pd.Series(
+        [2, 1, 4, 1, 2, 3, 2, 4, 2],
+        index=pd.Index([10, 10, 11, 12, 12, 15, 13, 14, 14], name="person_id"),
+    )
+
+    def resimulate(explicit_error_terms):
+        return choosers_in_changed_zones(
+            choosers,
+            "segment",
+            {"a": 0, "b": 1},
+            changed_zones,
+            choices,
+            sample_alternatives,
+            explicit_error_terms,
+        ).tolist()
+
+    # 10 chose the less attractive zone, 12 sampled it,
+    # segment b has a more attractive zone so all of it is re-simulated
+    assert resimulate(True) == [True, False, True, False, True, True]
+    # without explicit error terms any change can change every sample
+    assert resimulate(False) == [True] * 6
@@ -0,0 +1,111 @@
+# ActivitySim
+# See full license in LICENSE.txt.
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from activitysim.abm.models import summarize
+
+
+def test_construct_bin_labels():
+    rng = np.random.default_rng(0)
+    data = pd.Series(
+        np.where(rng.random(1000) < 0.05, np.nan, rng.integers(0, 100, 1000)),
+        index=rng.permutation(1000),
+    )
+    bins = pd.cut(data, [0, 10, 50, 100], include_lowest=True)
+
+    labels = summarize.construct_bin_labels(bins, "{left:,.2f} - {right:,.2f}")
+    expected = bins.map(
+        lambda x: f"{x.left:,.2f} - {x.right:,.2f}", na_action="ignore"
+    ).astype(object)
+    expected[bins.isna()] = "nan - nan"
+    pd.testing.assert_series_equal(labels, expected)
+
+    # labels are converted to numbers if possible
+    labels = summarize.construct_bin_labels(bins.dropna(), "{rank}")
+    assert labels.dtype == np.int64
+    assert (labels == bins.dropna().cat.codes + 1).all()
+
+
+def test_referenced_names(tmp_path):
+    spec = pd.DataFrame(
+        {
+            "Output": ["_total_vmt", "trips_by_mode"],
+            "Expression": [
+                "trips_merged[['auto_distance']].sum()",
+                "trips_merged.groupby('trip_mode').number_of_participants.sum()",
+            ],
+        }
+    )
+    model_settings = summarize.SummarizeSettings(
+        trips_merged={"BIN": [{"column": "total_time", "label": "time_bin"}]}
+    )
+    names = summarize.referenced_names(None, model_settings, spec)
+    assert {
+        "auto_distance",
+        "trip_mode",
+        "number_of_participants",
+        "total_time",
+    } <= names
+    assert "tour_category" not in names
+
+
+def test_partial_aggregates():
+    rng = np.random.default_rng(0)
+    num_trips = 1000
+    trips_merged = pd.DataFrame(
+        {
+            "trip_mode": rng.choice(["WALK", "BIKE", "DRIVEALONE"], num_trips),
+            "tour_type": pd.Categorical(
+                rng.choice(["work", "school"], num_trips),
+                categories=["school", "work", "escort"],
+            ),
+            "depart": rng.integers(5, 24, num_trips).astype(float),
+            "number_of_participants": rng.integers(1, 4, num_trips),
+            "is_joint": rng.random(num_trips) < 0.1,
+            "distance": rng.random(num_trips) * 10,
+        }
+    )
+    trips_merged.loc[::7, "depart"] = np.nan
+
+    expressions = [
+        "trips_merged.groupby('trip_mode')[['number_of_participants']].sum().T",
+        "trips_merged.groupby(['depart','tour_type'])['number_of_participants']"
+        ".sum().unstack(-1).reset_index()",
+        "trips_merged.groupby(['tour_type','trip_mode']).size()"
+        ".rename('trips').reset_index()",
+        "trips_merged.groupby('tour_type').is_joint.sum()",
+        "trips_merged.groupby('trip_mode')[['distance', 'depart']].count()",
+    ]
+    plans = {
+        i: summarize.plan_partial_aggregation(e) for i, e in enumerate(expressions)
+    }
+    assert all(plans.values())
+
+    chunks = (trips_merged.iloc[start : start + 97] for start in range(0, 1000, 97))
+    aggregates = summarize.partial_aggregates(plans, chunks)
+    for i, expr in enumerate(expressions):
+        result = eval(
+            plans[i].finalize, {}, {summarize.PARTIAL_AGGREGATE: aggregates[i]}
+        )
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(result), pd.DataFrame(eval(expr)), check_exact=True
+        )
+
+    # float sums depend on the order of the values, and are left to the full table
+    plan = summarize.plan_partial_aggregation(
+        "trips_merged.groupby('trip_mode').distance.sum()"
+    )
+    assert summarize.partial_aggregates({0: plan}, [trips_merged]) == {0: None}
+
+    for expr in [
+        "trips_merged[['number_of_participants']].sum()",
+        "trips_merged.groupby('trip_mode').sum()",
+        "trips_merged.groupby('trip_mode', sort=False).size()",
+        "trips_merged.groupby(keys)['number_of_participants'].sum()",
+        "trips_merged.groupby('trip_mode').size() / len(trips_merged)",
+        "trips_merged.groupby('trip_mode')['distance'].mean()",
+    ]:
+        assert summarize.plan_partial_aggregation(expr) is None
@@ -71,6 +71,7 @@ def test_destination_presample_uses_taz_stable_mapping(monkeypatch):
         zone_layer=None,
         stable_alt_positions=None,
         n_total_alts=None,
+        chooser_key=None,
     ):
         captured["origin_taz"] = choosers[tour_destination.ORIG_TAZ].copy()
         captured["alt_dest_col_name"] = alt_dest_col_name
@@ -119,6 +120,7 @@ def test_destination_presample_uses_taz_stable_mapping(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "zone_id",
             "CHOOSER_ORIG_COL_NAME": "origin",
         },
@@ -348,6 +350,7 @@ def test_destination_sample_uses_maz_stable_mapping(monkeypatch):
         zone_layer=None,
         stable_alt_positions=None,
         n_total_alts=None,
+        chooser_key=None,
     ):
         captured["active_maz_index"] = destination_size_terms.index.copy()
         captured["stable_alt_positions"] = stable_alt_positions.copy()
@@ -373,6 +376,7 @@ def test_destination_sample_uses_maz_stable_mapping(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "zone_id",
             "CHOOSER_ORIG_COL_NAME": "origin",
             "CHOOSER_ID_COLUMN": "person_id",
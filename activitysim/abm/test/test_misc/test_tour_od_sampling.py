@@ -69,6 +69,7 @@ def test_od_presample_passes_full_taz_index_for_eet_poisson(monkeypatch):
         _chunk_size,
         chunk_tag,
         trace_label,
+        chooser_key=None,
     ):
         captured["active_taz_index"] = destination_size_terms.index.copy()
         captured["alt_od_col_name"] = alt_od_col_name
@@ -118,6 +119,7 @@ def test_od_presample_passes_full_taz_index_for_eet_poisson(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "alt_dest",
             "CHOOSER_ORIG_COL_NAME": "origin",
         },
@@ -186,6 +188,7 @@ def test_od_presample_omits_full_taz_index_for_eet_non_poisson(monkeypatch):
         _chunk_size,
         chunk_tag,
         trace_label,
+        chooser_key=None,
     ):
         captured["active_taz_index"] = destination_size_terms.index.copy()
         captured["alt_od_col_name"] = alt_od_col_name
@@ -236,6 +239,7 @@ def test_od_presample_omits_full_taz_index_for_eet_non_poisson(monkeypatch):
         "ModelSettings",
         (),
         {
+            "PRESAMPLE_CHOOSER_KEY": None,
             "ALT_DEST_COL_NAME": "alt_dest",
             "CHOOSER_ORIG_COL_NAME": "origin",
         },
@@ -1,3 +1,5 @@
+import itertools
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -141,6 +143,34 @@ def test_build_patterns(trips):
     assert set(output_columns).issubset(patterns.columns)
 
 
+def test_build_patterns_enumerates_stop_durations(trips):
+    # patterns are built for one tour leg direction at a time
+    trips = trips[~trips[tdc.OUTBOUND]]
+    time_windows = get_time_windows(12, 3)
+    patterns = tdc.build_patterns(trips, time_windows)
+
+    # every way of splitting each tour's duration among its intermediate stops
+    tours = trips.groupby(tdc.TOUR_ID)[[tdc.TRIP_DURATION, tdc.TRIP_COUNT]].first()
+    for tour_id, (duration, trip_count) in tours.iterrows():
+        expected = {
+            "_".join(str(x) for x in durations)
+            for durations in itertools.product(
+                range(duration + 1), repeat=trip_count - 1
+            )
+            if trip_count > 1 and sum(durations) == duration
+        }
+        tour_patterns = patterns[patterns[tdc.TOUR_ID] == tour_id]
+        assert set(tour_patterns[tdc.PATTERN_ID]) == expected
+
+        for pattern_id, stops in tour_patterns.groupby(tdc.PATTERN_ID):
+            assert (
+                "_".join(
+                    stops.sort_values(tdc.TRIP_NUM)[tdc.STOP_TIME_DURATION].astype(str)
+                )
+                == pattern_id
+            )
+
+
 def test_get_tour_legs(trips):
     tour_legs = tdc.get_tour_legs(trips)
     assert tour_legs.index.name == tdc.TOUR_LEG_ID
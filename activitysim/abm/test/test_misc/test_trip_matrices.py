@@ -0,0 +1,60 @@
+# ActivitySim
+# See full license in LICENSE.txt.
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from activitysim.abm.models import trip_matrices
+
+
+def test_trip_matrix_accumulator(tmp_path):
+    rng = np.random.default_rng(0)
+    num_trips = 500
+    zone_labels = pd.Index([10, 20, 30, 40, 50], name="TAZ")
+    trips = pd.DataFrame(
+        {
+            "orig": rng.integers(0, 5, num_trips),
+            "dest": rng.integers(0, 5, num_trips),
+            "DRIVE": rng.random(num_trips) < 0.5,
+            "WALK": rng.integers(0, 3, num_trips),
+            "sample_rate": rng.choice([0.1, 0.2, 0.5], num_trips),
+        }
+    )
+
+    # whole table matrices, aggregated as in write_matrices
+    aggregate_trips = trips.groupby(["orig", "dest"]).sum()
+    mean_weights = trips.groupby(["orig", "dest"]).sample_rate.mean()
+    orig_index = aggregate_trips.index.get_level_values("orig")
+    dest_index = aggregate_trips.index.get_level_values("dest")
+
+    # accumulated in chunks, by separate accumulators that are then merged
+    accumulators = []
+    for chunk_rows in np.array_split(np.arange(num_trips), 4):
+        chunk_trips = trips.iloc[chunk_rows]
+        accumulator = trip_matrices.TripMatrixAccumulator(
+            zone_labels, ["DRIVE", "WALK", "DRIVE"], "sample_rate"
+        )
+        accumulator.add(chunk_trips.orig, chunk_trips.dest, chunk_trips)
+        accumulators.append(accumulator)
+    accumulator = accumulators[0]
+    for other in accumulators[1:]:
+        accumulator.merge(other)
+
+    # partial matrices survive a round trip to disk
+    accumulator.save(tmp_path / "partial.npz")
+    accumulator = trip_matrices.TripMatrixAccumulator.load(tmp_path / "partial.npz")
+    assert accumulator.zone_labels.equals(zone_labels)
+    assert list(accumulator.sums) == ["DRIVE", "WALK"]
+
+    for col in ["DRIVE", "WALK"]:
+        expected = np.zeros((5, 5))
+        expected[orig_index, dest_index] = aggregate_trips[col] / mean_weights
+        np.testing.assert_allclose(accumulator.matrix(col), expected)
+
+    # without an expansion weight column the matrices are plain sums
+    unweighted = trip_matrices.TripMatrixAccumulator(zone_labels, ["WALK"])
+    unweighted.add(trips.orig, trips.dest, trips)
+    expected = np.zeros((5, 5))
+    expected[orig_index, dest_index] = aggregate_trips.WALK
+    np.testing.assert_array_equal(unweighted.matrix("WALK"), expected)
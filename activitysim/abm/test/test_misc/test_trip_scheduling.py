@@ -0,0 +1,73 @@
+# ActivitySim
+# See full license in LICENSE.txt.
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from activitysim.abm.models import trip_scheduling
+
+
+def _sequence_distribution(probs):
+    # distribution of departure sequences that rescheduling the leg until
+    # no trip fails converges to: the product of the trips' probabilities
+    # over all non-decreasing sequences
+    num_trips, num_periods = probs.shape
+    dist = {}
+    for seq in itertools.product(range(num_periods), repeat=num_trips):
+        if all(a <= b for a, b in zip(seq, seq[1:])):
+            p = np.prod([probs[i, t] for i, t in enumerate(seq)])
+            if p > 0:
+                dist[seq] = p
+    total = sum(dist.values())
+    return {seq: p / total for seq, p in dist.items()}
+
+
+def test_sample_leg_departures():
+    probs = np.array(
+        [
+            [0.0, 0.1, 0.3, 0.4, 0.2],
+            [0.5, 0.0, 0.1, 0.3, 0.1],
+            [0.6, 0.3, 0.0, 0.0, 0.1],
+        ]
+    )
+    expected = _sequence_distribution(probs)
+
+    num_legs = 100_000
+    offsets = np.arange(num_legs + 1, dtype=np.int64) * len(probs)
+    rands = np.random.default_rng(0).random(num_legs * len(probs))
+
+    choices, failed = trip_scheduling._sample_leg_departures(
+        offsets, np.tile(probs, (num_legs, 1)), rands
+    )
+
+    assert not failed.any()
+    sequences = pd.Series(list(map(tuple, choices.reshape(num_legs, len(probs)))))
+    observed = sequences.value_counts(normalize=True)
+
+    assert set(observed.index) <= set(expected)
+    for seq, p in expected.items():
+        assert observed.get(seq, 0) == pytest.approx(p, abs=0.005)
+
+
+def test_sample_leg_departures_infeasible():
+    # the second trip of the first leg can't depart at or after any departure
+    # of the first, and the only trip of the second leg has no probabilities
+    probs = np.array(
+        [
+            [0.0, 0.0, 1.0],
+            [1.0, 0.0, 0.0],
+            [0.0, 0.0, 0.0],
+        ]
+    )
+    offsets = np.array([0, 2, 3], dtype=np.int64)
+
+    choices, failed = trip_scheduling._sample_leg_departures(
+        offsets, probs, np.full(3, 0.5)
+    )
+
+    np.testing.assert_array_equal(choices, [2, 2, -1])
+    np.testing.assert_array_equal(failed, [False, True, True])
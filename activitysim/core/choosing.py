@@ -200,3 +200,151 @@ def sample_choices_maker_preserve_ordering(
         out_choices=out_choices,
         out_choice_probs=out_choice_probs,
     )
+
+
+@njit
+def alias_tables(prob_array):
+    """
+    Build Walker/Vose alias tables for each row of probabilities.
+
+    Rows do not need to sum to exactly one, they are normalized here. Rows
+    summing to zero get a table that always returns the first alternative.
+
+    Parameters
+    ----------
+    prob_array : array of float, shape (n_rows, n_alts)
+
+    Returns
+    -------
+    thresholds : array of float, shape (n_rows, n_alts)
+        probability of keeping the alternative in each bin
+    aliases : array of int, shape (n_rows, n_alts)
+        alternative to use when the bin's own alternative is not kept
+    """
+    n_rows = prob_array.shape[0]
+    n_alts = prob_array.shape[1]
+    thresholds = np.zeros((n_rows, n_alts), dtype=np.float64)
+    aliases = np.zeros((n_rows, n_alts), dtype=np.int32)
+    scaled = np.empty(n_alts, dtype=np.float64)
+    small = np.empty(n_alts, dtype=np.int32)
+    large = np.empty(n_alts, dtype=np.int32)
+
+    for r in range(n_rows):
+        total = 0.0
+        for a in range(n_alts):
+            total += prob_array[r, a]
+        if total <= 0:
+            continue
+        n_small = 0
+        n_large = 0
+        for a in range(n_alts):
+            scaled[a] = prob_array[r, a] * n_alts / total
+            if scaled[a] < 1.0:
+                small[n_small] = a
+                n_small += 1
+            else:
+                large[n_large] = a
+                n_large += 1
+        while n_small > 0 and n_large > 0:
+            n_small -= 1
+            s = small[n_small]
+            l = large[n_large - 1]
+            thresholds[r, s] = scaled[s]
+            aliases[r, s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                n_large -= 1
+                small[n_small] = l
+                n_small += 1
+        # leftovers are (up to rounding) exactly full bins
+        for i in range(n_large):
+            thresholds[r, large[i]] = 1.0
+            aliases[r, large[i]] = large[i]
+        for i in range(n_small):
+            thresholds[r, small[i]] = 1.0
+            aliases[r, small[i]] = small[i]
+
+    return thresholds, aliases
+
+
+@njit
+def _alias_sample_choices_maker(
+    prob_array,
+    thresholds,
+    aliases,
+    row_index,
+    random_array,
+    alts_array,
+):
+    n_choosers = random_array.shape[0]
+    sample_size = random_array.shape[1]
+    n_alts = prob_array.shape[1]
+    out_choices = np.empty((sample_size, n_choosers), dtype=alts_array.dtype)
+    out_choice_probs = np.empty((sample_size, n_choosers), dtype=np.float32)
+
+    for c in range(n_choosers):
+        r = row_index[c]
+        for s in range(sample_size):
+            # one uniform picks the bin and, from its fractional part, the side
+            x = random_array[c, s] * n_alts
+            a = min(int(x), n_alts - 1)
+            if x - a >= thresholds[r, a]:
+                a = aliases[r, a]
+            out_choices[s, c] = alts_array[a]
+            out_choice_probs[s, c] = prob_array[r, a]
+
+    return out_choices, out_choice_probs
+
+
+def alias_sample_choices_maker(
+    prob_array,
+    random_array,
+    alts_array,
+    row_index=None,
+):
+    """
+    Random sample of alternatives with replacement, using alias tables.
+
+    An alias table is built once for each row of `prob_array`, after which each
+    draw takes constant time and consumes a single random number, so the random
+    number usage is the same as for `sample_choices_maker_preserve_ordering`
+    (although the alternatives drawn for a given random number differ).
+
+    Parameters
+    ----------
+    prob_array : array of float, shape (n_rows, n_alts)
+    random_array : array of float, shape (n_choosers, n_samples)
+    alts_array : array, shape (n_alts)
+    row_index : array of int, shape (n_choosers), optional
+        row of `prob_array` to sample from for each chooser, so choosers with
+        identical probabilities can share a table. Defaults to one row per chooser.
+
+    Returns
+    -------
+    out_choices : array[alts_array.dtype], shape (n_samples, n_choosers)
+    out_choice_probs : array[float], shape (n_samples, n_choosers)
+    """
+    if row_index is None:
+        row_index = np.arange(random_array.shape[0])
+    thresholds, aliases = alias_tables(prob_array)
+    if alts_array.dtype.kind != "i":
+        # choose integer positions in numba and then convert those back to
+        # whatever dtype the alternatives are, as in the inverse-CDF sampler
+        out_choices, out_choice_probs = _alias_sample_choices_maker(
+            prob_array,
+            thresholds,
+            aliases,
+            row_index,
+            random_array,
+            np.arange(alts_array.size),
+        )
+        return alts_array[out_choices], out_choice_probs
+
+    return _alias_sample_choices_maker(
+        prob_array,
+        thresholds,
+        aliases,
+        row_index,
+        random_array,
+        alts_array,
+    )
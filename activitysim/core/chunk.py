@@ -11,6 +11,7 @@ import multiprocessing
 import os
 import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 import numpy as np
@@ -165,6 +166,10 @@ def chunk_logging(state: workflow.State):
     return len(state.chunk.CHUNK_LEDGERS) > 0
 
 
+def chunk_threads(state: workflow.State):
+    return state.settings.chunk_threads
+
+
 def min_available_chunk_ratio(state: workflow.State):
     return state.settings.min_available_chunk_ratio
 
@@ -1494,7 +1499,10 @@ def adaptive_chunked_choosers_by_chunk_id(
     assert num_choosers > 0
 
     if state.settings.chunk_training_mode == MODE_EXPLICIT:
-        chunk_size = explicit_chunk_size
+        if explicit_chunk_size < 1:
+            chunk_size = math.ceil(num_choosers * explicit_chunk_size)
+        else:
+            chunk_size = explicit_chunk_size
     else:
         chunk_size = state.settings.chunk_size
     chunk_sizer = ChunkSizer(
@@ -1535,3 +1543,126 @@ def adaptive_chunked_choosers_by_chunk_id(
                 ) = chunk_sizer.adaptive_rows_per_chunk(i)
 
     chunk_sizer.close()
+
+
+def threaded_chunked_choosers(
+    state: workflow.State,
+    choosers: pd.DataFrame,
+    chunk_func,
+    trace_label: str,
+    chunk_tag: str = None,
+    *,
+    chunk_size: int | None = None,
+    explicit_chunk_size: float = 0,
+    num_threads: int | None = None,
+):
+    """
+    Apply chunk_func to chunks of choosers, running up to chunk_threads chunks concurrently
+
+    Chunks are run in a thread pool, so this is only beneficial when chunk_func spends most
+    of its time in code that releases the GIL (e.g. numba or numexpr), and all concurrent
+    chunks share the same skims and other data. Since every chooser draws from its own
+    random number stream, results are identical to running the chunks sequentially.
+
+    Threads are only used in MODE_CHUNKLESS and MODE_EXPLICIT, where chunk sizing does not
+    depend on the (process-wide) memory ledgers. In MODE_CHUNKLESS choosers are split evenly
+    across the threads. In MODE_EXPLICIT the explicit chunk size is split across the threads,
+    so the number of choosers in flight at once stays within the explicit chunk_size budget.
+    In all other modes (or if chunk_threads is 1) this falls back to adaptive_chunked_choosers
+    and runs the chunks sequentially.
+
+    Parameters
+    ----------
+    choosers : pandas.DataFrame
+    chunk_func : callable
+        called as chunk_func(chooser_chunk, chunk_trace_label, chunk_sizer) for each chunk
+    trace_label : str
+    chunk_tag : str, optional
+    chunk_size : int, optional
+    explicit_chunk_size : float, optional
+    num_threads : int, optional
+        override the chunk_threads setting (e.g. 1 to force sequential chunks)
+
+    Returns
+    -------
+    results : list
+        chunk_func results, in the same order as the chooser chunks
+    """
+
+    if num_threads is None:
+        num_threads = chunk_threads(state)
+    training_mode = state.settings.chunk_training_mode
+    num_choosers = len(choosers.index)
+
+    if (
+        num_threads <= 1
+        or num_choosers <= 1
+        or training_mode not in (MODE_CHUNKLESS, MODE_EXPLICIT)
+    ):
+        if num_threads > 1:
+            logger.debug(
+                f"{trace_label} running chunks sequentially "
+                f"in chunk_training_mode {training_mode}"
+            )
+        results = []
+        for (
+            _i,
+            chooser_chunk,
+            chunk_trace_label,
+            chunk_sizer,
+        ) in adaptive_chunked_choosers(
+            state,
+            choosers,
+            trace_label,
+            chunk_tag,
+            chunk_size=chunk_size,
+            explicit_chunk_size=explicit_chunk_size,
+        ):
+            results.append(chunk_func(chooser_chunk, chunk_trace_label, chunk_sizer))
+            chunk_sizer.log_df(trace_label, "result_list", results)
+        return results
+
+    chunk_tag = chunk_tag or trace_label
+
+    if training_mode == MODE_EXPLICIT and explicit_chunk_size > 0:
+        if state.settings.multiprocess:
+            num_processes = state.get_injectable("num_processes", 1)
+        else:
+            num_processes = 1
+        if explicit_chunk_size < 1:
+            chunk_size = math.ceil(num_choosers * explicit_chunk_size)
+        else:
+            chunk_size = math.ceil(explicit_chunk_size / num_processes)
+        rows_per_chunk = max(math.ceil(chunk_size / num_threads), 1)
+    else:
+        chunk_size = 0
+        rows_per_chunk = math.ceil(num_choosers / num_threads)
+
+    # explicit and chunkless ChunkSizers keep no ledger, so one can be shared by all chunks
+    chunk_sizer = ChunkSizer(
+        state, chunk_tag, trace_label, num_choosers, rows_per_chunk, training_mode
+    )
+
+    offsets = range(0, num_choosers, rows_per_chunk)
+    estimated_number_of_chunks = len(offsets)
+
+    logger.debug(
+        f"{trace_label} Running threaded_chunked_choosers with {num_choosers} choosers "
+        f"in {estimated_number_of_chunks} chunks on {num_threads} threads"
+    )
+
+    def run_chunk(i, offset):
+        chooser_chunk = choosers[offset : offset + rows_per_chunk]
+        chunk_trace_label = trace_label_for_chunk(state, trace_label, chunk_size, i)
+        logger.debug(
+            f"Running chunk {i} of {estimated_number_of_chunks} "
+            f"with {len(chooser_chunk)} of {num_choosers} choosers"
+        )
+        return chunk_func(chooser_chunk, chunk_trace_label, chunk_sizer)
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = list(
+            executor.map(run_chunk, range(1, estimated_number_of_chunks + 1), offsets)
+        )
+
+    return results
@@ -135,13 +135,50 @@ class ComputeSettings(PydanticBase):
     Sharrow settings for a component.
     """
 
-    sample_method: None | Literal["inverse_cdf", "eet", "poisson"] = None
+    sample_method: None | Literal["inverse_cdf", "eet", "poisson", "alias"] = None
     """
     Override the alternative sampling method used by `interaction_sample`.
 
     When unset, `interaction_sample` preserves legacy behavior: it uses
     `inverse_cdf` when explicit error terms are off and `poisson` when they
     are on.
+
+    The `alias` method samples with replacement like `inverse_cdf`, using the
+    same random numbers, but draws from alias tables built once per chooser
+    (or once per chooser key, see `PRESAMPLE_CHOOSER_KEY`), so each draw takes
+    constant time. The alternatives drawn for a given random number differ
+    from `inverse_cdf`, so results are not identical.
+    """
+
+    sample_prune_threshold: float = 0
+    """Skip unlikely alternatives when sampling with the `eet` or `poisson` methods.
+
+    If positive, the alternative-only terms of the spec are evaluated first, and
+    they bound each alternative's MNL probability for every chooser (see
+    `sample_prune_utility_range`). Alternatives whose chance of landing in the
+    sample, `1 - (1 - p) ** sample_size` for that bound `p`, is below this
+    threshold are dropped before the interaction terms are evaluated, so they
+    get no utilities and no random draws. The alternatives that are kept use the
+    same random numbers as without pruning. The probability mass skipped for
+    each chooser is bounded, and the bound is logged for each sampling step.
+    Ignored by the `inverse_cdf` and `alias` methods.
+
+    .. versionadded:: 1.6
+    """
+
+    sample_prune_utility_range: float | None = None
+    """Largest difference between the interaction utilities of a chooser's alternatives.
+
+    Used by `sample_prune_threshold` to bound the probabilities of alternatives
+    from their alternative-only utilities.  This must cover every interaction
+    term, i.e. every term that uses both chooser and alternative columns or a
+    skim (e.g. distance terms), including terms that make alternatives
+    unavailable.  If it is too small, alternatives that some choosers would
+    sample with a higher chance are pruned.  Not needed for a spec without
+    interaction terms.  If the spec has interaction terms and this is not set,
+    alternatives are not pruned.
+
+    .. versionadded:: 1.6
     """
 
     sharrow_skip: bool | dict[str, bool] = False
@@ -228,6 +265,21 @@ class ComputeSettings(PydanticBase):
     protect_columns: list[str] = []
     """Protect these columns from being dropped from the chooser table."""
 
+    broadcast_interaction: bool = False
+    """Evaluate interaction specs without building the full chooser by alternative table.
+
+    Only used when sharrow is not used for this component. Spec terms that reference
+    only chooser columns are evaluated once per chooser, terms that reference only
+    alternative columns (including '@' expressions that only transform alternative
+    columns, such as size term logs) are evaluated once per alternative, and both are
+    broadcast-added to the utilities. The remaining interaction terms are evaluated on
+    a cross join of just the columns they reference, which is skipped entirely if
+    there are none. The full cross join is still used when tracing, estimating,
+    logging alternative losers, or sampling alternatives in `interaction_simulate`.
+
+    .. versionadded:: 1.6
+    """
+
     def should_skip(self, subcomponent: str) -> bool:
         """Check if sharrow should be skipped for a particular subcomponent."""
         if isinstance(self.sharrow_skip, dict):
@@ -284,6 +336,9 @@ class ComputeSettings(PydanticBase):
             drop_unused_columns=self.drop_unused_columns,
             protect_columns=self.protect_columns,
             sample_method=self.sample_method,
+            sample_prune_threshold=self.sample_prune_threshold,
+            sample_prune_utility_range=self.sample_prune_utility_range,
+            broadcast_interaction=self.broadcast_interaction,
         )
 
 
@@ -253,6 +253,34 @@ class TourLocationComponentSettings(LocationComponentSettings, extra="forbid"):
     IN_PERIOD: int | dict[str, int] | None = None
     OUT_PERIOD: int | dict[str, int] | None = None
     LOGSUM_PREPROCESSOR: str = "preprocessor"
+    LOGSUM_DEDUPLICATE: bool = False
+    """Compute each distinct mode choice logsum only once.
+
+    Sampled (chooser, destination) rows often agree on every column that the
+    logsum spec reads (the origin, destination and skim periods, and the few
+    chooser attributes used by the spec). If this is True, rows are grouped on
+    those columns, the logsum is computed once per distinct group, and the results
+    are copied back to every row. Rows are not grouped if the spec uses the chooser
+    table as a whole (e.g. its index), or when tracing.
+
+    The columns are found by matching the chooser column names against the text
+    of the spec expressions and the string values of the locals, so columns that
+    the spec reads indirectly are missed. This includes columns read by functions
+    or lookups passed in the locals, and column names built up inside ``@``
+    expressions. Such a spec gets wrong logsums without any error, so run it once
+    with LOGSUM_DEDUPLICATE_CHECK before turning this on.
+
+    .. versionadded:: 1.6
+    """
+    LOGSUM_DEDUPLICATE_CHECK: bool = False
+    """Also compute every logsum without deduplication, and raise an error if any differ.
+
+    This doubles the cost of the logsums, and is meant for checking that
+    LOGSUM_DEDUPLICATE is safe to use with a logsum spec. It has no effect
+    unless LOGSUM_DEDUPLICATE is True.
+
+    .. versionadded:: 1.6
+    """
 
     SEGMENTS: list[str] | None = None
     SIZE_TERM_SELECTOR: str | None = None
@@ -287,6 +315,23 @@ class TourLocationComponentSettings(LocationComponentSettings, extra="forbid"):
     ORIG_ZONE_ID: str | None = None
     """This setting appears to do nothing..."""
 
+    PRESAMPLE_CHOOSER_KEY: list[str] | None = None
+    """Chooser columns that, with the origin zone, determine the presample utilities.
+
+    In two-zone models, TAZ-level presampling computes the same sampling
+    probabilities for every chooser whose sample spec terms evaluate identically.
+    If this is set, choosers are grouped by these columns (plus the origin TAZ in
+    location and tour destination presampling), the utilities and probabilities are
+    computed once per distinct group, and each chooser draws its own sample from
+    its group's probabilities. An empty list groups choosers by origin TAZ alone
+    (or, for tour OD presampling, puts all choosers in a single group).
+
+    This must list every chooser attribute used by the sample spec and the chooser
+    preprocessor, otherwise choosers with different probabilities are merged.
+
+    .. versionadded:: 1.6
+    """
+
     @field_validator("SIMULATE_CHOOSER_COLUMNS", mode="before")
     @classmethod
     def _deprecate_simulate_chooser_columns(cls, value):
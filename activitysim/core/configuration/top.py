@@ -140,6 +140,18 @@ class OutputTables(PydanticBase):
     sort: bool = False
     """Sort output in each table consistent with well defined column names."""
 
+    partitioned: bool = False
+    """
+    Write each table as a partitioned parquet dataset directory.
+
+    Requires `file_type` to be 'parquet'.  When `write_tables` is run as part
+    of a multiprocess step with more than one process, the tables are streamed
+    straight from each subprocess pipeline into the dataset when the step is
+    coalesced, one partition per subprocess, instead of being concatenated in
+    memory first.  When `sort` is also set, rows are sorted within each
+    partition only.
+    """
+
     tables: list[Union[str, OutputTable]] = None
     """
     A list of pipeline tables to include or to skip when writing outputs.
@@ -399,6 +411,25 @@ class Settings(PydanticBase, extra="allow", validate_assignment=True):
     minimum fraction of total chunk_size to reserve for adaptive chunking
     """
 
+    chunk_threads: int = 1
+    """
+    Number of chooser chunks to run concurrently in threads within a process.
+
+    Running chunks concurrently is useful when the expensive part of a model
+    is evaluated in numba or numexpr (e.g. with sharrow enabled), which release
+    the GIL, so that several chunks can share a single copy of the skims without
+    needing additional processes.  Results are identical to sequential chunking,
+    as each chooser draws from its own random number stream.
+
+    Threaded chunks are only used with the "disabled" and "explicit"
+    chunk_training_modes, and not in estimation mode. In "explicit" mode, the
+    explicit chunk size is split across the threads so the number of choosers in
+    flight at once stays within the explicit chunk size. In all other modes,
+    chunks are run sequentially.
+
+    .. versionadded:: 1.6
+    """
+
     checkpoints: Union[bool, list] = True
     """
     When to write checkpoint (intermediate table states) to disk.
@@ -793,13 +824,16 @@ class Settings(PydanticBase, extra="allow", validate_assignment=True):
     .. versionadded:: 1.6
     """
 
-    sample_method: None | Literal["inverse_cdf", "eet", "poisson"] = None
+    sample_method: None | Literal["inverse_cdf", "eet", "poisson", "alias"] = None
     """
     Sampling method to use in `activitysim.core.interaction_sample`.
 
     When unset, `inverse_cdf` is used when `use_explicit_error_terms` is false and
     `poisson` is used when it is true.
 
+    The `alias` method samples with replacement like `inverse_cdf`, but draws
+    from alias tables in constant time per draw.
+
     .. versionadded:: 1.6
     """
 
@@ -837,6 +871,32 @@ class Settings(PydanticBase, extra="allow", validate_assignment=True):
     .. versionadded:: 1.6
     """
 
+    packed_timetable_windows: bool = False
+    """
+    Keep the person time windows used in scheduling models packed into bit fields.
+
+    The timetable then uses `activitysim.core.timetable.PackedTimeTable`, which
+    needs less than half the memory of the default int8 windows and checks tour
+    availability with bitwise operations on whole words. Results are unchanged.
+
+    .. versionadded:: 1.6
+    """
+
+    tour_scheduling_logsum_cache_mb: float = 0
+    """
+    Memory for logsums cached across tour scheduling models, in megabytes.
+
+    Mandatory, non-mandatory, joint and subtour scheduling each compute mode choice
+    logsums for many of the same (chooser attributes, origin, destination,
+    out_period, in_period) combinations. If this is greater than zero, these
+    logsums are kept in a least recently used cache of this size that spans model
+    steps, keyed on the chooser columns read by the logsum spec and invalidated
+    when the logsum spec or coefficients change. Results are unchanged. The cache
+    is not used when tracing a household.
+
+    .. versionadded:: 1.6
+    """
+
     other_settings: dict[str, Any] = None
 
     def _get_attr(self, attr):
@@ -13,6 +13,12 @@ def _fast_map(fm, target, dtype=np.int32):
     return out
 
 
+@nb.njit
+def _fill_mapping(m, keys, values):
+    for n in range(keys.size):
+        m[keys[n]] = values[n]
+
+
 class FastMapping:
     def __init__(self, source, to_range=np.int64):
         if isinstance(source, pd.Series):
@@ -20,8 +26,7 @@ class FastMapping:
                 key_type=nb.from_dtype(source.index.dtype),
                 value_type=nb.from_dtype(source.dtype),
             )
-            for k, v in source.items():
-                m[k] = v
+            _fill_mapping(m, source.index.to_numpy(), source.to_numpy())
             self._in_dtype = source.index.dtype
             self._out_dtype = source.dtype
             self._mapper = m
@@ -30,8 +35,7 @@ class FastMapping:
                 key_type=nb.from_dtype(source.dtype),
                 value_type=nb.from_dtype(to_range),
             )
-            for v, k in enumerate(source):
-                m[k] = v
+            _fill_mapping(m, np.asarray(source), np.arange(len(source), dtype=to_range))
             self._in_dtype = source.dtype
             self._out_dtype = to_range
             self._mapper = m
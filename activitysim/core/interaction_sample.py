@@ -31,7 +31,7 @@ logger = logging.getLogger(__name__)
 
 DUMP = False
 
-InteractionSampleMethod = typing.Literal["inverse_cdf", "eet", "poisson"]
+InteractionSampleMethod = typing.Literal["inverse_cdf", "eet", "poisson", "alias"]
 
 # Threshold on P0, the probability that a chooser's Poisson draw comes up empty, below
 # which the fallback term is dropped from the reported inclusion probabilities. Choosers
@@ -54,6 +54,59 @@ InteractionSampleMethod = typing.Literal["inverse_cdf", "eet", "poisson"]
 POISSON_EMPTY_SAMPLE_TOLERANCE = 1e-12
 
 
+def join_sample_choosers(sample_df, choosers, chooser_id_col=None):
+    """
+    Attach chooser columns to each row of a sampled alternatives table.
+
+    Equivalent to a left join of choosers on the sample's chooser id (its index, or
+    ``chooser_id_col``) but, since the rows of each chooser are adjacent, chooser rows
+    are located once per run of rows and repeated by position rather than hash-joined
+    row by row. If some choosers are missing, or the tables share column names, the
+    join itself is used, so the result (missing values, suffixes or errors) is
+    always that of the join.
+
+    Parameters
+    ----------
+    sample_df : pandas.DataFrame
+        sampled alternatives, e.g. as returned by interaction_sample
+    choosers : pandas.DataFrame
+        chooser attributes, uniquely indexed by chooser id
+    chooser_id_col : str, optional
+        column of sample_df holding the chooser id, if not the index
+
+    Returns
+    -------
+    pandas.DataFrame
+        sample_df columns followed by choosers columns, with sample_df index
+    """
+    if chooser_id_col is None:
+        chooser_index = sample_df.index.to_numpy()
+    else:
+        chooser_index = sample_df[chooser_id_col].to_numpy()
+
+    is_new_chooser = np.ones(len(chooser_index), dtype=bool)
+    is_new_chooser[1:] = chooser_index[1:] != chooser_index[:-1]
+    starts = np.flatnonzero(is_new_chooser)
+    chooser_positions = choosers.index.get_indexer(chooser_index[starts])
+
+    if (chooser_positions < 0).any() or sample_df.columns.intersection(
+        choosers.columns
+    ).size:
+        if chooser_id_col is None:
+            return sample_df.join(choosers, how="left")
+        return pd.merge(
+            sample_df, choosers, left_on=chooser_id_col, right_index=True, how="left"
+        )
+
+    row_positions = np.repeat(
+        chooser_positions, np.diff(np.append(starts, len(chooser_index)))
+    )
+    chooser_rows = choosers.take(row_positions)
+    chooser_rows.index = sample_df.index
+
+    return pd.concat([sample_df, chooser_rows], axis=1)
+
+
 def resolve_sample_method(
     state: workflow.State,
     settings: ComputeSettings | None = None,
@@ -152,6 +205,79 @@ def _poisson_fallback_positions(
     return np.argsort(-probs_values, axis=1, kind="stable")[:, :k]
 
 
+def _sample_prune_mask(
+    state: workflow.State,
+    choosers: pd.DataFrame,
+    alternatives: pd.DataFrame,
+    spec: pd.DataFrame,
+    locals_d,
+    sample_size: int,
+    compute_settings: ComputeSettings,
+    trace_label: str | None,
+) -> np.ndarray | None:
+    """
+    Flag the alternatives worth sampling, before any interaction term is evaluated.
+
+    The utility of alternative j for chooser c is split (see
+    `interaction_simulate.classify_interaction_terms`) into a chooser-only part, which
+    is the same for every alternative and so cancels out of the probabilities, an
+    alternative-only part `a_j`, and the interaction terms. If the interaction
+    utilities of any chooser differ by at most `R` (`sample_prune_utility_range`)
+    between alternatives, every chooser's MNL probability of j is at most
+
+        q_j = exp(a_j + R) / sum_k exp(a_k)
+
+    so its chance of landing in the sample at least once is at most
+    `1 - (1 - q_j) ** sample_size`. Alternatives for which this is below
+    `sample_prune_threshold` are pruned for all choosers. The alternative with the
+    highest `a_j` is always kept. The sum of `q_j` over the pruned alternatives bounds
+    the probability mass skipped for each chooser, and is logged.
+
+    Returns a boolean array aligned to `alternatives` that is True for kept
+    alternatives, or None if the spec has interaction terms but no utility range
+    is set, so no bound is available.
+    """
+    _, alt_utils, term_types = interaction_simulate.eval_separable_utilities(
+        state,
+        spec,
+        choosers,
+        alternatives,
+        locals_d,
+        trace_label,
+        compute_settings=compute_settings,
+        term_types_to_eval=("alternative",),
+    )
+
+    utility_range = compute_settings.sample_prune_utility_range
+    if "interaction" not in term_types:
+        utility_range = 0.0
+    elif utility_range is None:
+        logger.warning(
+            f"{trace_label}: not pruning alternatives, since the spec has "
+            f"{term_types.count('interaction')} interaction terms and "
+            f"sample_prune_utility_range is not set"
+        )
+        return None
+
+    if np.isnan(alt_utils).any() or not np.isfinite(alt_utils).any():
+        return None
+
+    weights = np.exp(alt_utils - alt_utils.max())
+    prob_bounds = np.minimum(1.0, weights * np.exp(utility_range) / weights.sum())
+    sample_chance_bounds = 1.0 - np.power(1.0 - prob_bounds, sample_size)
+
+    keep = sample_chance_bounds >= compute_settings.sample_prune_threshold
+    keep[np.argmax(alt_utils)] = True
+
+    logger.info(
+        f"{trace_label}: pruned {len(keep) - keep.sum()} of {len(keep)} alternatives "
+        f"with sampling chance below {compute_settings.sample_prune_threshold:g}, "
+        f"skipping probability mass of at most "
+        f"{min(1.0, prob_bounds[~keep].sum()):.3g} per chooser"
+    )
+    return keep
+
+
 def make_sample_choices_eet(
     state: workflow.State,
     choosers: pd.DataFrame,
@@ -451,6 +577,80 @@ def make_sample_choices(
     return choices_df
 
 
+def make_sample_choices_alias(
+    state: workflow.State,
+    choosers: pd.DataFrame,
+    probs: pd.DataFrame,
+    alternatives: pd.DataFrame,
+    sample_size: int,
+    alt_col_name: str,
+    allow_zero_probs: bool,
+    trace_label: str,
+    chunk_sizer: ChunkSizer,
+    row_codes: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """
+    Sample alternatives with replacement using alias tables.
+
+    This has the same with-replacement semantics and random number usage as
+    `make_sample_choices`, but builds an alias table once per row of `probs`
+    and then draws each sample in constant time instead of searching the
+    cumulative probabilities.
+
+    `probs` has one row per chooser, unless `row_codes` is given, in which case
+    it has one row per distinct chooser key and `row_codes` gives the row of
+    `probs` for each chooser, so that choosers sharing a key share a table.
+    """
+    from .choosing import alias_sample_choices_maker
+
+    if row_codes is None:
+        row_codes = np.arange(len(choosers))
+    assert len(row_codes) == len(choosers)
+    assert probs.shape[1] == len(alternatives)
+
+    if allow_zero_probs:
+        zero_probs = (probs.sum(axis=1) == 0).to_numpy()[row_codes]
+        if zero_probs.all():
+            return pd.DataFrame(
+                columns=[alt_col_name, "rand", "prob", choosers.index.name]
+            )
+        if zero_probs.any():
+            # remove from sample
+            choosers = choosers[~zero_probs]
+            row_codes = row_codes[~zero_probs]
+
+    rands = state.get_rn_generator().random_for_df(choosers, n=sample_size)
+    chunk_sizer.log_df(trace_label, "rands", rands)
+
+    choices_array, choice_probs_array = alias_sample_choices_maker(
+        probs.to_numpy(),
+        rands,
+        alternatives.index.values,
+        row_index=row_codes,
+    )
+    chunk_sizer.log_df(trace_label, "choices_array", choices_array)
+    chunk_sizer.log_df(trace_label, "choice_probs_array", choice_probs_array)
+
+    # explode to one row per chooser.index, alt_zone_id
+    choices_df = pd.DataFrame(
+        {
+            alt_col_name: choices_array.flatten(order="F"),
+            "rand": rands.T.flatten(order="F"),
+            "prob": choice_probs_array.flatten(order="F"),
+            choosers.index.name: np.repeat(np.asanyarray(choosers.index), sample_size),
+        }
+    )
+
+    del choices_array
+    chunk_sizer.log_df(trace_label, "choices_array", None)
+    del rands
+    chunk_sizer.log_df(trace_label, "rands", None)
+    del choice_probs_array
+    chunk_sizer.log_df(trace_label, "choice_probs_array", None)
+
+    return choices_df
+
+
 def _interaction_sample(
     state: workflow.State,
     choosers,
@@ -468,6 +668,7 @@ def _interaction_sample(
     compute_settings: ComputeSettings | None = None,
     stable_alt_positions=None,
     n_total_alts=None,
+    chooser_key=None,
 ):
     """
     Run a MNL simulation in the situation in which alternatives must
@@ -558,6 +759,26 @@ def _interaction_sample(
     if len(spec.columns) > 1:
         raise SegmentedSpecificationError("spec must have only one column")
 
+    # choosers sharing a chooser_key value have identical utilities and probabilities,
+    # so only evaluate them for the first chooser with each key and share the result
+    key_codes = None
+    if chooser_key is not None and sample_size > 0 and not have_trace_targets:
+        if len(chooser_key) > 0:
+            key_codes = (
+                choosers.groupby(list(chooser_key), sort=False, dropna=False)
+                .ngroup()
+                .to_numpy()
+            )
+        else:
+            key_codes = np.zeros(num_choosers, dtype=np.int64)
+        _, key_positions = np.unique(key_codes, return_index=True)
+        logger.info(
+            f"{trace_label}: computing sample probabilities for {len(key_positions)} "
+            f"distinct {chooser_key} keys of {num_choosers} choosers"
+        )
+        all_choosers = choosers
+        choosers = choosers.iloc[key_positions]
+
     # if using skims, copy index into the dataframe, so it will be
     # available as the "destination" for set_skim_wrapper_targets
     if skims is not None and alternatives.index.name not in alternatives:
@@ -634,7 +855,30 @@ def _interaction_sample(
                 interaction_utilities,
                 trace_eval_results,
             )
-    if not sharrow_enabled or (sharrow_enabled == "test"):
+    if (
+        not sharrow_enabled
+        and compute_settings.broadcast_interaction
+        and not have_trace_targets
+        and not log_alt_losers
+    ):
+        # evaluate chooser-only and alternative-only terms without the cross join
+        interaction_utilities = (
+            interaction_simulate.eval_interaction_utilities_broadcast(
+                state,
+                spec,
+                choosers,
+                alternatives,
+                locals_d,
+                trace_label,
+                skims=skims,
+                zone_layer=zone_layer,
+                chunk_sizer=chunk_sizer,
+                compute_settings=ComputeSettings(sharrow_skip=True),
+            )
+        )
+        chunk_sizer.log_df(trace_label, "interaction_utilities", interaction_utilities)
+
+    elif not sharrow_enabled or (sharrow_enabled == "test"):
         interaction_df = logit.interaction_dataset(
             state,
             choosers,
@@ -840,7 +1084,46 @@ def _interaction_sample(
             column_labels=["alternative", "probability"],
         )
 
-    if sampling_method == "inverse_cdf":
+    if key_codes is not None:
+        # each chooser still makes its own draws from its key's probabilities
+        choosers = all_choosers
+        if sampling_method == "eet":
+            utilities = pd.DataFrame(
+                utilities.to_numpy().take(key_codes, axis=0),
+                index=choosers.index,
+                columns=utilities.columns,
+            )
+            chunk_sizer.log_df(trace_label, "utilities", utilities)
+        if sampling_method != "alias":
+            # alias sampling builds one table per key, so probs stay one row per key
+            probs = pd.DataFrame(
+                probs.to_numpy().take(key_codes, axis=0),
+                index=choosers.index,
+                columns=probs.columns,
+            )
+            chunk_sizer.log_df(trace_label, "probs", probs)
+
+    if sampling_method == "alias":
+        del utilities
+        chunk_sizer.log_df(trace_label, "utilities", None)
+
+        choices_df = make_sample_choices_alias(
+            state,
+            choosers,
+            probs,
+            alternatives,
+            sample_size,
+            alt_col_name,
+            allow_zero_probs=allow_zero_probs,
+            trace_label=trace_label,
+            chunk_sizer=chunk_sizer,
+            row_codes=key_codes,
+        )
+
+        del probs
+        chunk_sizer.log_df(trace_label, "probs", None)
+
+    elif sampling_method == "inverse_cdf":
         del utilities
         chunk_sizer.log_df(trace_label, "utilities", None)
 
@@ -906,7 +1189,8 @@ def _interaction_sample(
                 )
             if not non_zero.all():
                 probs = probs[non_zero]
-                utilities = utilities[non_zero]
+                if sampling_method == "eet":
+                    utilities = utilities[non_zero]
                 choosers = choosers[non_zero]
 
         if sampling_method == "eet":
@@ -1021,6 +1305,7 @@ def interaction_sample(
     compute_settings: ComputeSettings | None = None,
     stable_alt_positions=None,
     n_total_alts=None,
+    chooser_key: list[str] | None = None,
 ):
     """
     Run a simulation in the situation in which alternatives must
@@ -1069,6 +1354,13 @@ def interaction_sample(
     explicit_chunk_size : float, optional
         If > 0, specifies the chunk size to use when chunking the interaction
         simulation. If < 1, specifies the fraction of the total number of choosers.
+    chooser_key : list of str, optional
+        Chooser columns that fully determine the sampling utilities (e.g. the origin
+        zone for a spec that only uses skims and alternative attributes). If given,
+        utilities and probabilities are only computed once per distinct key value in
+        each chunk, and each chooser then samples from the probabilities of its key.
+        An empty list means all choosers share the same probabilities.
+        Not used when tracing or when sample_size is 0.
 
     Returns
     -------
@@ -1098,8 +1390,8 @@ def interaction_sample(
     sampling_method = resolve_sample_method(state, compute_settings)
     logger.debug(f" interaction_sample sample method = {sampling_method}")
 
-    if sampling_method == "inverse_cdf":
-        # The inverse-CDF sampling path (make_sample_choices) does not consume
+    if sampling_method in ("inverse_cdf", "alias"):
+        # The inverse-CDF and alias sampling paths do not consume
         # stable_alt_positions or n_total_alts. Null them out so callers that
         # conservatively pass values along don't accidentally rely on them under
         # inverse-CDF sampling.
@@ -1120,6 +1412,32 @@ def interaction_sample(
 
     logger.debug(f" interaction_sample sample size = {sample_size}")
 
+    if (
+        sampling_method in ("eet", "poisson")
+        and compute_settings is not None
+        and compute_settings.sample_prune_threshold > 0
+        and sample_size > 0
+    ):
+        keep = _sample_prune_mask(
+            state,
+            choosers,
+            alternatives,
+            spec,
+            locals_d,
+            sample_size,
+            compute_settings,
+            trace_label,
+        )
+        if keep is not None and not keep.all():
+            # kept alternatives draw the same random numbers as without pruning
+            kept = np.flatnonzero(keep)
+            if stable_alt_positions is None:
+                stable_alt_positions = kept
+                n_total_alts = len(alternatives)
+            else:
+                stable_alt_positions = np.asarray(stable_alt_positions)[kept]
+            alternatives = alternatives.iloc[kept]
+
     result_list = []
     for (
         i,
@@ -1146,6 +1464,7 @@ def interaction_sample(
             compute_settings=compute_settings,
             stable_alt_positions=stable_alt_positions,
             n_total_alts=n_total_alts,
+            chooser_key=chooser_key,
         )
 
         if choices.shape[0] > 0:
@@ -2,8 +2,12 @@
 # See full license in LICENSE.txt.
 from __future__ import annotations
 
+import builtins
+import keyword
 import logging
+import re
 import time
+import types
 from builtins import zip
 from collections import OrderedDict
 from datetime import timedelta
@@ -648,6 +652,366 @@ def eval_interaction_utilities(
     return utilities, trace_eval_results
 
 
+_IDENTIFIER = r"[a-zA-Z_][a-zA-Z0-9_]*"
+_DF_COLUMN_REFERENCE = re.compile(
+    r"(?<![\w.])df\s*(?:\.\s*(" + _IDENTIFIER + r")|\[\s*(['\"])([^'\"]+)\2\s*\])"
+)
+
+
+def _separable_names(expr, locals_d):
+    """
+    Names of the df columns referenced by an '@' expression, or None if the expression
+    cannot be evaluated against the choosers or alternatives table alone
+
+    An '@' expression is python evaluated against the interaction dataset, so it is only
+    separable if every reference to the dataset is a plain column lookup (df.col or
+    df['col']) and every other name is a builtin, module, function or scalar constant
+    (so that, e.g., expressions using skims or temps stay interaction terms).
+    """
+    columns = set()
+
+    def _column(match):
+        columns.add(match.group(1) or match.group(3))
+        return " "
+
+    rest = _DF_COLUMN_REFERENCE.sub(_column, expr[1:])
+    rest = re.sub(r"(['\"]).*?\1", " ", rest)
+    # keyword argument names
+    rest = re.sub(r"(?<![\w.])" + _IDENTIFIER + r"\s*=(?!=)", " ", rest)
+
+    for name in re.findall(r"(?<![\w.])" + _IDENTIFIER, rest):
+        if keyword.iskeyword(name) or hasattr(builtins, name):
+            continue
+        if name in locals_d:
+            value = locals_d[name]
+        elif name in globals():
+            value = globals()[name]
+        else:
+            return None
+        if not isinstance(
+            value,
+            (
+                types.ModuleType,
+                types.FunctionType,
+                types.BuiltinFunctionType,
+                np.ufunc,
+                str,
+                int,
+                float,
+                bool,
+                np.number,
+            ),
+        ):
+            return None
+
+    return columns
+
+
+def classify_interaction_terms(spec, chooser_columns, alternative_columns, locals_d):
+    """
+    Classify the expressions of an interaction spec by the tables they reference
+
+    Expressions are classified by the column names they reference, as they would be
+    resolved in the interaction dataset (so chooser columns that clash with alternative
+    columns are referenced with a '_chooser' suffix, and locals_d names shadow columns):
+
+    * 'chooser' expressions only reference chooser columns
+    * 'alternative' expressions only reference alternative columns (or no columns at all)
+    * 'interaction' expressions reference both, or are temps (or reference temps), or
+      are '@' expressions that do anything other than look up df columns and apply
+      modules, functions and constants to them (e.g. skim lookups)
+
+    Parameters
+    ----------
+    spec : pandas.DataFrame
+        one row per spec expression and one col with utility coefficient
+    chooser_columns : iterable of str
+        chooser column names as they appear in the interaction dataset
+    alternative_columns : iterable of str
+        alternative column (and index) names as they appear in the interaction dataset
+    locals_d : dict or None
+
+    Returns
+    -------
+    list of str
+        one of 'chooser', 'alternative' or 'interaction' for each row of spec
+    """
+    locals_d = locals_d or {}
+    chooser_columns = set(chooser_columns)
+    alternative_columns = set(alternative_columns)
+
+    if isinstance(spec.index, pd.MultiIndex):
+        exprs = spec.index.get_level_values(simulate.SPEC_EXPRESSION_NAME)
+    else:
+        exprs = spec.index
+
+    temps = set()
+    term_types = []
+    for expr in exprs:
+        if expr.startswith("_"):
+            temps.add(expr[: expr.index("@")])
+            term_types.append("interaction")
+            continue
+
+        if names := set(re.findall(_IDENTIFIER, expr)) & temps:
+            term_types.append("interaction")
+            continue
+
+        if expr.startswith("@"):
+            names = _separable_names(expr, locals_d)
+            if names is None or not names <= chooser_columns | alternative_columns:
+                term_types.append("interaction")
+                continue
+        else:
+            names = set(re.findall(_IDENTIFIER, expr)) - set(locals_d)
+
+        if names & alternative_columns and names & chooser_columns:
+            term_types.append("interaction")
+        elif names & chooser_columns:
+            term_types.append("chooser")
+        else:
+            term_types.append("alternative")
+
+    return term_types
+
+
+def _skim_key_columns(skims, locals_d):
+    """
+    Names of the columns skim wrappers use to dereference the interaction dataset
+    """
+    if skims is None:
+        skims = []
+    elif isinstance(skims, dict):
+        skims = list(skims.values())
+    elif not isinstance(skims, list):
+        skims = [skims]
+
+    key_columns = set()
+    for skim in skims:
+        for attr in ("orig_key", "dest_key", "dim3_key", "time_key"):
+            key = getattr(skim, attr, None)
+            if isinstance(key, str):
+                key_columns.add(key)
+
+    for name in ("orig_col_name", "dest_col_name"):
+        if isinstance((locals_d or {}).get(name), str):
+            key_columns.add(locals_d[name])
+
+    return key_columns
+
+
+def eval_separable_utilities(
+    state,
+    spec,
+    choosers,
+    alternatives,
+    locals_d,
+    trace_label,
+    compute_settings: ComputeSettings | None = None,
+    term_types_to_eval=("chooser", "alternative"),
+):
+    """
+    Evaluate the chooser-only and alternative-only terms of an interaction spec
+
+    Terms are classified with classify_interaction_terms, and chooser-only terms are
+    evaluated once per chooser and alternative-only terms once per alternative.
+
+    Parameters
+    ----------
+    spec : pandas.DataFrame
+        one row per spec expression and one col with utility coefficient
+    choosers : pandas.DataFrame
+    alternatives : pandas.DataFrame
+    locals_d : dict or None
+    trace_label : str
+    compute_settings : ComputeSettings, optional
+    term_types_to_eval : tuple of str
+        only evaluate terms of these types, the utilities of the others stay zero
+
+    Returns
+    -------
+    chooser_utils : numpy.ndarray
+        summed chooser-only utilities, one per chooser
+    alt_utils : numpy.ndarray
+        summed alternative-only utilities, one per alternative
+    term_types : list of str
+        one of 'chooser', 'alternative' or 'interaction' for each row of spec
+    """
+    if compute_settings is None:
+        compute_settings = ComputeSettings()
+
+    # column names as they would appear in interaction_dataset
+    chooser_renames = {
+        c: c + "_chooser" for c in choosers.columns if c in alternatives.columns
+    }
+    choosers = choosers.rename(columns=chooser_renames)
+    alternative_columns = list(alternatives.columns) + [alternatives.index.name]
+
+    eval_locals_d = {**state.get_global_constants(), **(locals_d or {})}
+
+    term_types = classify_interaction_terms(
+        spec, choosers.columns, alternative_columns, eval_locals_d
+    )
+
+    if isinstance(spec.index, pd.MultiIndex):
+        exprs = spec.index.get_level_values(simulate.SPEC_EXPRESSION_NAME)
+    else:
+        exprs = spec.index
+
+    chooser_utils = np.zeros(len(choosers))
+    alt_utils = np.zeros(len(alternatives))
+
+    with compute_settings.pandas_option_context():
+        for expr, term_type, coefficient in zip(exprs, term_types, spec.iloc[:, 0]):
+            if term_type not in term_types_to_eval:
+                continue
+            df = choosers if term_type == "chooser" else alternatives
+            try:
+                if expr.startswith("@"):
+                    v = eval(expr[1:], globals(), {**eval_locals_d, "df": df})
+                else:
+                    v = fast_eval(df, expr, resolvers=[eval_locals_d])
+            except Exception as err:
+                logger.exception(
+                    f"{trace_label} - {type(err).__name__} ({str(err)}) evaluating: {str(expr)}"
+                )
+                raise err
+            utility = np.asarray(v * coefficient, dtype=np.float64)
+            if term_type == "chooser":
+                chooser_utils += utility
+            else:
+                alt_utils += utility
+
+    return chooser_utils, alt_utils, term_types
+
+
+def eval_interaction_utilities_broadcast(
+    state,
+    spec,
+    choosers,
+    alternatives,
+    locals_d,
+    trace_label,
+    skims=None,
+    zone_layer=None,
+    chunk_sizer=None,
+    compute_settings: ComputeSettings | None = None,
+):
+    """
+    Compute interaction utilities of every chooser for every alternative without
+    materializing the full cartesian product of choosers and alternatives
+
+    Chooser-only expressions are evaluated once per chooser, alternative-only expressions
+    once per alternative, and both are broadcast-added to the utilities. Only the true
+    interaction expressions (see classify_interaction_terms) are evaluated on an interaction
+    dataset, which is built with only the columns those expressions (and skims) reference,
+    and is not built at all if there are no such expressions.
+
+    The result matches eval_interaction_utilities on the full interaction dataset
+    (up to floating point summation order).
+
+    Parameters
+    ----------
+    spec : pandas.DataFrame
+        one row per spec expression and one col with utility coefficient
+    choosers : pandas.DataFrame
+    alternatives : pandas.DataFrame
+    locals_d : dict or None
+    trace_label : str
+    skims : SkimWrapper or Skim3dWrapper object, or a list or dict of skims
+    zone_layer : {'taz', 'maz'}, optional
+    chunk_sizer : ChunkSizer, optional
+    compute_settings : ComputeSettings, optional
+
+    Returns
+    -------
+    utilities : pandas.DataFrame
+        one utility column with len(choosers) * len(alternatives) rows, indexed
+        (non-uniquely) by the alternatives index tiled once per chooser
+    """
+    trace_label = tracing.extend_trace_label(trace_label, "eval_broadcast_utils")
+
+    if compute_settings is None:
+        compute_settings = ComputeSettings()
+
+    num_choosers = len(choosers)
+    num_alts = len(alternatives)
+
+    chooser_utils, alt_utils, term_types = eval_separable_utilities(
+        state,
+        spec,
+        choosers,
+        alternatives,
+        locals_d,
+        trace_label,
+        compute_settings=compute_settings,
+    )
+    interaction_rows = [i for i, t in enumerate(term_types) if t == "interaction"]
+
+    # column names as they would appear in interaction_dataset
+    choosers = choosers.rename(
+        columns={
+            c: c + "_chooser" for c in choosers.columns if c in alternatives.columns
+        }
+    )
+
+    if isinstance(spec.index, pd.MultiIndex):
+        exprs = spec.index.get_level_values(simulate.SPEC_EXPRESSION_NAME)
+    else:
+        exprs = spec.index
+
+    logger.info(
+        f"{trace_label}: factored {term_types.count('alternative')} alternative-only "
+        f"and {term_types.count('chooser')} chooser-only terms out of "
+        f"{len(term_types)} spec terms ({len(interaction_rows)} interaction terms)"
+    )
+
+    if interaction_rows:
+        interaction_spec = spec.iloc[interaction_rows]
+
+        # only carry the columns referenced by interaction terms and skims
+        referenced = set(
+            re.findall(_IDENTIFIER, " ".join(exprs[interaction_rows]))
+        ) | _skim_key_columns(skims, locals_d)
+        interaction_df = logit.interaction_dataset(
+            state,
+            choosers[[c for c in choosers.columns if c in referenced]],
+            alternatives[[c for c in alternatives.columns if c in referenced]],
+            sample_size=num_alts,
+        )
+        if chunk_sizer is not None:
+            chunk_sizer.log_df(trace_label, "interaction_df", interaction_df)
+
+        if skims is not None:
+            simulate.set_skim_wrapper_targets(interaction_df, skims)
+
+        utilities, _ = eval_interaction_utilities(
+            state,
+            interaction_spec,
+            interaction_df,
+            locals_d,
+            trace_label,
+            None,
+            zone_layer=zone_layer,
+            compute_settings=compute_settings,
+        )
+
+        del interaction_df
+        if chunk_sizer is not None:
+            chunk_sizer.log_df(trace_label, "interaction_df", None)
+    else:
+        utilities = pd.DataFrame(
+            {"utility": 0.0},
+            index=alternatives.index.take(np.tile(np.arange(num_alts), num_choosers)),
+        )
+
+    utilities.utility.values[:] += (
+        chooser_utils.reshape(-1, 1) + alt_utils.reshape(1, -1)
+    ).reshape(-1)
+
+    return utilities
+
+
 def _interaction_simulate(
     state: workflow.State,
     choosers: pd.DataFrame,
@@ -826,6 +1190,28 @@ def _interaction_simulate(
         interaction_utilities_sh = trace_eval_results_sh = None
 
     if (
+        not sharrow_enabled
+        and compute_settings.broadcast_interaction
+        and not have_trace_targets
+        and estimator is None
+        and not log_alt_losers
+        and sample_size == len(alternatives)
+    ):
+        # evaluate chooser-only and alternative-only terms without the cross join
+        interaction_utilities = eval_interaction_utilities_broadcast(
+            state,
+            spec,
+            choosers,
+            alternatives,
+            locals_d,
+            trace_label,
+            skims=skims,
+            chunk_sizer=chunk_sizer,
+            compute_settings=compute_settings,
+        )
+        chunk_sizer.log_df(trace_label, "interaction_utilities", interaction_utilities)
+
+    elif (
         not sharrow_enabled
         or (sharrow_enabled == "test")
         or interaction_utilities is None
@@ -1047,22 +1433,21 @@ def interaction_simulate(
 
     assert len(choosers) > 0
 
-    result_list = []
-    for (
-        i,
-        chooser_chunk,
-        chunk_trace_label,
-        chunk_sizer,
-    ) in chunk.adaptive_chunked_choosers(
-        state, choosers, trace_label, explicit_chunk_size=explicit_chunk_size
-    ):
-        choices = _interaction_simulate(
+    # estimation data bundles are written as chunks are run, so never run them in threads
+    num_threads = 1 if estimator else chunk.chunk_threads(state)
+
+    def simulate_chunk(chooser_chunk, chunk_trace_label, chunk_sizer):
+        if num_threads > 1:
+            chunk_skims, chunk_locals_d = simulate.copy_skim_wrappers(skims, locals_d)
+        else:
+            chunk_skims, chunk_locals_d = skims, locals_d
+        return _interaction_simulate(
             state,
             chooser_chunk,
             alternatives,
             spec,
-            skims=skims,
-            locals_d=locals_d,
+            skims=chunk_skims,
+            locals_d=chunk_locals_d,
             sample_size=sample_size,
             trace_label=chunk_trace_label,
             trace_choice_name=trace_choice_name,
@@ -1072,9 +1457,15 @@ def interaction_simulate(
             compute_settings=compute_settings,
         )
 
-        result_list.append(choices)
-
-        chunk_sizer.log_df(trace_label, "result_list", result_list)
+    result_list = chunk.threaded_chunked_choosers(
+        state,
+        choosers,
+        simulate_chunk,
+        trace_label,
+        explicit_chunk_size=explicit_chunk_size,
+        num_threads=num_threads,
+    )
+    choices = result_list[0]
 
     # FIXME: this will require 2X RAM
     # if necessary, could append to hdf5 store on disk:
@@ -7,6 +7,7 @@ import gc
 import glob
 import logging
 import multiprocessing
+import multiprocessing.synchronize
 import os
 import threading
 import time
@@ -302,6 +303,9 @@ def shared_memory_size(data_buffers):
 
             shared_size += Dataset.shm.preload_shared_memory_size(data_buffer[11:])
             continue
+        if isinstance(data_buffer, multiprocessing.synchronize.Barrier):
+            # synchronization primitives (e.g. shadow pricing barrier) hold no data
+            continue
         try:
             obj = data_buffer.get_obj()
         except Exception:
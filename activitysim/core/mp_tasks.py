@@ -197,8 +197,9 @@ incorporates a multiprocessing.Lock object to mediate access of the underlying d
 think that the existence of such a lock would make shared access pretty straightforward, but
 this is not the case as the level of locking is very low, reportedly not very performant, and
 essentially useless in any event since we want to use numpy.frombuffer to wrap and handle them
-as numpy arrays. The Lock is a convenient bundled locking primative, but shadow_pricing rolls
-its own semaphore system using the Lock.
+as numpy arrays. Instead, shadow_pricing gives each sub-process its own slot in the shared
+buffer (so writes need no locking) and synchronizes sub-processes with a multiprocessing.Barrier
+that is created for each multiprocess step and passed along with the shared data buffers.
 
 FIXME - The code below knows that it need to allocate skim and shadow price buffers by calling
 the appropriate methods in abm.tables.skims and abm.tables.shadow_pricing to allocate shared
@@ -768,7 +769,35 @@ def apportion_pipeline(state: workflow.State, sub_proc_names, step_info):
             # )
 
 
-def coalesce_pipelines(state: workflow.State, sub_proc_names, slice_info):
+def read_pipeline_table(state: workflow.State, pipeline_path, table_name, hdf5_key):
+    """
+    Read the checkpointed version of a single table from a sub_proc pipeline
+
+    Parameters
+    ----------
+    pipeline_path : Path
+    table_name : str
+    hdf5_key : str
+        pipeline hdf5_key for table (ignored for parquet pipelines)
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    if state.settings.checkpoint_format == "hdf":
+        with pd.HDFStore(str(pipeline_path), mode="r") as pipeline_store:
+            return pipeline_store[hdf5_key]
+    else:
+        return ParquetStore(pipeline_path, mode="r").get_dataframe(table_name)
+
+
+def coalesce_pipelines(
+    state: workflow.State,
+    sub_proc_names,
+    slice_info,
+    write_output_tables=False,
+    reduce_trip_matrices=False,
+):
     """
     Coalesce the data in the sub_processes apportioned pipelines back into a single pipeline
 
@@ -777,11 +806,25 @@ def coalesce_pipelines(state: workflow.State, sub_proc_names, slice_info):
     Sliced tables are concatenated to create a single omnibus table with data from all sub_procs
     but mirrored tables are the same across all sub_procs, so we can grab a copy from any pipeline.
 
+    Omnibus tables are assembled one table at a time, so that only the slices of a single
+    table (rather than of every table) are held in memory alongside the coalesced tables.
+
+    If write_output_tables is True (i.e. write_tables was run as part of this step with
+    partitioned output_tables) the output tables are also streamed directly from the
+    sub_proc pipelines into partitioned parquet datasets, one partition at a time.
+
+    If reduce_trip_matrices is True (i.e. write_trip_matrices was run as part of this
+    step) any partial trip matrices accumulated by the sub_procs are summed and written.
+
     Parameters
     ----------
     sub_proc_names : list[str]
     slice_info : dict
         slice_info from multiprocess_steps
+    write_output_tables : bool
+        write partitioned output tables from the sub_proc pipelines
+    reduce_trip_matrices : bool
+        reduce and write trip matrices accumulated by the sub_procs
 
     Returns
     -------
@@ -845,27 +888,19 @@ def coalesce_pipelines(state: workflow.State, sub_proc_names, slice_info):
     ]
     mirrored_tables = {t: tables[t] for t in mirrored_table_names}
     omnibus_keys = {t: k for t, k in hdf5_keys.items() if t not in mirrored_table_names}
+    # first process copies of omnibus tables are no longer needed
+    del tables
 
     debug(state, f"coalesce_pipelines to: {pipeline_file_name}")
     debug(state, f"mirrored_table_names: {mirrored_table_names}")
     debug(state, f"omnibus_keys: {omnibus_keys}")
 
-    # assemble lists of omnibus tables from all sub_processes
-    omnibus_tables = {table_name: [] for table_name in omnibus_keys}
-    for process_name in sub_proc_names:
-        pipeline_path = state.get_output_file_path(
+    sub_proc_pipeline_paths = {
+        process_name: state.get_output_file_path(
             pipeline_file_name, prefix=process_name
         )
-        logger.info(f"coalesce pipeline {pipeline_path}")
-
-        if state.settings.checkpoint_format == "hdf":
-            with pd.HDFStore(str(pipeline_path), mode="r") as pipeline_store:
-                for table_name, hdf5_key in omnibus_keys.items():
-                    omnibus_tables[table_name].append(pipeline_store[hdf5_key])
-        else:
-            pqstore = ParquetStore(pipeline_path, mode="r")
-            for table_name, hdf5_key in omnibus_keys.items():
-                omnibus_tables[table_name].append(pqstore.get_dataframe(table_name))
+        for process_name in sub_proc_names
+    }
 
     # open pipeline, preserving existing checkpoints (so resume_after will work for prior steps)
     state.checkpoint.restore(resume_after="_")
@@ -876,14 +911,42 @@ def coalesce_pipelines(state: workflow.State, sub_proc_names, slice_info):
         info(state, f"adding mirrored table {table_name} {df.shape}")
         state.add_table(table_name, df)
 
-    # - concatenate omnibus tables and add them to pipeline
-    for table_name in omnibus_tables:
-        df = pd.concat(omnibus_tables[table_name], sort=False)
+    # - concatenate omnibus tables from all sub_processes and add them to pipeline
+    for table_name, hdf5_key in omnibus_keys.items():
+        slices = []
+        for process_name, pipeline_path in sub_proc_pipeline_paths.items():
+            debug(state, f"coalesce {table_name} from pipeline {pipeline_path}")
+            slices.append(
+                read_pipeline_table(state, pipeline_path, table_name, hdf5_key)
+            )
+        df = pd.concat(slices, sort=False)
+        del slices
         info(state, f"adding omnibus table {table_name} {df.shape}")
         state.add_table(table_name, df)
 
     state.checkpoint.add(checkpoint_name)
 
+    # - stream output tables from sub_proc pipelines into partitioned datasets
+    if write_output_tables:
+        from activitysim.core.steps.output import write_partitioned_tables
+
+        def read_partitions(table_name):
+            if table_name in mirrored_tables:
+                yield "part-0", mirrored_tables[table_name]
+            elif table_name in omnibus_keys:
+                for process_name, pipeline_path in sub_proc_pipeline_paths.items():
+                    yield process_name, read_pipeline_table(
+                        state, pipeline_path, table_name, omnibus_keys[table_name]
+                    )
+
+        write_partitioned_tables(state, read_partitions)
+
+    # - sum trip matrices accumulated by the sub_procs
+    if reduce_trip_matrices:
+        from activitysim.abm.models import trip_matrices
+
+        trip_matrices.reduce_trip_matrices(state, sub_proc_names)
+
     state.checkpoint.close_store()
 
 
@@ -1192,7 +1255,13 @@ def mp_setup_skims(injectables, **kwargs):
         raise e
 
 
-def mp_coalesce_pipelines(injectables, sub_proc_names, slice_info):
+def mp_coalesce_pipelines(
+    injectables,
+    sub_proc_names,
+    slice_info,
+    write_output_tables=False,
+    reduce_trip_matrices=False,
+):
     """
     mp entry point for coalesce_pipeline
 
@@ -1204,12 +1273,22 @@ def mp_coalesce_pipelines(injectables, sub_proc_names, slice_info):
         names of the sub processes to apportion
     slice_info : dict
         slice_info from multiprocess_steps
+    write_output_tables : bool
+        write partitioned output tables from the sub_proc pipelines
+    reduce_trip_matrices : bool
+        reduce and write trip matrices accumulated by the sub_procs
     """
 
     state = setup_injectables_and_logging(injectables)
 
     try:
-        coalesce_pipelines(state, sub_proc_names, slice_info)
+        coalesce_pipelines(
+            state,
+            sub_proc_names,
+            slice_info,
+            write_output_tables=write_output_tables,
+            reduce_trip_matrices=reduce_trip_matrices,
+        )
     except Exception as e:
         exception(
             state,
@@ -1246,10 +1325,15 @@ def allocate_shared_skim_buffers(state: workflow.State):
     return skim_buffers
 
 
-def allocate_shared_shadow_pricing_buffers(state: workflow.State):
+def allocate_shared_shadow_pricing_buffers(state: workflow.State, num_processes=1):
     """
     This is called by the main process to allocate memory buffer to share with subprocs
 
+    Parameters
+    ----------
+    num_processes : int
+        max number of sub-processes in any step (each gets its own slot in the buffer)
+
     Returns
     -------
         multiprocessing.RawArray
@@ -1263,7 +1347,7 @@ def allocate_shared_shadow_pricing_buffers(state: workflow.State):
         from activitysim.abm.tables import shadow_pricing
 
         shadow_pricing_buffers = shadow_pricing.buffers_for_shadow_pricing(
-            shadow_pricing_info
+            shadow_pricing_info, num_processes
         )
     else:
         shadow_pricing_buffers = {}
@@ -1271,6 +1355,36 @@ def allocate_shared_shadow_pricing_buffers(state: workflow.State):
     return shadow_pricing_buffers
 
 
+def allocate_shared_shadow_pricing_barrier(
+    state: workflow.State, shared_data_buffers, num_processes
+):
+    """
+    This is called by the main process to create the barrier that the sub processes
+    of a multiprocess step use to synchronize shadow pricing iterations
+
+    Returns
+    -------
+        dict {SHADOW_PRICING_BARRIER: multiprocessing.Barrier} or empty dict
+    """
+
+    from activitysim.abm.tables import shadow_pricing
+
+    shadow_pricing_info = state.get_injectable("shadow_pricing_info", None)
+
+    if shadow_pricing_info is None or num_processes < 2:
+        return {}
+
+    block_names = [
+        shadow_pricing.block_name(k) for k in shadow_pricing_info["block_shapes"]
+    ]
+    if not any(k in shared_data_buffers for k in block_names):
+        return {}
+
+    return {
+        shadow_pricing.SHADOW_PRICING_BARRIER: multiprocessing.Barrier(num_processes)
+    }
+
+
 def allocate_shared_shadow_pricing_buffers_choice(state):
     """
     This is called by the main process to allocate memory buffer to share with subprocs
@@ -1402,6 +1516,9 @@ def run_sub_simulations(
         f"run_sub_simulations step {step_name} models resume_after {resume_after}",
     )
 
+    # each sub process gets a fixed slot (e.g. in shared shadow pricing buffers)
+    process_nums = {name: i for i, name in enumerate(process_names)}
+
     # if resuming and some processes completed successfully in previous run
     if previously_completed:
         assert resume_after is not None
@@ -1439,10 +1556,12 @@ def run_sub_simulations(
         q = multiprocessing.Queue()
         locutor = i == 0
 
+        process_injectables = dict(injectables, process_num=process_nums[process_name])
+
         args = OrderedDict(
             locutor=locutor,
             queue=q,
-            injectables=injectables,
+            injectables=process_injectables,
             step_info=step_info,
             resume_after=resume_after,
         )
@@ -1459,7 +1578,7 @@ def run_sub_simulations(
             args=(
                 locutor,
                 q,
-                injectables,
+                process_injectables,
                 step_info,
                 resume_after,
             ),
@@ -1658,7 +1777,13 @@ def run_multiprocess(state: workflow.State, injectables):
 
     # combine shared_skim_buffer and shared_shadow_pricing_buffer in shared_data_buffer
     t0 = tracing.print_elapsed_time()
-    shared_data_buffers.update(allocate_shared_shadow_pricing_buffers(state))
+    max_num_processes = max(
+        [step_info["num_processes"] for step_info in run_list["multiprocess_steps"]],
+        default=1,
+    )
+    shared_data_buffers.update(
+        allocate_shared_shadow_pricing_buffers(state, max_num_processes)
+    )
     t0 = tracing.print_elapsed_time("allocate shared shadow_pricing buffer", t0)
     state.trace_memory_info("allocate_shared_shadow_pricing_buffers.completed")
 
@@ -1734,10 +1859,17 @@ def run_multiprocess(state: workflow.State, injectables):
 
             previously_completed = find_breadcrumb("completed", default=[])
 
+            step_data_buffers = dict(
+                shared_data_buffers,
+                **allocate_shared_shadow_pricing_barrier(
+                    state, shared_data_buffers, num_processes
+                ),
+            )
+
             completed = run_sub_simulations(
                 state,
                 injectables,
-                shared_data_buffers,
+                step_data_buffers,
                 step_info,
                 sub_proc_names,
                 resume_after,
@@ -1755,12 +1887,23 @@ def run_multiprocess(state: workflow.State, injectables):
         # - mp_coalesce_pipelines
         if not skip_phase("coalesce") and num_processes > 1:
             start_time = time.time()
+            output_tables_settings = state.settings.output_tables
+            write_output_tables = (
+                "write_tables" in step_info["models"]
+                and output_tables_settings is not None
+                and output_tables_settings.partitioned
+            )
+            reduce_trip_matrices = "write_trip_matrices" in step_info["models"]
             run_sub_task(
                 state,
                 multiprocessing.Process(
                     target=mp_coalesce_pipelines,
                     name="%s_coalesce" % step_name,
                     args=(injectables, sub_proc_names, slice_info),
+                    kwargs={
+                        "write_output_tables": write_output_tables,
+                        "reduce_trip_matrices": reduce_trip_matrices,
+                    },
                 ),
             )
             state.run.log_runtime(
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import threading
 from builtins import object, range
 
 import numpy as np
@@ -20,6 +21,11 @@ logger = logging.getLogger(__name__)
 _MAX_SEED = 1 << 32
 _SEED_MASK = 0xFFFFFFFF
 
+# guards row_states bookkeeping when chunks of choosers are run concurrently in threads
+# (see chunk.threaded_chunked_choosers). Rows in concurrent chunks are disjoint, so this
+# only protects the pandas row_states frame, not the order in which rands are drawn.
+_ROW_STATES_LOCK = threading.RLock()
+
 # Used by callers of gumbel_choice_positions_for_df to mark padded or unavailable alternative slots in alt_nrs_df
 MASKED_ALT_ID = -999
 
@@ -195,7 +201,8 @@ class SimpleChannel(object):
         # assert no dupes
         assert len(df.index.unique()) == len(df.index)
 
-        df_row_states = self.row_states.loc[df.index]
+        with _ROW_STATES_LOCK:
+            df_row_states = self.row_states.loc[df.index]
 
         # https://numpy.org/doc/stable/reference/random/generator.html
         # np.random.default_rng()
@@ -209,6 +216,20 @@ class SimpleChannel(object):
 
             yield prng
 
+    def _advance_offsets(self, index, n):
+        """
+        Update offsets for rows we handled
+
+        Parameters
+        ----------
+        index : pandas.Index
+            index values of rows for which rands were consumed
+        n : int
+            number of rands consumed per row
+        """
+        with _ROW_STATES_LOCK:
+            self.row_states.loc[index, "offset"] += n
+
     def random_for_df(self, df, step_name, n=1):
         """
         Return n floating point random numbers in range [0, 1) for each row in df
@@ -247,7 +268,7 @@ class SimpleChannel(object):
 
         rands = np.asanyarray([prng.rand(n) for prng in generators])
         # update offset for rows we handled
-        self.row_states.loc[df.index, "offset"] += n
+        self._advance_offsets(df.index, n)
         return rands
 
     def random_for_df_stable_alt_positions(
@@ -296,7 +317,7 @@ class SimpleChannel(object):
         rands = np.asanyarray(
             [prng.rand(n_total_alts)[stable_alt_positions] for prng in generators]
         )
-        self.row_states.loc[df.index, "offset"] += n_total_alts
+        self._advance_offsets(df.index, n_total_alts)
         return rands
 
     def gumbel_for_df(self, df, step_name, n=1):
@@ -340,7 +361,7 @@ class SimpleChannel(object):
         rands = np.asanyarray([-np.log(-np.log(prng.rand(n))) for prng in generators])
 
         # update offset for rows we handled
-        self.row_states.loc[df.index, "offset"] += n
+        self._advance_offsets(df.index, n)
         return rands
 
     def gumbel_max_positions_for_df(
@@ -420,7 +441,7 @@ class SimpleChannel(object):
                 axis=1,
             )
 
-        self.row_states.loc[utilities.index, "offset"] += n_gumbels * sample_size
+        self._advance_offsets(utilities.index, n_gumbels * sample_size)
         return positions
 
     def gumbel_choice_positions_for_df(
@@ -519,7 +540,7 @@ class SimpleChannel(object):
                 )
                 positions[row_num] = active[np.argmax(gumbel)]
 
-        self.row_states.loc[utilities.index, "offset"] += n_rands
+        self._advance_offsets(utilities.index, n_rands)
         return positions
 
     def normal_for_df(self, df, step_name, mu, sigma, lognormal=False, size=None):
@@ -588,7 +609,7 @@ class SimpleChannel(object):
             consume_offsets = int(size)
         else:
             consume_offsets = 1
-        self.row_states.loc[df.index, "offset"] += consume_offsets
+        self._advance_offsets(df.index, consume_offsets)
 
         return rands
 
@@ -643,7 +664,7 @@ class SimpleChannel(object):
             if replace:
                 logger.warning("choice_for_df MULTI_CHOICE_FF with replace")
             # update offset for rows we handled
-            self.row_states.loc[df.index, "offset"] += size
+            self._advance_offsets(df.index, size)
 
         return sample
 
@@ -2,6 +2,7 @@
 # See full license in LICENSE.txt.
 from __future__ import annotations
 
+import copy
 import logging
 import time
 import warnings
@@ -1036,6 +1037,51 @@ def eval_variables(
 #     return utilities
 
 
+def copy_skim_wrappers(skims, locals_d=None):
+    """
+    Make shallow copies of skim wrappers, so each can be given its own target dataframe.
+
+    This allows chunks of choosers to be run concurrently in threads, with each chunk
+    setting its own skim wrapper targets while all of them share the same underlying
+    skim data.  Any references to the same skim wrappers in locals_d are replaced with
+    the copies, so that expressions see the wrappers for the current chunk.
+
+    Parameters
+    ----------
+    skims : SkimWrapper or Skim3dWrapper object, or a list or dict of skims
+    locals_d : dict, optional
+
+    Returns
+    -------
+    skims, locals_d
+        copies of the skims (in the same container type) and of locals_d
+    """
+
+    if skims is None:
+        return skims, locals_d
+
+    copies = {}
+
+    def _copy(skim):
+        if not hasattr(skim, "set_df"):
+            return skim
+        if id(skim) not in copies:
+            copies[id(skim)] = copy.copy(skim)
+        return copies[id(skim)]
+
+    if isinstance(skims, list):
+        skims = [_copy(skim) for skim in skims]
+    elif isinstance(skims, dict):
+        skims = {k: _copy(skim) for k, skim in skims.items()}
+    else:
+        skims = _copy(skims)
+
+    if locals_d is not None:
+        locals_d = {k: copies.get(id(v), v) for k, v in locals_d.items()}
+
+    return skims, locals_d
+
+
 def set_skim_wrapper_targets(df, skims, allow_partial_success: bool = True):
     """
     Add the dataframe to the SkimWrapper object so that it can be dereferenced
@@ -1860,23 +1906,21 @@ def simple_simulate(
 
     assert len(choosers) > 0
 
-    result_list = []
-    # segment by person type and pick the right spec for each person type
-    for (
-        _i,
-        chooser_chunk,
-        chunk_trace_label,
-        chunk_sizer,
-    ) in chunk.adaptive_chunked_choosers(
-        state, choosers, trace_label, explicit_chunk_size=explicit_chunk_size
-    ):
-        choices = _simple_simulate(
+    # estimation data bundles are written as chunks are run, so never run them in threads
+    num_threads = 1 if estimator else chunk.chunk_threads(state)
+
+    def simulate_chunk(chooser_chunk, chunk_trace_label, chunk_sizer):
+        if num_threads > 1:
+            chunk_skims, chunk_locals_d = copy_skim_wrappers(skims, locals_d)
+        else:
+            chunk_skims, chunk_locals_d = skims, locals_d
+        return _simple_simulate(
             state,
             chooser_chunk,
             spec,
             nest_spec,
-            skims=skims,
-            locals_d=locals_d,
+            skims=chunk_skims,
+            locals_d=chunk_locals_d,
             custom_chooser=custom_chooser,
             log_alt_losers=log_alt_losers,
             want_logsums=want_logsums,
@@ -1888,9 +1932,15 @@ def simple_simulate(
             compute_settings=compute_settings,
         )
 
-        result_list.append(choices)
-
-        chunk_sizer.log_df(trace_label, "result_list", result_list)
+    result_list = chunk.threaded_chunked_choosers(
+        state,
+        choosers,
+        simulate_chunk,
+        trace_label,
+        explicit_chunk_size=explicit_chunk_size,
+        num_threads=num_threads,
+    )
+    choices = result_list[0]
 
     if len(result_list) > 1:
         choices = pd.concat(result_list)
@@ -7,6 +7,7 @@ import sys
 import os
 import shutil
 from pathlib import Path
+from typing import Callable, Iterator
 
 import numpy as np
 import pandas as pd
@@ -367,6 +368,258 @@ def _coalesce_estimation_data_bundles(state):
     return
 
 
+def _output_tables_list(state: workflow.State) -> list[tuple[str, dict]]:
+    """
+    Resolve the output_tables settings into a list of tables to write.
+
+    Returns
+    -------
+    list[tuple[str, dict]]
+        The name of each table to write, paired with its decode_columns
+        instructions (empty if no decoding is to be applied).
+    """
+    output_tables_settings = state.settings.output_tables
+
+    action = output_tables_settings.action
+    tables = output_tables_settings.tables
+
+    registered_tables = state.registered_tables()
+    if action == "include":
+        # interpret empty or missing tables setting to mean include all registered tables
+        output_tables_list = tables if tables is not None else registered_tables
+    elif action == "skip":
+        output_tables_list = [t for t in registered_tables if t not in tables]
+    else:
+        raise ValueError(f"expected action '{action}' to be either 'include' or 'skip'")
+
+    result = []
+    for table_name in output_tables_list:
+        if isinstance(table_name, configuration.OutputTable):
+            table_decode_cols = table_name.decode_columns or {}
+            table_name = table_name.tablename
+        elif not isinstance(table_name, str):
+            table_decode_cols = table_name.get("decode_columns", {})
+            table_name = table_name["tablename"]
+        else:
+            table_decode_cols = {}
+        result.append((table_name, table_decode_cols))
+    return result
+
+
+def _sort_output_table(
+    state: workflow.State, table_name: str, dt: pa.Table, dt_index_name: str | None
+) -> pa.Table:
+    """Sort an output table consistent with well defined column names."""
+    traceable_table_indexes = state.tracing.traceable_table_indexes
+
+    if dt_index_name in traceable_table_indexes:
+        dt = dt.sort_by(dt_index_name)
+        logger.debug(f"write_tables sorting {table_name} on index {dt_index_name}")
+    else:
+        # find all registered columns we can use to sort this table
+        # (they are ordered appropriately in traceable_table_indexes)
+        sort_columns = [
+            (c, "ascending") for c in traceable_table_indexes if c in dt.columns
+        ]
+        if len(sort_columns) > 0:
+            dt = dt.sort_by(sort_columns)
+            logger.debug(f"write_tables sorting {table_name} on columns {sort_columns}")
+        elif dt_index_name is not None:
+            logger.debug(
+                f"write_tables sorting {table_name} on unrecognized index {dt_index_name}"
+            )
+            dt = dt.sort_by(dt_index_name)
+        else:
+            logger.debug(
+                f"write_tables sorting {table_name} on unrecognized index {dt_index_name}"
+            )
+            dt = dt.sort_by(dt_index_name)
+    return dt
+
+
+def _decode_output_table(
+    state: workflow.State,
+    table_name: str,
+    dt: pa.Table,
+    table_decode_cols: dict,
+    same_table_lookups: dict[str, pa.Table] | None = None,
+) -> pa.Table:
+    """
+    Apply decode_columns instructions to an output table.
+
+    Same-table lookups decode against `dt` itself, unless a lookup table
+    for the column is given in `same_table_lookups` (e.g. when `dt` is only
+    one partition of the table).
+    """
+    for colname, decode_instruction in table_decode_cols.items():
+        if "|" in decode_instruction:
+            decode_filter, decode_instruction = decode_instruction.split("|")
+            decode_filter = decode_filter.strip()
+            decode_instruction = decode_instruction.strip()
+        else:
+            decode_filter = None
+
+        if decode_instruction == "time_period":
+            map_col = list(state.network_settings.skim_time_periods.labels)
+            map_func, preserve_nulls = _apply_decode_filter(map_col, decode_filter)
+            revised_col = _decode_output_column(
+                dt.column(colname), map_func, preserve_nulls=preserve_nulls
+            )
+            dt = dt.drop([colname]).append_column(colname, pa.array(revised_col))
+            continue
+
+        if "." not in decode_instruction:
+            lookup_col = decode_instruction
+            source_table = table_name
+            parent_table = (same_table_lookups or {}).get(lookup_col, dt)
+        else:
+            source_table, lookup_col = decode_instruction.split(".")
+            parent_table = state.get_pyarrow(source_table)
+        try:
+            map_col = parent_table.column(f"_original_{lookup_col}")
+        except KeyError:
+            map_col = parent_table.column(lookup_col)
+        map_col = np.asarray(map_col)
+        map_func, preserve_nulls = _apply_decode_filter(map_col, decode_filter)
+        if colname in dt.column_names:
+            revised_col = _decode_output_column(
+                dt.column(colname), map_func, preserve_nulls=preserve_nulls
+            )
+            dt = dt.drop([colname]).append_column(colname, pa.array(revised_col))
+        # drop _original_x from table if it is duplicative
+        if source_table == table_name and f"_original_{lookup_col}" in dt.column_names:
+            dt = dt.drop([f"_original_{lookup_col}"])
+    return dt
+
+
+def _same_table_lookup_columns(table_decode_cols: dict) -> list[str]:
+    """Lookup columns of the decode_columns instructions that refer to the table itself."""
+    lookup_cols = []
+    for decode_instruction in table_decode_cols.values():
+        decode_instruction = decode_instruction.split("|")[-1].strip()
+        if decode_instruction != "time_period" and "." not in decode_instruction:
+            lookup_cols.append(decode_instruction)
+    return lookup_cols
+
+
+def _read_same_table_lookups(
+    table_name: str,
+    lookup_cols: list[str],
+    partitions: Iterator[tuple[str, pd.DataFrame]],
+) -> dict[str, pa.Table]:
+    """
+    Build the full-table lookups for decoding the partitions of a table.
+
+    Each partition only holds some of the rows of the table, so decoding a
+    partition against itself would look codes up by position within the
+    partition.  Instead, the (code, `_original_` value) pairs of all the
+    partitions are gathered into one lookup indexed by code.
+
+    Returns
+    -------
+    dict[str, pa.Table]
+        a single column `_original_{lookup_col}` table for each lookup column
+    """
+    codes = {col: [] for col in lookup_cols}
+    originals = {col: [] for col in lookup_cols}
+    num_partitions = 0
+    for _, df in partitions:
+        num_partitions += 1
+        for col in lookup_cols:
+            if f"_original_{col}" not in df.columns:
+                continue
+            values = df.index if df.index.name == col else df[col]
+            codes[col].append(np.asarray(values))
+            originals[col].append(df[f"_original_{col}"].to_numpy())
+        del df
+
+    same_table_lookups = {}
+    for col in lookup_cols:
+        if not codes[col]:
+            if num_partitions > 1:
+                raise ValueError(
+                    f"cannot decode {table_name}.{col} against its own partitions, "
+                    f"write {table_name} without partitioned or add an _original_{col} column"
+                )
+            continue
+        col_codes = np.concatenate(codes[col])
+        col_originals = np.concatenate(originals[col])
+        lookup = np.zeros(col_codes.max(initial=-1) + 1, dtype=col_originals.dtype)
+        lookup[col_codes] = col_originals
+        same_table_lookups[col] = pa.table({f"_original_{col}": lookup})
+    return same_table_lookups
+
+
+def write_partitioned_tables(
+    state: workflow.State,
+    read_partitions: Callable[[str], Iterator[tuple[str, pd.DataFrame]]],
+) -> None:
+    """
+    Write output tables as partitioned parquet datasets.
+
+    Each output table is written to a directory named like the file that
+    `write_tables` would otherwise create (e.g. `final_persons.parquet/`),
+    holding one parquet file per partition.  Partitions are requested from
+    `read_partitions` one at a time, and each is decoded, sorted and written
+    before the next one is read, so only a single partition of a single table
+    is ever held in memory.  When `sort` is enabled, rows are sorted within
+    each partition only.  Decode instructions that look up a table's own
+    columns read the partitions an extra time to gather just those columns,
+    so each partition is decoded against the full table.
+
+    Parameters
+    ----------
+    state : workflow.State
+    read_partitions : Callable
+        Called with a table name, it returns an iterator of (part_name, df)
+        tuples.  It should return an empty iterator for unknown tables.
+    """
+    output_tables_settings = state.settings.output_tables
+    prefix = output_tables_settings.prefix
+
+    for table_name, table_decode_cols in _output_tables_list(state):
+        if table_name == "checkpoints":
+            partitions = iter([("part-0", state.checkpoint.get_inventory())])
+        else:
+            partitions = read_partitions(table_name)
+
+        same_table_lookups = None
+        if state.settings.recode_pipeline_columns and table_name != "checkpoints":
+            lookup_cols = _same_table_lookup_columns(table_decode_cols)
+            if lookup_cols:
+                same_table_lookups = _read_same_table_lookups(
+                    table_name, lookup_cols, read_partitions(table_name)
+                )
+
+        dataset_path = None
+        for part_name, df in partitions:
+            if dataset_path is None:
+                dataset_path = Path(
+                    state.get_output_file_path(f"{prefix}{table_name}.parquet")
+                )
+                if dataset_path.is_file():
+                    dataset_path.unlink()
+                elif dataset_path.is_dir():
+                    shutil.rmtree(dataset_path)
+                dataset_path.mkdir(parents=True)
+
+            dt = pa.Table.from_pandas(df, preserve_index=True)
+            if output_tables_settings.sort:
+                dt = _sort_output_table(state, table_name, dt, df.index.name)
+            del df
+            if state.settings.recode_pipeline_columns:
+                dt = _decode_output_table(
+                    state, table_name, dt, table_decode_cols, same_table_lookups
+                )
+            parquet.write_table(dt, dataset_path.joinpath(f"{part_name}.parquet"))
+            del dt
+
+        if dataset_path is None:
+            logger.warning("Skipping '%s': Table not found." % table_name)
+        else:
+            logger.info(f"write_tables wrote partitioned {dataset_path}")
+
+
 @workflow.step
 def write_tables(state: workflow.State) -> None:
     """
@@ -420,6 +673,21 @@ def write_tables(state: workflow.State) -> None:
         tables:
            - households
 
+    To write tables to partitioned parquet datasets, use the partitioned setting.
+    When write_tables is one of the models of a multiprocess step with more than one
+    process, the subprocesses skip writing, and each table is instead streamed
+    from the subprocess pipelines when they are coalesced, one partition per
+    subprocess:
+
+    ::
+
+      output_tables:
+        file_type: parquet
+        partitioned: True
+        action: include
+        tables:
+           - households
+
     Parameters
     ----------
     output_dir: str
@@ -432,32 +700,30 @@ def write_tables(state: workflow.State) -> None:
         logger.info("No output_tables specified in settings file. Nothing to write.")
         return
 
-    action = output_tables_settings.action
-    tables = output_tables_settings.tables
     prefix = output_tables_settings.prefix
     h5_store = output_tables_settings.h5_store
     file_type = output_tables_settings.file_type
     sort = output_tables_settings.sort
 
     registered_tables = state.registered_tables()
-    if action == "include":
-        # interpret empty or missing tables setting to mean include all registered tables
-        output_tables_list = tables if tables is not None else registered_tables
-    elif action == "skip":
-        output_tables_list = [t for t in registered_tables if t not in tables]
-    else:
-        raise f"expected action '{action}' to be either 'include' or 'skip'"
 
-    for table_name in output_tables_list:
-        if isinstance(table_name, configuration.OutputTable):
-            table_decode_cols = table_name.decode_columns or {}
-            table_name = table_name.tablename
-        elif not isinstance(table_name, str):
-            table_decode_cols = table_name.get("decode_columns", {})
-            table_name = table_name["tablename"]
-        else:
-            table_decode_cols = {}
+    if output_tables_settings.partitioned:
+        if h5_store or file_type != "parquet":
+            raise ValueError("partitioned output_tables require file_type 'parquet'")
+        if state.get_injectable("num_processes", 1) > 1:
+            logger.info(
+                "write_tables deferring partitioned output to coalesce_pipelines"
+            )
+            return
+
+        def read_partitions(table_name):
+            if table_name in registered_tables:
+                yield "part-0", state.get_dataframe(table_name)
+
+        write_partitioned_tables(state, read_partitions)
+        return
 
+    for table_name, table_decode_cols in _output_tables_list(state):
         if table_name == "checkpoints":
             dt = pa.Table.from_pandas(
                 state.checkpoint.get_inventory(), preserve_index=True
@@ -474,85 +740,10 @@ def write_tables(state: workflow.State) -> None:
             dt_index_name = state.get_dataframe_index_name(table_name)
 
             if sort:
-                traceable_table_indexes = state.tracing.traceable_table_indexes
-
-                if dt_index_name in traceable_table_indexes:
-                    dt = dt.sort_by(dt_index_name)
-                    logger.debug(
-                        f"write_tables sorting {table_name} on index {dt_index_name}"
-                    )
-                else:
-                    # find all registered columns we can use to sort this table
-                    # (they are ordered appropriately in traceable_table_indexes)
-                    sort_columns = [
-                        (c, "ascending")
-                        for c in traceable_table_indexes
-                        if c in dt.columns
-                    ]
-                    if len(sort_columns) > 0:
-                        dt = dt.sort_by(sort_columns)
-                        logger.debug(
-                            f"write_tables sorting {table_name} on columns {sort_columns}"
-                        )
-                    elif dt_index_name is not None:
-                        logger.debug(
-                            f"write_tables sorting {table_name} on unrecognized index {dt_index_name}"
-                        )
-                        dt = dt.sort_by(dt_index_name)
-                    else:
-                        logger.debug(
-                            f"write_tables sorting {table_name} on unrecognized index {dt_index_name}"
-                        )
-                        dt = dt.sort_by(dt_index_name)
+                dt = _sort_output_table(state, table_name, dt, dt_index_name)
 
         if state.settings.recode_pipeline_columns:
-            for colname, decode_instruction in table_decode_cols.items():
-                if "|" in decode_instruction:
-                    decode_filter, decode_instruction = decode_instruction.split("|")
-                    decode_filter = decode_filter.strip()
-                    decode_instruction = decode_instruction.strip()
-                else:
-                    decode_filter = None
-
-                if decode_instruction == "time_period":
-                    map_col = list(state.network_settings.skim_time_periods.labels)
-                    map_func, preserve_nulls = _apply_decode_filter(
-                        map_col, decode_filter
-                    )
-                    revised_col = _decode_output_column(
-                        dt.column(colname), map_func, preserve_nulls=preserve_nulls
-                    )
-                    dt = dt.drop([colname]).append_column(
-                        colname, pa.array(revised_col)
-                    )
-                    continue
-
-                if "." not in decode_instruction:
-                    lookup_col = decode_instruction
-                    source_table = table_name
-                    parent_table = dt
-                else:
-                    source_table, lookup_col = decode_instruction.split(".")
-                    parent_table = state.get_pyarrow(source_table)
-                try:
-                    map_col = parent_table.column(f"_original_{lookup_col}")
-                except KeyError:
-                    map_col = parent_table.column(lookup_col)
-                map_col = np.asarray(map_col)
-                map_func, preserve_nulls = _apply_decode_filter(map_col, decode_filter)
-                if colname in dt.column_names:
-                    revised_col = _decode_output_column(
-                        dt.column(colname), map_func, preserve_nulls=preserve_nulls
-                    )
-                    dt = dt.drop([colname]).append_column(
-                        colname, pa.array(revised_col)
-                    )
-                # drop _original_x from table if it is duplicative
-                if (
-                    source_table == table_name
-                    and f"_original_{lookup_col}" in dt.column_names
-                ):
-                    dt = dt.drop([f"_original_{lookup_col}"])
+            dt = _decode_output_table(state, table_name, dt, table_decode_cols)
 
         if h5_store or file_type == "h5":
             file_path = state.get_output_file_path("%soutput_tables.h5" % prefix)
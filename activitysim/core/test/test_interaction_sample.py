@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import logging
 from types import SimpleNamespace
 
 import numpy as np
@@ -699,7 +700,9 @@ class _DummyRngUtilityBased:
         sample_size,
         stable_alt_positions=None,
         n_total_alts=None,
+        keep_mask=None,
     ):
+        assert keep_mask is None
         assert sample_size == self.rands_3d.shape[2]
         if stable_alt_positions is None:
             active_rands = self.rands_3d
@@ -1334,3 +1337,392 @@ def test_make_sample_choices_poisson_falls_back_to_most_likely_alternatives():
     empty_sample_probs = np.prod(1 - inclusion_probs, axis=1)
     assert (out["prob"] < 1.0).all()
     assert (empty_sample_probs > 0).all()
+
+
+def test_interaction_sample_broadcast_interaction(state):
+    # Broadcast evaluation of chooser-only and alternative-only terms yields the
+    # same sample as evaluating the spec on the full cross join. It is opt-in.
+    assert ComputeSettings().broadcast_interaction is False
+    rng = np.random.default_rng(3)
+    num_choosers = 200
+    num_alts = 30
+    choosers = pd.DataFrame(
+        {"chooser_attr": rng.random(num_choosers), "is_big": rng.random(num_choosers)},
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"alt_attr": rng.random(num_alts), "size": rng.random(num_alts) * 100},
+        index=pd.Index(range(num_alts), name="alt_id"),
+    )
+    spec = pd.DataFrame(
+        {"coefficient": [1.0, 1.0, 0.5]},
+        index=pd.Index(
+            ["chooser_attr * alt_attr", "@np.log1p(df['size'])", "is_big > 0.5"],
+            name="Expression",
+        ),
+    )
+
+    results = []
+    for broadcast in [False, True]:
+        state.init_state()
+        state.settings.use_explicit_error_terms = False
+        state.rng().set_base_seed(42)
+        state.rng().add_channel("person_id", choosers)
+        state.rng().begin_step("test_step")
+        results.append(
+            interaction_sample.interaction_sample(
+                state,
+                choosers,
+                alternatives,
+                spec,
+                sample_size=5,
+                alt_col_name="alt_id",
+                locals_d={"np": np},
+                compute_settings=ComputeSettings(broadcast_interaction=broadcast),
+            )
+        )
+
+    pd.testing.assert_frame_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("use_eet", [False, True])
+def test_interaction_sample_chooser_key(state, use_eet):
+    # Sharing probabilities between choosers with the same chooser_key yields the
+    # same sample as computing them for every chooser.
+    rng = np.random.default_rng(5)
+    num_choosers = 300
+    num_alts = 25
+    choosers = pd.DataFrame(
+        {
+            "home_zone": rng.integers(0, 6, num_choosers),
+            "segment": rng.integers(0, 2, num_choosers),
+        },
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"alt_attr": rng.random(num_alts), "size": rng.random(num_alts) * 100},
+        index=pd.Index(range(num_alts), name="alt_id"),
+    )
+    spec = pd.DataFrame(
+        {"coefficient": [-0.5, 1.0, 0.8]},
+        index=pd.Index(
+            [
+                "abs(home_zone - alt_id)",
+                "@np.log1p(df['size'])",
+                "segment * alt_attr",
+            ],
+            name="Expression",
+        ),
+    )
+
+    results = []
+    for chooser_key in [None, ["home_zone", "segment"]]:
+        state.init_state()
+        state.settings.use_explicit_error_terms = use_eet
+        state.rng().set_base_seed(42)
+        state.rng().add_channel("person_id", choosers)
+        state.rng().begin_step("test_step")
+        results.append(
+            interaction_sample.interaction_sample(
+                state,
+                choosers,
+                alternatives,
+                spec,
+                sample_size=5,
+                alt_col_name="alt_id",
+                locals_d={"np": np},
+                chooser_key=chooser_key,
+            )
+        )
+
+    pd.testing.assert_frame_equal(results[0], results[1])
+
+
+def test_interaction_sample_alias_sampling(state):
+    # Alias sampling draws with replacement from the same probabilities as
+    # inverse-CDF sampling, so the aggregate sampled shares must agree.
+    num_choosers = 50_000
+    num_alts = 100
+    sample_size = 10
+
+    rng = np.random.default_rng(42)
+    choosers = pd.DataFrame(
+        {"chooser_attr": rng.random(num_choosers)},
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"alt_attr": rng.random(num_alts)},
+        index=pd.Index(range(num_alts), name="alt_id"),
+    )
+    spec = pd.DataFrame(
+        {"coefficient": [3.0]},
+        index=pd.Index(["chooser_attr * alt_attr"], name="Expression"),
+    )
+
+    choices_cdf, shares_cdf = _shares_for_sample(
+        state,
+        choosers,
+        alternatives,
+        spec,
+        sample_size,
+        use_eet=False,
+        sample_method="inverse_cdf",
+        seed=42,
+        step_name="test_alias_cdf",
+    )
+    choices_alias, shares_alias = _shares_for_sample(
+        state,
+        choosers,
+        alternatives,
+        spec,
+        sample_size,
+        use_eet=False,
+        sample_method="alias",
+        seed=42,
+        step_name="test_alias_alias",
+    )
+
+    assert (choices_alias.groupby(level=0).pick_count.sum() == sample_size).all()
+    # prob column is the MNL probability of the sampled alternative
+    merged = choices_alias.reset_index().merge(
+        choices_cdf.reset_index(), on=["person_id", "alt_id"], suffixes=("", "_cdf")
+    )
+    np.testing.assert_allclose(merged.prob, merged.prob_cdf)
+
+    shares = pd.concat([shares_cdf, shares_alias], axis=1).fillna(0)
+    assert (shares.iloc[:, 0] - shares.iloc[:, 1]).abs().max() < 0.002
+
+
+def test_alias_sample_choices_maker():
+    from activitysim.core.choosing import alias_sample_choices_maker
+
+    probs = np.array(
+        [
+            [0.5, 0.0, 0.25, 0.25],
+            [0.0, 0.0, 1.0, 0.0],
+            [0.1, 0.2, 0.3, 0.4],
+        ]
+    )
+    rng = np.random.default_rng(0)
+    num_draws = 200_000
+    rands = rng.random((3, num_draws))
+
+    choices, choice_probs = alias_sample_choices_maker(
+        probs, rands, np.array([10, 11, 12, 13])
+    )
+    assert choices.shape == (num_draws, 3)
+    for row in range(3):
+        shares = np.bincount(choices[:, row] - 10, minlength=4) / num_draws
+        np.testing.assert_allclose(shares, probs[row], atol=0.005)
+        np.testing.assert_allclose(
+            choice_probs[:, row], probs[row][choices[:, row] - 10]
+        )
+    # zero probability alternatives are never drawn
+    assert not (choices[:, 0] == 11).any()
+    assert (choices[:, 1] == 12).all()
+
+    # choosers can share the table of a probability row, with string alternatives
+    choices, _ = alias_sample_choices_maker(
+        probs, rands[[2, 2]], np.array(list("abcd")), row_index=np.array([1, 2])
+    )
+    assert (choices[:, 0] == "c").all()
+    shares = pd.Series(choices[:, 1]).value_counts(normalize=True).sort_index()
+    np.testing.assert_allclose(shares.to_numpy(), probs[2], atol=0.005)
+
+
+def test_interaction_sample_alias_chooser_key(state):
+    # alias tables shared by choosers with the same key give the same sample
+    # as building one table per chooser
+    rng = np.random.default_rng(5)
+    num_choosers = 300
+    choosers = pd.DataFrame(
+        {"home_zone": rng.integers(0, 6, num_choosers)},
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"size": rng.random(20) * 100},
+        index=pd.Index(range(20), name="alt_id"),
+    )
+    spec = pd.DataFrame(
+        {"coefficient": [-0.5, 1.0]},
+        index=pd.Index(
+            ["abs(home_zone - alt_id)", "@np.log1p(df['size'])"], name="Expression"
+        ),
+    )
+
+    results = []
+    for chooser_key in [None, ["home_zone"]]:
+        state.init_state()
+        state.rng().set_base_seed(42)
+        state.rng().add_channel("person_id", choosers)
+        state.rng().begin_step("test_step")
+        results.append(
+            interaction_sample.interaction_sample(
+                state,
+                choosers,
+                alternatives,
+                spec,
+                sample_size=5,
+                alt_col_name="alt_id",
+                locals_d={"np": np},
+                compute_settings=ComputeSettings(sample_method="alias"),
+                chooser_key=chooser_key,
+            )
+        )
+
+    pd.testing.assert_frame_equal(results[0], results[1])
+
+
+@pytest.mark.parametrize("sample_method", ["eet", "poisson"])
+def test_interaction_sample_prune_threshold(state, sample_method, caplog):
+    # Alternatives are pruned on a bound from their alternative-only utilities,
+    # before the interaction terms are evaluated. Kept alternatives use the same
+    # random numbers, and the skipped probability mass is logged.
+    num_choosers = 500
+    num_alts = 200
+    sample_size = 10
+
+    rng = np.random.default_rng(42)
+    choosers = pd.DataFrame(
+        {"chooser_attr": rng.random(num_choosers)},
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"alt_attr": rng.random(num_alts), "size": rng.random(num_alts) * 12},
+        index=pd.Index(range(num_alts), name="alt_id"),
+    )
+    # the interaction term is within [0, 1] for every chooser and alternative
+    spec = pd.DataFrame(
+        {"coefficient": [1.0, 1.0]},
+        index=pd.Index(["chooser_attr * alt_attr", "size"], name="Expression"),
+    )
+
+    def run(**prune_settings):
+        state.init_state()
+        state.settings.use_explicit_error_terms = True
+        state.rng().set_base_seed(42)
+        state.rng().add_channel("person_id", choosers)
+        state.rng().begin_step("test_step")
+        return interaction_sample.interaction_sample(
+            state,
+            choosers,
+            alternatives,
+            spec,
+            sample_size=sample_size,
+            alt_col_name="alt_id",
+            compute_settings=ComputeSettings(
+                sample_method=sample_method, **prune_settings
+            ),
+        )
+
+    unpruned = run()
+    with caplog.at_level(logging.INFO):
+        pruned = run(sample_prune_threshold=1e-3, sample_prune_utility_range=1.0)
+    assert "skipping probability mass of at most" in caplog.text
+
+    # the bound on each alternative's sampling chance, from its size term
+    weights = np.exp(alternatives["size"] - alternatives["size"].max())
+    prob_bounds = np.minimum(1, weights * np.e / weights.sum())
+    kept = alternatives.index[1 - (1 - prob_bounds) ** sample_size >= 1e-3]
+    assert 0 < len(kept) < num_alts
+    assert pruned.alt_id.isin(kept).all()
+    assert not unpruned.alt_id.isin(kept).all()
+
+    # draws for the kept alternatives use the same random numbers, so samples
+    # only change where an unlikely alternative was drawn
+    pairs = pruned.set_index("alt_id", append=True).index
+    unpruned_pairs = unpruned.set_index("alt_id", append=True).index
+    assert pairs.isin(unpruned_pairs).mean() > 0.99
+
+    # without a utility range the interaction terms cannot be bounded
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        not_pruned = run(sample_prune_threshold=1e-3)
+    assert "not pruning alternatives" in caplog.text
+    pd.testing.assert_frame_equal(not_pruned, unpruned)
+
+
+def test_interaction_sample_chunked(state):
+    # chunk results are combined into the same sample as a single chunk
+    rng = np.random.default_rng(3)
+    choosers = pd.DataFrame(
+        {"home_zone": rng.integers(0, 6, 50)},
+        index=pd.Index(range(50), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"size": rng.random(20) * 100},
+        index=pd.Index(range(20), name="alt_id"),
+    )
+    spec = pd.DataFrame(
+        {"coefficient": [-0.5, 1.0]},
+        index=pd.Index(
+            ["abs(home_zone - alt_id)", "@np.log1p(df['size'])"], name="Expression"
+        ),
+    )
+
+    results = []
+    for explicit_chunk_size in [0, 7]:
+        state.init_state()
+        state.rng().set_base_seed(42)
+        state.rng().add_channel("person_id", choosers)
+        state.rng().begin_step("test_step")
+        results.append(
+            interaction_sample.interaction_sample(
+                state,
+                choosers,
+                alternatives,
+                spec,
+                sample_size=5,
+                alt_col_name="alt_id",
+                locals_d={"np": np},
+                explicit_chunk_size=explicit_chunk_size,
+            )
+        )
+
+    unchunked, chunked = results
+    assert chunked.index.nunique() == len(choosers)
+    assert chunked.dtypes["prob"] == np.float32
+    assert chunked.dtypes["pick_count"] == np.uint32
+    pd.testing.assert_frame_equal(chunked, unchunked)
+
+
+def test_join_sample_choosers():
+    persons = pd.DataFrame(
+        {"income": [10.0, 20.0, 30.0], "tag": ["a", "b", "c"]},
+        index=pd.Index([3, 1, 2], name="person_id"),
+    )
+    sample = pd.DataFrame(
+        {"dest": [4, 5, 4, 6, 7], "person_id": [1, 1, 2, 3, 1]},
+        index=pd.Index([20, 20, 21, 22, 23], name="tour_id"),
+    )
+
+    pd.testing.assert_frame_equal(
+        interaction_sample.join_sample_choosers(
+            sample, persons, chooser_id_col="person_id"
+        ),
+        pd.merge(sample, persons, left_on="person_id", right_index=True, how="left"),
+    )
+
+    by_person = sample.set_index("person_id")
+    pd.testing.assert_frame_equal(
+        interaction_sample.join_sample_choosers(by_person, persons),
+        by_person.join(persons, how="left"),
+    )
+
+    # overlapping columns get the merge suffixes
+    sample["income"] = 1.0
+    pd.testing.assert_frame_equal(
+        interaction_sample.join_sample_choosers(
+            sample, persons, chooser_id_col="person_id"
+        ),
+        pd.merge(sample, persons, left_on="person_id", right_index=True, how="left"),
+    )
+
+    # unmatched choosers get missing values, as with a left join
+    by_person = pd.concat(
+        [by_person, pd.DataFrame({"dest": [8]}, index=pd.Index([9], name="person_id"))]
+    )
+    pd.testing.assert_frame_equal(
+        interaction_sample.join_sample_choosers(by_person, persons),
+        by_person.join(persons, how="left"),
+    )
@@ -7,7 +7,8 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from activitysim.core import flow, interaction_simulate, workflow
+from activitysim.core import flow, interaction_simulate, logit, workflow
+from activitysim.core.configuration.base import ComputeSettings
 
 
 @pytest.fixture
@@ -277,3 +278,171 @@ def test_eval_interaction_utilities_locals_override_global_constants(tmp_path):
     )
 
     np.testing.assert_allclose(utilities.utility.to_numpy(), df.distance_km.to_numpy())
+
+
+def _broadcast_test_data():
+    rng = np.random.default_rng(7)
+    num_choosers = 50
+    num_alts = 6
+    choosers = pd.DataFrame(
+        {
+            "income": rng.random(num_choosers),
+            "area": rng.integers(1, 5, num_choosers),
+            "unused": rng.random(num_choosers),
+        },
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    alternatives = pd.DataFrame(
+        {"area": rng.random(num_alts) * 10, "density": rng.random(num_alts)},
+        index=pd.Index(range(100, 100 + num_alts), name="alt_id"),
+    )
+    spec = pd.DataFrame(
+        {"coefficient": [0.5, -1.0, 0.3, 2.0, 1.0, 0.7, -0.2]},
+        index=pd.Index(
+            [
+                "income",
+                "area_chooser > 2",
+                "area * 0.1 + (density > 0.5)",
+                "income * density",
+                "_d@df.density * 2",
+                "@_d * np.log1p(df.area_chooser)",
+                "SCALE",
+            ],
+            name="Expression",
+        ),
+    )
+    return choosers, alternatives, spec
+
+
+def test_classify_interaction_terms():
+    choosers, alternatives, spec = _broadcast_test_data()
+
+    term_types = interaction_simulate.classify_interaction_terms(
+        spec,
+        ["income", "area_chooser", "unused"],
+        ["area", "density", "alt_id"],
+        {"np": np, "SCALE": 3},
+    )
+
+    assert term_types == [
+        "chooser",
+        "chooser",
+        "alternative",
+        "interaction",
+        "interaction",
+        "interaction",
+        "alternative",
+    ]
+
+
+def test_classify_separable_at_expressions():
+    spec = pd.DataFrame(
+        {"coefficient": [1.0] * 6},
+        index=pd.Index(
+            [
+                "@np.log1p(df['density'])",
+                "@(df.area == 0) * SCALE",
+                "@df.income.clip(upper=MAX_INCOME)",
+                "@df.income * df.density",
+                "@skims['DIST']",
+                "@reindex(land_use.area, df.alt_id)",
+            ],
+            name="Expression",
+        ),
+    )
+    locals_d = {
+        "np": np,
+        "SCALE": 3,
+        "MAX_INCOME": 0.8,
+        "skims": object(),
+        "reindex": lambda s, idx: s,
+        "land_use": pd.DataFrame(),
+    }
+
+    term_types = interaction_simulate.classify_interaction_terms(
+        spec, ["income", "area_chooser"], ["area", "density", "alt_id"], locals_d
+    )
+
+    assert term_types == [
+        "alternative",
+        "alternative",
+        "chooser",
+        "interaction",
+        "interaction",
+        "interaction",
+    ]
+
+
+def test_eval_interaction_utilities_broadcast_matches_cross_join(state):
+    choosers, alternatives, spec = _broadcast_test_data()
+    locals_d = {"np": np, "SCALE": 3}
+
+    interaction_df = logit.interaction_dataset(
+        state, choosers, alternatives, sample_size=len(alternatives)
+    )
+    expected, _ = interaction_simulate.eval_interaction_utilities(
+        state, spec, interaction_df, locals_d, "test", None
+    )
+
+    utilities = interaction_simulate.eval_interaction_utilities_broadcast(
+        state, spec, choosers, alternatives, locals_d, "test"
+    )
+
+    assert utilities.index.equals(expected.index)
+    np.testing.assert_allclose(utilities.utility.values, expected.utility.values)
+
+    # without interaction terms the cross join is skipped entirely
+    separable_spec = spec.iloc[[0, 1, 2, 6]]
+    expected, _ = interaction_simulate.eval_interaction_utilities(
+        state, separable_spec, interaction_df, locals_d, "test", None
+    )
+    utilities = interaction_simulate.eval_interaction_utilities_broadcast(
+        state, separable_spec, choosers, alternatives, locals_d, "test"
+    )
+    assert utilities.index.equals(expected.index)
+    np.testing.assert_allclose(utilities.utility.values, expected.utility.values)
+
+    # '@' expressions that only transform alternative or chooser columns are factored out
+    at_spec = pd.DataFrame(
+        {"coefficient": [0.8, -0.4, 1.5]},
+        index=pd.Index(
+            [
+                "@np.log1p(df['density'])",
+                "@df.income.clip(upper=0.5)",
+                "@np.where(df.area_chooser > 2, df.density, 0)",
+            ],
+            name="Expression",
+        ),
+    )
+    expected, _ = interaction_simulate.eval_interaction_utilities(
+        state, at_spec, interaction_df, locals_d, "test", None
+    )
+    utilities = interaction_simulate.eval_interaction_utilities_broadcast(
+        state, at_spec, choosers, alternatives, locals_d, "test"
+    )
+    assert utilities.index.equals(expected.index)
+    np.testing.assert_allclose(utilities.utility.values, expected.utility.values)
+
+
+def test_interaction_simulate_broadcast_choices(state):
+    choosers, alternatives, spec = _broadcast_test_data()
+    locals_d = {"np": np, "SCALE": 3}
+
+    results = []
+    for broadcast in [False, True]:
+        state.init_state()
+        state.rng().set_base_seed(42)
+        state.rng().add_channel("person_id", choosers)
+        state.rng().begin_step("test_step")
+        results.append(
+            interaction_simulate.interaction_simulate(
+                state,
+                choosers,
+                alternatives,
+                spec,
+                locals_d=locals_d,
+                compute_settings=ComputeSettings(broadcast_interaction=broadcast),
+            )
+        )
+
+    pd.testing.assert_series_equal(results[0], results[1])
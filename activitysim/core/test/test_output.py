@@ -5,9 +5,12 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 import pandas.testing as pdt
+import pyarrow.parquet as parquet
 import pytest
 
+from activitysim.core import workflow
 from activitysim.core.steps._decode import _apply_decode_filter, _decode_output_column
+from activitysim.core.steps.output import write_partitioned_tables
 
 
 @pytest.fixture
@@ -81,3 +84,104 @@ def test_nullable_nonnegative_with_nulls_and_sentinels(zone_labels):
     assert result[2] == -1
     assert result[3] == 400
     assert pd.isna(result[4])
+
+
+def test_write_partitioned_tables(tmp_path):
+    """
+    Each partition is written as its own file within a parquet dataset
+    directory, and reading the dataset back gives the concatenated table.
+    """
+    tmp_path.joinpath("configs").mkdir()
+    tmp_path.joinpath("data").mkdir()
+    tmp_path.joinpath("output").mkdir()
+    state = workflow.State.make_default(
+        tmp_path,
+        settings={
+            "output_tables": {
+                "action": "include",
+                "file_type": "parquet",
+                "partitioned": True,
+                "tables": ["persons", "bogus"],
+            }
+        },
+    )
+
+    persons = pd.DataFrame(
+        {"age": [34, 8, 61, 17, 45]},
+        index=pd.Index([1, 2, 3, 4, 5], name="person_id"),
+    )
+    parts = {"proc_0": persons.iloc[:2], "proc_1": persons.iloc[2:]}
+    requested = []
+
+    def read_partitions(table_name):
+        requested.append(table_name)
+        if table_name == "persons":
+            yield from parts.items()
+
+    write_partitioned_tables(state, read_partitions)
+
+    assert requested == ["persons", "bogus"]
+    dataset_path = tmp_path.joinpath("output", "final_persons.parquet")
+    assert sorted(p.name for p in dataset_path.iterdir()) == [
+        "proc_0.parquet",
+        "proc_1.parquet",
+    ]
+    result = parquet.read_table(dataset_path).to_pandas().sort_index()
+    pdt.assert_frame_equal(result, persons)
+    assert not tmp_path.joinpath("output", "final_bogus.parquet").exists()
+
+
+def _make_output_state(tmp_path, settings):
+    for dirname in ["configs", "data", "output"]:
+        tmp_path.joinpath(dirname).mkdir()
+    return workflow.State.make_default(tmp_path, settings=settings)
+
+
+def test_write_partitioned_tables_same_table_decode(tmp_path):
+    """
+    Decoding a table against its own columns looks codes up in the full
+    table, not by position within each partition.
+    """
+    state = _make_output_state(
+        tmp_path,
+        {
+            "recode_pipeline_columns": True,
+            "output_tables": {
+                "action": "include",
+                "file_type": "parquet",
+                "partitioned": True,
+                "tables": [
+                    {"tablename": "zones", "decode_columns": {"zone_id": "zone_id"}}
+                ],
+            },
+        },
+    )
+
+    zones = pd.DataFrame(
+        {"_original_zone_id": [101, 102, 103, 104, 105]},
+        index=pd.Index([0, 1, 2, 3, 4], name="zone_id"),
+    )
+    parts = {"proc_0": zones.iloc[[3, 0]], "proc_1": zones.iloc[[4, 2, 1]]}
+
+    def read_partitions(table_name):
+        yield from parts.items()
+
+    write_partitioned_tables(state, read_partitions)
+
+    result = parquet.read_table(tmp_path.joinpath("output", "final_zones.parquet"))
+    assert sorted(result.column("zone_id").to_pylist()) == [101, 102, 103, 104, 105]
+    assert "_original_zone_id" not in result.column_names
+
+    # without the original ids there is nothing to decode the partitions against
+    parts = {k: v.drop(columns="_original_zone_id") for k, v in parts.items()}
+    with pytest.raises(ValueError, match="cannot decode zones.zone_id"):
+        write_partitioned_tables(state, read_partitions)
+
+
+def test_output_tables_unknown_action(tmp_path):
+    state = _make_output_state(
+        tmp_path, {"output_tables": {"action": "include", "tables": ["persons"]}}
+    )
+    state.settings.output_tables.action = "bogus"
+    with pytest.raises(ValueError, match="either 'include' or 'skip'"):
+        write_partitioned_tables(state, lambda table_name: iter([]))
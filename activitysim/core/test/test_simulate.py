@@ -130,6 +130,45 @@ def test_simple_simulate_chunked(state, data, spec):
     pdt.assert_series_equal(choices, expected, check_dtype=False)
 
 
+@pytest.mark.parametrize("chunk_training_mode", ["disabled", "explicit"])
+def test_simple_simulate_threaded_chunks(state, chunk_training_mode):
+    # choices from concurrent chunks should be identical to sequential chunks
+    num_choosers = 1_000
+
+    np.random.seed(42)
+    choosers = pd.DataFrame(
+        {"chooser_attr": np.random.rand(num_choosers)},
+        index=pd.Index(range(num_choosers), name="person_id"),
+    )
+    spec = pd.DataFrame(
+        {"alt0": [1.0], "alt1": [2.0], "alt2": [-1.0]},
+        index=pd.Index(["chooser_attr"], name="Expression"),
+    )
+
+    state.settings.check_for_variability = False
+    state.settings.chunk_training_mode = chunk_training_mode
+    state.rng().set_base_seed(42)
+    state.rng().add_channel("person_id", choosers)
+
+    def run_simple_simulate(chunk_threads):
+        state.settings.chunk_threads = chunk_threads
+        state.rng().begin_step("test_step_threaded")
+        choices = simulate.simple_simulate(
+            state,
+            choosers=choosers,
+            spec=spec,
+            nest_spec=None,
+            explicit_chunk_size=200,
+        )
+        state.rng().end_step("test_step_threaded")
+        return choices
+
+    sequential_choices = run_simple_simulate(1)
+    threaded_choices = run_simple_simulate(4)
+
+    pdt.assert_series_equal(threaded_choices, sequential_choices)
+
+
 def test_simple_simulate_prunes_unused_columns_while_tracing(state, monkeypatch):
     choosers = pd.DataFrame(
         {
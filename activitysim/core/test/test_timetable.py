@@ -53,13 +53,14 @@ def tdd_alts():
     return alts
 
 
-def test_basic(persons, tdd_alts):
+@pytest.mark.parametrize("timetable_class", [tt.TimeTable, tt.PackedTimeTable])
+def test_basic(persons, tdd_alts, timetable_class):
     state = workflow.State().default_settings()
 
     with chunk.chunk_log(state, "test_basic", base=True):
         person_windows = tt.create_timetable_windows(persons, tdd_alts)
 
-        timetable = tt.TimeTable(person_windows, tdd_alts, "person_windows")
+        timetable = timetable_class(person_windows, tdd_alts, "person_windows")
 
         # print "\ntdd_footprints_df\n", timetable.tdd_footprints_df
         #     0  1  2  3  4  5  6  7
@@ -217,3 +218,154 @@ def test_basic(persons, tdd_alts):
         pdt.assert_series_equal(
             periods_available, pd.Series([6, 3, 4, 3]), check_dtype=False
         )
+
+
+@pytest.mark.parametrize("num_periods", [19, 48])
+def test_packed_timetable(num_periods):
+    state = workflow.State().default_settings()
+    rng = np.random.default_rng(0)
+
+    start, end = np.triu_indices(num_periods)
+    tdd_alts = pd.DataFrame({"start": start + 5, "end": end + 5})
+    tdd_alts["duration"] = tdd_alts.end - tdd_alts.start
+
+    persons = pd.DataFrame(index=pd.Index(rng.permutation(500) + 100, name="person_id"))
+    person_windows = tt.create_timetable_windows(persons, tdd_alts)
+    timetable = tt.TimeTable(person_windows.copy(), tdd_alts).attach_state(state)
+    packed = tt.PackedTimeTable(person_windows.copy(), tdd_alts).attach_state(state)
+
+    assert packed.packed_windows.nbytes * 2 < person_windows.values.nbytes
+
+    # schedule a few rounds of tours that fit
+    for _ in range(4):
+        person_ids = pd.Series(persons.index)
+        tdds = pd.Series(rng.integers(0, len(tdd_alts), len(persons)))
+        available = timetable.tour_available(person_ids, tdds)
+        assert_array_equal(packed.tour_available(person_ids, tdds), available)
+        timetable.assign(person_ids[available], tdds[available])
+        packed.assign(person_ids[available], tdds[available])
+
+    assert_array_equal(packed.windows, timetable.windows)
+    pdt.assert_frame_equal(packed.get_windows_df(), timetable.get_windows_df())
+
+    person_ids = pd.Series(rng.choice(persons.index, 1000))
+    other_ids = pd.Series(rng.choice(persons.index, 1000))
+    periods = pd.Series(rng.integers(5, 5 + num_periods, 1000))
+    tdds = pd.Series(rng.integers(0, len(tdd_alts), 1000))
+
+    assert_array_equal(
+        packed.tour_available(person_ids, tdds),
+        timetable.tour_available(person_ids, tdds),
+    )
+    assert_array_equal(
+        packed.pairwise_available(person_ids, other_ids),
+        timetable.pairwise_available(person_ids, other_ids),
+    )
+    assert_array_equal(
+        packed.individually_available(person_ids),
+        timetable.individually_available(person_ids),
+    )
+    for before in [True, False]:
+        pdt.assert_series_equal(
+            packed.adjacent_window_run_length(person_ids, periods, before),
+            timetable.adjacent_window_run_length(person_ids, periods, before),
+        )
+    pdt.assert_series_equal(
+        packed.previous_tour_ends(person_ids, periods),
+        timetable.previous_tour_ends(person_ids, periods),
+    )
+    pdt.assert_series_equal(
+        packed.previous_tour_begins(person_ids, periods),
+        timetable.previous_tour_begins(person_ids, periods),
+    )
+    pdt.assert_series_equal(
+        packed.remaining_periods_available(
+            person_ids, tdd_alts.start[tdds], tdd_alts.end[tdds]
+        ),
+        timetable.remaining_periods_available(
+            person_ids, tdd_alts.start[tdds], tdd_alts.end[tdds]
+        ),
+    )
+    pdt.assert_series_equal(
+        packed.max_time_block_available(person_ids),
+        timetable.max_time_block_available(person_ids),
+    )
+
+    # transactions roll back to the windows at their start
+    tdds = pd.Series(rng.integers(0, len(tdd_alts), len(persons)))
+    packed.begin_transaction([])
+    packed.assign_subtour_mask(pd.Series(persons.index), tdds)
+    timetable.begin_transaction([])
+    timetable.assign_subtour_mask(pd.Series(persons.index), tdds)
+    assert_array_equal(packed.windows, timetable.windows)
+    packed.rollback()
+    timetable.rollback()
+    assert_array_equal(packed.windows, timetable.windows)
+
+
+@pytest.mark.parametrize("timetable_class", [tt.TimeTable, tt.PackedTimeTable])
+def test_available_tdds(timetable_class):
+    state = workflow.State().default_settings()
+    rng = np.random.default_rng(0)
+
+    num_periods = 19
+    start, end = np.triu_indices(num_periods)
+    tdd_alts = pd.DataFrame({"start": start + 5, "end": end + 5})
+    tdd_alts["duration"] = tdd_alts.end - tdd_alts.start
+
+    persons = pd.DataFrame(index=pd.Index(rng.permutation(200) + 100, name="person_id"))
+    person_windows = tt.create_timetable_windows(persons, tdd_alts)
+    timetable = timetable_class(person_windows, tdd_alts).attach_state(state)
+
+    def check_available_tdds():
+        person_ids = pd.Series(rng.choice(persons.index, 300))
+        positions, tdds = timetable.available_tdds(person_ids)
+
+        all_positions = np.repeat(np.arange(len(person_ids)), len(tdd_alts))
+        all_tdds = np.tile(np.arange(len(tdd_alts)), len(person_ids))
+        available = timetable.tour_available(person_ids.values[all_positions], all_tdds)
+
+        assert_array_equal(positions, all_positions[available])
+        assert_array_equal(tdds, all_tdds[available])
+
+    check_available_tdds()
+
+    # availability is updated as tours are scheduled
+    for _ in range(3):
+        person_ids = pd.Series(persons.index)
+        tdds = pd.Series(rng.integers(0, len(tdd_alts), len(persons)))
+        available = timetable.tour_available(person_ids, tdds)
+        timetable.assign(person_ids[available], tdds[available])
+        check_available_tdds()
+
+    footprints = timetable.tdd_footprints[rng.integers(0, len(tdd_alts), 50)]
+    timetable.assign_footprints(pd.Series(persons.index[:50]), footprints)
+    check_available_tdds()
+
+    timetable.begin_transaction([])
+    tdds = pd.Series(rng.integers(0, len(tdd_alts), len(persons)))
+    timetable.assign_subtour_mask(pd.Series(persons.index), tdds)
+    check_available_tdds()
+    timetable.rollback()
+    check_available_tdds()
+
+
+def test_tdd_footprints():
+    tdd_alts = pd.DataFrame({"start": [5, 5, 5, 6], "end": [5, 6, 7, 8]})
+    tdd_alts["duration"] = tdd_alts.end - tdd_alts.start
+
+    footprints = tt.tdd_footprints(tdd_alts, 4, 9)
+    assert_array_equal(
+        footprints,
+        [
+            [0, 6, 0, 0, 0, 0],
+            [0, 2, 4, 0, 0, 0],
+            [0, 2, 7, 4, 0, 0],
+            [0, 0, 2, 7, 4, 0],
+        ],
+    )
+
+    # footprints are shared by timetables over the same alts, and can't be changed
+    assert tt.tdd_footprints(tdd_alts.copy(), 4, 9) is footprints
+    assert not footprints.flags.writeable
+    assert tt.tdd_footprints(tdd_alts, 4, 10).shape == (4, 7)
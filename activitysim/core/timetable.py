@@ -2,6 +2,7 @@
 # See full license in LICENSE.txt.
 from __future__ import annotations
 
+import hashlib
 import logging
 from builtins import object, range
 
@@ -49,6 +50,63 @@ C_START = str(I_START)
 C_MIDDLE = str(I_MIDDLE)
 C_START_END = str(I_START_END)
 
+# tdd footprints by tdd_alts content and time period range, see tdd_footprints
+_TDD_FOOTPRINTS = {}
+
+
+def tdd_footprints(tdd_alts, min_period, max_period):
+    """
+    Window state footprints of tdd_alts over time periods min_period..max_period.
+
+    ::
+
+      tdd_alts         footprints
+      start  end      '0' '1' '2' '3' '4'...
+      5      5    ==>  0   6   0   0   0 ...
+      5      6    ==>  0   2   4   0   0 ...
+      5      7    ==>  0   2   7   4   0 ...
+
+    Footprints are memoized by the content of the tdd_alts start and duration
+    columns, so the many timetables built over the same alts (e.g. in each
+    subprocess, or for each set of joint tours) share one read-only array.
+
+    Parameters
+    ----------
+    tdd_alts : pandas.DataFrame
+        with start and duration columns
+    min_period, max_period : int
+
+    Returns
+    -------
+    numpy.ndarray of int, shape (len(tdd_alts), max_period - min_period + 1)
+    """
+    start = tdd_alts["start"].to_numpy().astype(np.int64)
+    duration = tdd_alts["duration"].to_numpy().astype(np.int64)
+
+    key = (
+        hashlib.sha1(start.tobytes() + duration.tobytes()).hexdigest(),
+        int(min_period),
+        int(max_period),
+    )
+    footprints = _TDD_FOOTPRINTS.get(key)
+    if footprints is None:
+        periods = np.arange(min_period, max_period + 1)[np.newaxis, :]
+        start = start[:, np.newaxis]
+        end = start + duration[:, np.newaxis]
+        footprints = np.select(
+            [
+                (periods == start) & (end == start),
+                periods == start,
+                periods == end,
+                (periods > start) & (periods < end),
+            ],
+            [I_START_END, I_START, I_END, I_MIDDLE],
+            default=I_EMPTY,
+        ).astype(int)
+        footprints.setflags(write=False)
+        _TDD_FOOTPRINTS[key] = footprints
+    return footprints
+
 
 @nb.njit
 def _fast_tour_available(
@@ -90,6 +148,56 @@ def _fast_tour_available(
     return out
 
 
+@nb.njit
+def _tdd_available_bits(tdd_footprints, windows, row_ixs):
+    """
+    tdd availability bitmap rows (bit t % 64 of word t // 64 is set if tdd alt t is
+    available) for windows rows row_ixs, with the same collision rules as
+    _fast_tour_available
+    """
+    num_tdds = tdd_footprints.shape[0]
+    bits = np.zeros((row_ixs.size, (num_tdds + 63) // 64), dtype=np.uint64)
+    for k in range(row_ixs.size):
+        windows_row = windows[row_ixs[k]]
+        for t in range(num_tdds):
+            x = tdd_footprints[t] + (windows_row << I_BIT_SHIFT)
+            collides = False
+            for i in range(x.size):
+                for j in range(COLLISION_ARRAY.size):
+                    if x[i] == COLLISION_ARRAY[j]:
+                        collides = True
+                        break
+                if collides:
+                    break
+            if not collides:
+                bits[k, t // 64] |= np.uint64(1) << np.uint64(t % 64)
+    return bits
+
+
+@nb.njit
+def _available_tdd_index(tdd_available, row_ixs):
+    """
+    positions in row_ixs and tdd alt ids of the available tdds of rows row_ixs of the
+    tdd_available bitmap, in row_ixs order and then tdd order
+    """
+    num_available = 0
+    for k in range(row_ixs.size):
+        for w in range(tdd_available.shape[1]):
+            num_available += np.int64(_popcount(tdd_available[row_ixs[k], w]))
+    positions = np.empty(num_available, dtype=np.int64)
+    tdds = np.empty(num_available, dtype=np.int64)
+    i = 0
+    for k in range(row_ixs.size):
+        for w in range(tdd_available.shape[1]):
+            word = tdd_available[row_ixs[k], w]
+            while word:
+                positions[i] = k
+                tdds[i] = w * 64 + _lowest_bit(word)
+                i += 1
+                word &= word - np.uint64(1)
+    return positions, tdds
+
+
 @nb.njit
 def _available_run_length(
     available,
@@ -238,15 +346,8 @@ def tour_map(persons, tours, tdd_alts, persons_id_col="person_id"):
     scheduled = np.zeros_like(agenda, dtype=int)
     row_ix_map = pd.Series(list(range(n_persons)), index=persons.index)
 
-    # construct with strings so we can create runs of strings using char * int
-    w_strings = [
-        "0" * (row.start - min_period)
-        + "1" * (row.duration + 1)
-        + "0" * (max_period - row.end)
-        for idx, row in tdd_alts.iterrows()
-    ]
-
-    window_periods = np.asanyarray([list(r) for r in w_strings]).astype(int)
+    # 1 in the periods of each tdd_alt
+    window_periods = (tdd_footprints(tdd_alts, min_period, max_period) != 0).astype(int)
     window_periods_df = pd.DataFrame(data=window_periods, index=tdd_alts.index)
 
     for keys, nth_tours in tours.groupby(["tour_type", "tour_type_num"], sort=True):
@@ -354,33 +455,30 @@ class TimeTable(object):
         from activitysim.core.fast_mapping import FastMapping
 
         self.window_row_ix = FastMapping(
-            pd.Series(list(range(len(windows_df.index))), index=windows_df.index)
+            pd.Series(np.arange(len(windows_df.index)), index=windows_df.index)
         )
 
         int_time_periods = [int(c) for c in windows_df.columns.values]
         self.time_ix = FastMapping(
-            pd.Series(list(range(len(windows_df.columns))), index=int_time_periods)
+            pd.Series(np.arange(len(windows_df.columns)), index=int_time_periods)
         )
 
         # - pre-compute window state footprints for every tdd_alt
         min_period = min(int_time_periods)
         max_period = max(int_time_periods)
-        # construct with strings so we can create runs of strings using char * int
-        w_strings = [
-            C_EMPTY * (row.start - min_period)
-            + (C_START + C_MIDDLE * (row.duration - 1) if row.duration > 0 else "")
-            + (C_END if row.duration > 0 else C_START_END)
-            + (C_EMPTY * (max_period - row.end))
-            for idx, row in tdd_alts_df.iterrows()
-        ]
 
         # we want range index so we can use raw numpy
-        assert (tdd_alts_df.index == list(range(tdd_alts_df.shape[0]))).all()
-        self.tdd_footprints = np.asanyarray([list(r) for r in w_strings]).astype(int)
+        assert (tdd_alts_df.index == np.arange(tdd_alts_df.shape[0])).all()
+        self.tdd_footprints = tdd_footprints(tdd_alts_df, min_period, max_period)
 
         # by default, do not attach state to this object.
         self.state = None
 
+        # bitmap of available tdd alts by window row, computed for rows as they are
+        # needed by available_tdds, and recomputed after rows are assigned to
+        self.tdd_available = None
+        self.tdd_available_valid = None
+
     def begin_transaction(self, transaction_loggers):
         """
         begin a transaction for an estimator or list of estimators
@@ -405,6 +503,7 @@ class TimeTable(object):
         self.windows = self.windows_df.values
         self.checkpoint_df = None
         self.transaction_loggers = None
+        self.invalidate_tdd_available()
 
     def export_for_numba(self):
         return dict(
@@ -542,6 +641,7 @@ class TimeTable(object):
         row_ixs = self.window_row_ix.apply_to(window_row_ids)
 
         self.windows[row_ixs] = np.bitwise_or(self.windows[row_ixs], tour_footprints)
+        self.invalidate_tdd_available(row_ixs)
 
     def assign_subtour_mask(self, window_row_ids, tdds):
         """
@@ -579,6 +679,7 @@ class TimeTable(object):
         row_ixs = self.window_row_ix.apply_to(window_row_ids)
 
         self.windows[row_ixs] = (tour_footprints == 0) * I_MIDDLE
+        self.invalidate_tdd_available()
 
     def assign_footprints(self, window_row_ids, footprints):
         """
@@ -607,6 +708,56 @@ class TimeTable(object):
         row_ixs = self.window_row_ix.apply_to(window_row_ids)
 
         self.windows[row_ixs] = np.bitwise_or(self.windows[row_ixs], footprints)
+        self.invalidate_tdd_available(row_ixs)
+
+    def invalidate_tdd_available(self, row_ixs=None):
+        """
+        Mark the tdd availability of window rows row_ixs (or of all rows if None) as out of
+        date, after their windows were changed.
+        """
+        if self.tdd_available_valid is not None:
+            if row_ixs is None:
+                self.tdd_available_valid[:] = False
+            else:
+                self.tdd_available_valid[np.asarray(row_ixs)] = False
+
+    def _tdd_available_bits(self, row_ixs):
+        return _tdd_available_bits(self.tdd_footprints, self.windows, row_ixs)
+
+    def available_tdds(self, window_row_ids):
+        """
+        Return the tdd alts available for each of window_row_ids, as a sparse index.
+
+        This gives the same pairs as calling tour_available on every window_row_id with
+        every tdd alt, in time proportional to the number of available alts. The tdd
+        availability of each window row is kept in a bitmap, computed when it is first
+        needed and again after tours are assigned to the row.
+
+        Parameters
+        ----------
+        window_row_ids : pandas Series or array of int
+
+        Returns
+        -------
+        positions : numpy array of int
+            positions in window_row_ids of each available (window_row_id, tdd) pair
+        tdds : numpy array of int
+            tdd alt ids of each available pair, ascending within each window_row_id
+        """
+        row_ixs = np.asarray(self.window_row_ix.apply_to(np.asarray(window_row_ids)))
+
+        if self.tdd_available is None:
+            num_rows = len(self.window_row_ix)
+            num_words = (self.tdd_footprints.shape[0] + 63) // 64
+            self.tdd_available = np.zeros((num_rows, num_words), dtype=np.uint64)
+            self.tdd_available_valid = np.zeros(num_rows, dtype=bool)
+
+        stale = np.unique(row_ixs[~self.tdd_available_valid[row_ixs]])
+        if stale.size:
+            self.tdd_available[stale] = self._tdd_available_bits(stale)
+            self.tdd_available_valid[stale] = True
+
+        return _available_tdd_index(self.tdd_available, row_ixs)
 
     def pairwise_available(self, window1_row_ids, window2_row_ids):
         available1 = (self.slice_windows_by_row_id(window1_row_ids) != I_MIDDLE) * 1
@@ -817,6 +968,486 @@ class TimeTable(object):
         return result
 
 
+# packed time_window states
+# each window state code fits in I_BIT_SHIFT bits, and the bits of the codes are such
+# that the bitwise_or of codes assigns tours, so we pack the window states of
+# PACKED_PERIODS_PER_WORD consecutive periods into each uint64 word, and compute
+# collisions, availability and run lengths with bitwise operations on whole words
+PACKED_PERIODS_PER_WORD = 64 // I_BIT_SHIFT
+
+_U0 = np.uint64(0)
+_U1 = np.uint64(1)
+_U2 = np.uint64(2)
+_PACKED_STATE_MASK = np.uint64((1 << I_BIT_SHIFT) - 1)
+
+
+@nb.njit
+def _popcount(x):
+    x = x - ((x >> _U1) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + (
+        (x >> _U2) & np.uint64(0x3333333333333333)
+    )
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+@nb.njit
+def _lowest_bit(x):
+    # index of lowest set bit of non-zero x
+    return np.int64(_popcount((x & (~x + _U1)) - _U1))
+
+
+@nb.njit
+def _highest_bit(x):
+    # index of highest set bit of non-zero x
+    for shift in (1, 2, 4, 8, 16, 32):
+        x |= x >> np.uint64(shift)
+    return np.int64(_popcount(x)) - 1
+
+
+@nb.njit
+def _packed_period_bits(num_periods):
+    """
+    for each word, the lowest bit of the fields of its periods
+    """
+    num_words = (num_periods + PACKED_PERIODS_PER_WORD - 1) // PACKED_PERIODS_PER_WORD
+    period_bits = np.zeros(num_words, dtype=np.uint64)
+    for j in range(num_periods):
+        period_bits[j // PACKED_PERIODS_PER_WORD] |= _U1 << np.uint64(
+            I_BIT_SHIFT * (j % PACKED_PERIODS_PER_WORD)
+        )
+    return period_bits
+
+
+@nb.njit
+def _pack_windows(windows):
+    num_rows, num_periods = windows.shape
+    num_words = (num_periods + PACKED_PERIODS_PER_WORD - 1) // PACKED_PERIODS_PER_WORD
+    packed = np.zeros((num_rows, num_words), dtype=np.uint64)
+    for i in range(num_rows):
+        for j in range(num_periods):
+            packed[i, j // PACKED_PERIODS_PER_WORD] |= np.uint64(
+                windows[i, j]
+            ) << np.uint64(I_BIT_SHIFT * (j % PACKED_PERIODS_PER_WORD))
+    return packed
+
+
+@nb.njit
+def _unpack_windows(packed, row_ixs, num_periods):
+    windows = np.empty((row_ixs.size, num_periods), dtype=np.int8)
+    for i in range(row_ixs.size):
+        for j in range(num_periods):
+            windows[i, j] = (
+                packed[row_ixs[i], j // PACKED_PERIODS_PER_WORD]
+                >> np.uint64(I_BIT_SHIFT * (j % PACKED_PERIODS_PER_WORD))
+            ) & _PACKED_STATE_MASK
+    return windows
+
+
+@nb.njit
+def _packed_collisions(footprint, window, period_bits):
+    """
+    bits (at the lowest bit of period fields) of periods where a footprint word
+    collides with a window word, as listed in COLLISIONS
+    """
+    f_middle = footprint & period_bits
+    f_start = (footprint >> _U1) & period_bits
+    f_end = (footprint >> _U2) & period_bits
+    w_middle = window & period_bits
+    w_start = (window >> _U1) & period_bits
+    w_end = (window >> _U2) & period_bits
+    return (
+        (f_middle & (w_start | w_end))
+        | (w_middle & (f_start | f_end))
+        | (f_start & ~f_end & w_start & ~w_end)
+        | (f_end & ~f_start & w_end & ~w_start)
+    )
+
+
+@nb.njit
+def _packed_tour_available(
+    tdds,
+    packed_footprints,
+    window_row_ids,
+    window_row_ix__mapper,
+    packed_windows,
+    period_bits,
+):
+    out = np.ones_like(tdds, dtype=np.bool_)
+    for k in range(tdds.shape[0]):
+        row_ix = window_row_ix__mapper[window_row_ids[k]]
+        for w in range(period_bits.size):
+            if _packed_collisions(
+                packed_footprints[tdds[k], w], packed_windows[row_ix, w], period_bits[w]
+            ):
+                out[k] = False
+                break
+    return out
+
+
+@nb.njit
+def _packed_tdd_available_bits(packed_footprints, packed_windows, row_ixs, period_bits):
+    num_tdds = packed_footprints.shape[0]
+    bits = np.zeros((row_ixs.size, (num_tdds + 63) // 64), dtype=np.uint64)
+    for k in range(row_ixs.size):
+        for t in range(num_tdds):
+            collides = False
+            for w in range(period_bits.size):
+                if _packed_collisions(
+                    packed_footprints[t, w],
+                    packed_windows[row_ixs[k], w],
+                    period_bits[w],
+                ):
+                    collides = True
+                    break
+            if not collides:
+                bits[k, t // 64] |= _U1 << np.uint64(t % 64)
+    return bits
+
+
+@nb.njit
+def _packed_available(packed_windows, row_ixs1, row_ixs2, num_periods, period_bits):
+    """
+    1 where periods are not I_MIDDLE in rows row_ixs1 (and row_ixs2, unless empty)
+    """
+    available = np.zeros((row_ixs1.size, num_periods), dtype=np.int64)
+    for i in range(row_ixs1.size):
+        for w in range(period_bits.size):
+            middle = packed_windows[row_ixs1[i], w]
+            if row_ixs2.size:
+                middle |= packed_windows[row_ixs2[i], w]
+            free = ~middle & period_bits[w]
+            while free:
+                bit = _lowest_bit(free)
+                available[i, w * PACKED_PERIODS_PER_WORD + bit // I_BIT_SHIFT] = 1
+                free &= free - _U1
+    return available
+
+
+@nb.njit
+def _packed_available_run_length(
+    packed_windows,
+    window_row_mapper,
+    time_ix_mapper,
+    before,
+    window_row_id_values,
+    periods,
+    num_periods,
+    period_bits,
+):
+    """
+    same as _available_run_length_2, with the first unavailable period before or after
+    each period found by bit scans of the packed I_MIDDLE bits
+    """
+    num_rows = window_row_id_values.shape[0]
+    num_words = period_bits.size
+    available_run_length = np.zeros(num_rows, dtype=np.int32)
+
+    # the padding periods at both ends of the day are unavailable
+    padding = np.zeros(num_words, dtype=np.uint64)
+    padding[0] |= _U1
+    last = num_periods - 1
+    padding[last // PACKED_PERIODS_PER_WORD] |= _U1 << np.uint64(
+        I_BIT_SHIFT * (last % PACKED_PERIODS_PER_WORD)
+    )
+
+    for row in range(num_rows):
+        row_ix = window_row_mapper[window_row_id_values[row]]
+        _time_col_ix = time_ix_mapper[periods[row]]
+        time_word = _time_col_ix // PACKED_PERIODS_PER_WORD
+        time_bit = np.uint64(I_BIT_SHIFT * (_time_col_ix % PACKED_PERIODS_PER_WORD))
+
+        if before:
+            first_unavailable = 0
+            for w in range(min(time_word, num_words - 1), -1, -1):
+                unavailable = (packed_windows[row_ix, w] | padding[w]) & period_bits[w]
+                if w == time_word:
+                    unavailable &= (_U1 << time_bit) - _U1
+                if unavailable:
+                    first_unavailable = w * PACKED_PERIODS_PER_WORD + (
+                        _highest_bit(unavailable) // I_BIT_SHIFT
+                    )
+                    break
+            available_run_length[row] = _time_col_ix - first_unavailable - 1
+        else:
+            first_unavailable = num_periods
+            for w in range(max(time_word, 0), num_words):
+                unavailable = (packed_windows[row_ix, w] | padding[w]) & period_bits[w]
+                if w == time_word:
+                    unavailable &= ~((_U1 << (time_bit + _U1)) - _U1)
+                if unavailable:
+                    first_unavailable = w * PACKED_PERIODS_PER_WORD + (
+                        _lowest_bit(unavailable) // I_BIT_SHIFT
+                    )
+                    break
+            available_run_length[row] = first_unavailable - _time_col_ix - 1
+    return available_run_length
+
+
+@nb.njit
+def _packed_remaining_periods_available(
+    packed_windows,
+    windows_row_mapper,
+    window_row_ids,
+    starts,
+    ends,
+    num_periods,
+    period_bits,
+):
+    result = np.empty(window_row_ids.shape, dtype=np.int64)
+    for i in range(window_row_ids.shape[0]):
+        row_ix = windows_row_mapper[window_row_ids[i]]
+        middles = 0
+        for w in range(period_bits.size):
+            middles += np.int64(_popcount(packed_windows[row_ix, w] & period_bits[w]))
+        # don't count time window padding at both ends of day
+        available = num_periods - middles - 2
+        this_block = ends[i] - starts[i] - 1
+        if this_block > 0:
+            available -= this_block
+        result[i] = available
+    return result
+
+
+@nb.njit
+def _packed_max_time_blocks_available(
+    tt_window_row_ix, packed_windows, window_row_ids, num_periods, period_bits
+):
+    max_blocks = np.zeros(window_row_ids.size, dtype=np.uint8)
+    for k in range(window_row_ids.size):
+        row_ix = tt_window_row_ix[window_row_ids[k]]
+        max_block_avail = 0
+        current_block = 0
+        for w in range(period_bits.size):
+            middle = packed_windows[row_ix, w] & period_bits[w]
+            for b in range(PACKED_PERIODS_PER_WORD):
+                j = w * PACKED_PERIODS_PER_WORD + b
+                if j < 1:
+                    continue
+                if j >= num_periods - 1:
+                    break
+                if middle & (_U1 << np.uint64(I_BIT_SHIFT * b)):
+                    current_block = 0
+                else:
+                    current_block += 1
+                    if current_block > max_block_avail:
+                        max_block_avail = current_block
+        max_blocks[k] = max_block_avail
+    return max_blocks
+
+
+@nb.njit
+def _packed_window_period_states(
+    packed_windows, windows_row_mapper, windows_col_mapper, window_row_ids, periods
+):
+    states = np.empty(window_row_ids.shape, dtype=np.int8)
+    for i in range(window_row_ids.shape[0]):
+        col_ix = windows_col_mapper[periods[i]]
+        states[i] = (
+            packed_windows[
+                windows_row_mapper[window_row_ids[i]], col_ix // PACKED_PERIODS_PER_WORD
+            ]
+            >> np.uint64(I_BIT_SHIFT * (col_ix % PACKED_PERIODS_PER_WORD))
+        ) & _PACKED_STATE_MASK
+    return states
+
+
+class PackedTimeTable(TimeTable):
+    """
+    TimeTable that keeps its windows packed into uint64 words, with the window state
+    codes of PACKED_PERIODS_PER_WORD periods in each word, rather than as one int8 per
+    period.
+
+    This takes less than half the memory of the int8 windows (for a day of up to 21
+    periods, one word per row instead of 21 bytes), and tour availability, assignment,
+    pairwise availability and run lengths are computed with bitwise operations on
+    whole words. The results are the same as those of TimeTable.
+
+    ``windows`` and ``get_windows_df`` unpack the windows (and assigning to ``windows``
+    packs them), so writing to the array returned by ``windows`` does not update the
+    timetable, and sharrow (which uses ``export_for_numba``) works on an unpacked copy.
+    """
+
+    def __init__(self, windows_df, tdd_alts_df, table_name=None):
+        self.num_periods = windows_df.shape[1]
+        self.period_bits = _packed_period_bits(self.num_periods)
+
+        super().__init__(windows_df, tdd_alts_df, table_name)
+
+        self.windows_index = windows_df.index
+        self.windows_columns = windows_df.columns
+        self.windows_df = None
+
+        self.packed_footprints = _pack_windows(self.tdd_footprints)
+        self.packed_subtour_masks = _pack_windows((self.tdd_footprints == 0) * I_MIDDLE)
+
+    @property
+    def windows(self):
+        return _unpack_windows(
+            self.packed_windows,
+            np.arange(self.packed_windows.shape[0]),
+            self.num_periods,
+        )
+
+    @windows.setter
+    def windows(self, windows):
+        self.packed_windows = _pack_windows(np.asarray(windows))
+
+    def begin_transaction(self, transaction_loggers):
+        if not isinstance(transaction_loggers, list):
+            transaction_loggers = [transaction_loggers]
+        for transaction_logger in transaction_loggers:
+            transaction_logger.log(
+                "timetable.begin_transaction %s" % self.windows_table_name
+            )
+        self.checkpoint_df = self.packed_windows.copy()
+        self.transaction_loggers = transaction_loggers
+
+    def rollback(self):
+        assert self.checkpoint_df is not None
+        for logger in self.transaction_loggers:
+            logger.log("timetable.rollback %s" % self.windows_table_name)
+        self.packed_windows = self.checkpoint_df
+        self.checkpoint_df = None
+        self.transaction_loggers = None
+        self.invalidate_tdd_available()
+
+    def slice_windows_by_row_id(self, window_row_ids):
+        row_ixs = self.window_row_ix.apply_to(np.asarray(window_row_ids))
+        return _unpack_windows(self.packed_windows, row_ixs, self.num_periods)
+
+    def slice_windows_by_row_id_and_period(self, window_row_ids, periods):
+        return _packed_window_period_states(
+            self.packed_windows,
+            self.window_row_ix._mapper,
+            self.time_ix._mapper,
+            np.asarray(window_row_ids),
+            np.asarray(periods),
+        )
+
+    def get_windows_df(self):
+        return pd.DataFrame(
+            self.windows, index=self.windows_index, columns=self.windows_columns
+        )
+
+    def tour_available(self, window_row_ids, tdds):
+        tdds = np.asarray(tdds).astype(np.int32)
+        window_row_ids = np.asarray(window_row_ids).astype(np.int64)
+
+        return _packed_tour_available(
+            tdds,
+            self.packed_footprints,
+            window_row_ids,
+            self.window_row_ix._mapper,
+            self.packed_windows,
+            self.period_bits,
+        )
+
+    def assign(self, window_row_ids, tdds):
+        assert len(window_row_ids) == len(tdds)
+
+        # vectorization doesn't work duplicates
+        assert len(window_row_ids.index) == len(np.unique(window_row_ids.values))
+
+        row_ixs = self.window_row_ix.apply_to(window_row_ids)
+
+        self.packed_windows[row_ixs] |= self.packed_footprints[tdds.values.astype(int)]
+        self.invalidate_tdd_available(row_ixs)
+
+    def assign_subtour_mask(self, window_row_ids, tdds):
+        # expect window_row_ids for every row
+        assert len(window_row_ids) == len(self.window_row_ix)
+
+        assert len(window_row_ids) == len(tdds)
+
+        row_ixs = self.window_row_ix.apply_to(window_row_ids)
+
+        self.packed_windows.fill(0)
+        self.packed_windows[row_ixs] = self.packed_subtour_masks[
+            tdds.values.astype(int)
+        ]
+        self.invalidate_tdd_available()
+
+    def assign_footprints(self, window_row_ids, footprints):
+        assert len(window_row_ids) == footprints.shape[0]
+
+        # require same number of periods in footprints
+        assert self.num_periods == footprints.shape[1]
+
+        # vectorization doesn't work with duplicate row_ids
+        assert len(window_row_ids.values) == len(np.unique(window_row_ids.values))
+
+        row_ixs = self.window_row_ix.apply_to(window_row_ids)
+
+        self.packed_windows[row_ixs] |= _pack_windows(footprints)
+        self.invalidate_tdd_available(row_ixs)
+
+    def _tdd_available_bits(self, row_ixs):
+        return _packed_tdd_available_bits(
+            self.packed_footprints, self.packed_windows, row_ixs, self.period_bits
+        )
+
+    def pairwise_available(self, window1_row_ids, window2_row_ids):
+        return _packed_available(
+            self.packed_windows,
+            self.window_row_ix.apply_to(np.asarray(window1_row_ids)),
+            self.window_row_ix.apply_to(np.asarray(window2_row_ids)),
+            self.num_periods,
+            self.period_bits,
+        )
+
+    def individually_available(self, window_row_ids):
+        return _packed_available(
+            self.packed_windows,
+            self.window_row_ix.apply_to(np.asarray(window_row_ids)),
+            np.empty(0, dtype=np.int64),
+            self.num_periods,
+            self.period_bits,
+        )
+
+    def adjacent_window_run_length(self, window_row_ids, periods, before):
+        assert len(window_row_ids) == len(periods)
+
+        available_run_length = _packed_available_run_length(
+            self.packed_windows,
+            self.window_row_ix._mapper,
+            self.time_ix._mapper,
+            before,
+            window_row_ids.values,
+            periods.to_numpy(),
+            self.num_periods,
+            self.period_bits,
+        )
+
+        return pd.Series(available_run_length, index=window_row_ids.index)
+
+    def remaining_periods_available(self, window_row_ids, starts, ends):
+        result = _packed_remaining_periods_available(
+            self.packed_windows,
+            self.window_row_ix._mapper,
+            window_row_ids.values,
+            starts.values,
+            ends.values,
+            self.num_periods,
+            self.period_bits,
+        )
+        if isinstance(window_row_ids, pd.Series):
+            result = pd.Series(result, index=window_row_ids.index)
+        return result
+
+    def max_time_block_available(self, window_row_ids):
+        return pd.Series(
+            _packed_max_time_blocks_available(
+                self.window_row_ix._mapper,
+                self.packed_windows,
+                np.asarray(window_row_ids),
+                self.num_periods,
+                self.period_bits,
+            ),
+            index=window_row_ids.index,
+        )
+
+
 @nb.njit
 def _max_time_block_available_1(windows_row):
     """